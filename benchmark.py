@@ -0,0 +1,290 @@
+"""
+Benchmarks de los caminos críticos de la API: alta de reservas, validación de disponibilidad
+(ReservasService._check_availability), superposición de horarios (HorariosService._check_overlap),
+listados y reportes.
+
+Corre en proceso contra la app de main.py con TestClient, sobre datasets de distintos tamaños
+generados con generar_datos.py (se guardan en benchmarks/datos/ y se reutilizan). Cada dataset
+se mide en un subproceso propio sobre una copia de la base, así las altas no se acumulan.
+Por escenario se registran p50/p95/p99, throughput y consultas SQL por pedido; los resultados
+se comparan con la última corrida guardada del mismo dataset en benchmarks/historial.json.
+Si algún escenario empeoró más que --umbral, hizo más consultas o tuvo errores, sale con
+código 1 y no guarda la corrida; si no, la agrega al historial.
+
+Uso:
+    python benchmark.py                         # datasets chico y mediano
+    python benchmark.py --tamanos grande --iteraciones 500
+    python benchmark.py --sin-guardar           # mide y compara sin tocar el historial
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time as reloj
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+DATASETS = {
+    "chico": {"canchas": 10, "clientes": 1_000, "reservas": 20_000, "anios": 1},
+    "mediano": {"canchas": 50, "clientes": 10_000, "reservas": 200_000, "anios": 2},
+    "grande": {"canchas": 100, "clientes": 50_000, "reservas": 1_000_000, "anios": 3},
+}
+# Los datasets terminan en esta fecha: las altas del benchmark van a días posteriores, que están libres
+HASTA = date(2026, 1, 1)
+SEMILLA = 42
+
+DIRECTORIO = Path(__file__).parent / "benchmarks"
+HISTORIAL = DIRECTORIO / "historial.json"
+
+# Diferencias de p95 menores a esto (ms) se consideran ruido aunque superen el umbral relativo
+MINIMO_REGRESION_MS = 0.5
+HILOS_CONCURRENCIA = 8
+
+
+# ===================== MEDICIÓN (subproceso por dataset) =====================
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def _resumen(latencias: List[float], total: float, consultas: int, errores: int) -> Dict:
+    return {
+        "p50_ms": round(_percentil(latencias, 50) * 1000, 3),
+        "p95_ms": round(_percentil(latencias, 95) * 1000, 3),
+        "p99_ms": round(_percentil(latencias, 99) * 1000, 3),
+        "media_ms": round(sum(latencias) / len(latencias) * 1000, 3),
+        "rps": round(len(latencias) / total, 1),
+        "consultas": round(consultas / len(latencias), 2),
+        "errores": errores,
+    }
+
+
+def _ejecutar(base: str, tamano: str, iteraciones: int) -> Dict:
+    # La URL se fija antes de importar la app: database.py crea el engine al importarse
+    os.environ["DATABASE_URL"] = f"sqlite:///{base}"
+    sys.path.insert(0, str(Path(__file__).parent))
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, select
+    from sqlmodel import Session
+    import database
+    import main
+    from src.models.Reserva import Reserva
+    from src.utils.catalogos import catalogos
+
+    parametros = DATASETS[tamano]
+    canchas = parametros["canchas"]
+    rng = random.Random(SEMILLA)
+    consultas = [0]
+    event.listen(database.engine, "before_cursor_execute", lambda *args: consultas.__setitem__(0, consultas[0] + 1))
+
+    with Session(database.engine) as session:
+        activas = [catalogos.estado_reserva_id(session, "Confirmada"), catalogos.estado_reserva_id(session, "Pendiente")]
+        ocupadas = session.exec(
+            select(Reserva.cancha_id, Reserva.fecha, Reserva.hora_inicio, Reserva.hora_fin)
+            .where(Reserva.estado_reserva_id.in_(activas)).limit(500)
+        ).all()
+    dias = [HASTA - timedelta(days=d) for d in range(365 * parametros["anios"])]
+
+    def slot_libre(n: int) -> Dict:
+        # Turnos nunca usados: a partir del día siguiente a HASTA, recorriendo canchas y horas
+        dia = HASTA + timedelta(days=1 + n // (canchas * 16))
+        hora = 7 + n % 16
+        return {"cliente_id": 1 + n % parametros["clientes"], "cancha_id": 1 + (n // 16) % canchas,
+                "fecha": f"{dia}T00:00:00", "hora_inicio": f"{hora:02}:00", "hora_fin": f"{hora + 1:02}:00"}
+
+    resultados = {}
+    with TestClient(main.app) as client:
+        contador = iter(range(10**9))
+
+        def medir(nombre: str, pedir: Callable[[], object], esperado: int) -> None:
+            for _ in range(min(5, iteraciones)):
+                pedir()
+            latencias, errores = [], 0
+            consultas[0] = 0
+            inicio = reloj.perf_counter()
+            for _ in range(iteraciones):
+                t0 = reloj.perf_counter()
+                respuesta = pedir()
+                latencias.append(reloj.perf_counter() - t0)
+                errores += respuesta.status_code != esperado
+            resultados[nombre] = _resumen(latencias, reloj.perf_counter() - inicio, consultas[0], errores)
+
+        # Escrituras y validaciones
+        medir("crear_reserva", lambda: client.post("/reservas/", json=slot_libre(next(contador))), 200)
+
+        def reserva_superpuesta():
+            cancha_id, fecha, inicio, fin = rng.choice(ocupadas)
+            return client.post("/reservas/", json={"cliente_id": 1, "cancha_id": cancha_id, "fecha": fecha.isoformat(),
+                                                   "hora_inicio": inicio.isoformat(), "hora_fin": fin.isoformat()})
+        medir("check_availability_conflicto", reserva_superpuesta, 409)
+        medir("check_overlap_horario", lambda: client.post(
+            f"/horarios/{rng.randint(1, canchas)}", json={"hora_inicio": "10:30", "hora_fin": "11:30", "disponible": True}
+        ), 409)
+
+        # Listados (con la cache de resultados y el ETag activos, como en producción)
+        medir("listar_canchas", lambda: client.get("/canchas/"), 200)
+        medir("listar_clientes", lambda: client.get(f"/clientes/?after_id={rng.randrange(parametros['clientes'])}&limit=100"), 200)
+        medir("listar_horarios", lambda: client.get(f"/horarios/{rng.randint(1, canchas)}"), 200)
+        medir("listar_torneos", lambda: client.get("/torneos/"), 200)
+        medir("listar_reservas_dia", lambda: client.get(f"/reservas/?fecha={rng.choice(dias)}"), 200)
+
+        # Reportes y búsquedas agregadas
+        medir("reporte_ocupacion", lambda: client.get(
+            f"/reportes/ocupacion?fecha_desde={HASTA - timedelta(days=90)}&fecha_hasta={HASTA}"), 200)
+        medir("reporte_canchas", lambda: client.get(
+            f"/reportes/canchas?fecha_desde={HASTA - timedelta(days=90)}&fecha_hasta={HASTA}"), 200)
+        medir("reporte_mensual", lambda: client.get(f"/reportes/mensual?año={HASTA.year - 1}"), 200)
+        medir("dashboard_resumen", lambda: client.get(f"/dashboard/resumen?fecha={rng.choice(dias)}"), 200)
+        medir("disponibilidad_semana", lambda: client.get(
+            f"/disponibilidad/?fecha_desde={(dia := rng.choice(dias))}&fecha_hasta={dia + timedelta(days=6)}"), 200)
+
+        # Altas concurrentes de turnos distintos: mide la contención de candados y semáforos
+        with ThreadPoolExecutor(max_workers=HILOS_CONCURRENCIA) as executor:
+            slots = [slot_libre(next(contador)) for _ in range(iteraciones)]
+            consultas[0] = 0
+            inicio = reloj.perf_counter()
+
+            def alta(slot):
+                t0 = reloj.perf_counter()
+                return client.post("/reservas/", json=slot).status_code, reloj.perf_counter() - t0
+            medidas = list(executor.map(alta, slots))
+            resultados["crear_reserva_concurrente"] = _resumen(
+                [t for _, t in medidas], reloj.perf_counter() - inicio, consultas[0],
+                sum(codigo != 200 for codigo, _ in medidas)
+            )
+
+            # Todos los hilos piden el mismo turno: debe quedar exactamente una reserva
+            mismo = slot_libre(next(contador))
+            codigos = list(executor.map(lambda _: client.post("/reservas/", json=mismo).status_code,
+                                        range(HILOS_CONCURRENCIA)))
+            resultados["crear_reserva_concurrente"]["dobles_reservas"] = codigos.count(200) - 1
+
+    return resultados
+
+
+# ===================== ORQUESTACIÓN =====================
+
+def _dataset(tamano: str) -> Path:
+    """Base generada para el tamaño pedido (se crea una sola vez)."""
+    parametros = DATASETS[tamano]
+    ruta = DIRECTORIO / "datos" / f"{tamano}-{SEMILLA}-{HASTA}.db"
+    if not ruta.exists():
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        print(f"Generando dataset {tamano}...")
+        subprocess.run(
+            [sys.executable, "generar_datos.py", "--semilla", str(SEMILLA), "--hasta", str(HASTA),
+             *[a for clave, valor in parametros.items() for a in (f"--{clave}", str(valor))]],
+            env={**os.environ, "DATABASE_URL": f"sqlite:///{ruta}"}, cwd=Path(__file__).parent, check=True,
+        )
+    return ruta
+
+
+def _medir_dataset(tamano: str, iteraciones: int) -> Dict:
+    base = DIRECTORIO / "datos" / f"_corrida-{tamano}.db"
+    shutil.copyfile(_dataset(tamano), base)
+    try:
+        salida = subprocess.run(
+            [sys.executable, __file__, "--ejecutar", tamano, "--base", str(base), "--iteraciones", str(iteraciones)],
+            cwd=Path(__file__).parent, check=True, stdout=subprocess.PIPE, text=True,
+        ).stdout
+    finally:
+        for sufijo in ("", "-wal", "-shm"):
+            Path(f"{base}{sufijo}").unlink(missing_ok=True)
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _anterior(historial: List[Dict], tamano: str) -> Optional[Dict]:
+    for corrida in reversed(historial):
+        if tamano in corrida["resultados"]:
+            return corrida["resultados"][tamano]
+    return None
+
+
+def _comparar(tamano: str, actual: Dict, anterior: Optional[Dict], umbral: float) -> List[str]:
+    problemas = []
+    print(f"\n== {tamano} ==")
+    print(f"{'escenario':32} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>8} {'sql':>6}  vs anterior (p95)")
+    for escenario, m in actual.items():
+        previo = (anterior or {}).get(escenario)
+        cambio = ""
+        if previo:
+            variacion = (m["p95_ms"] - previo["p95_ms"]) / previo["p95_ms"] if previo["p95_ms"] else 0.0
+            cambio = f"{variacion:+.0%}"
+            if variacion > umbral and m["p95_ms"] - previo["p95_ms"] > MINIMO_REGRESION_MS:
+                problemas.append(f"{tamano}/{escenario}: p95 {previo['p95_ms']} -> {m['p95_ms']} ms ({cambio})")
+            # La cantidad de consultas es determinística: cualquier aumento es una regresión (p.ej. un N+1)
+            if m["consultas"] > previo["consultas"] + 0.5:
+                problemas.append(f"{tamano}/{escenario}: consultas por pedido {previo['consultas']} -> {m['consultas']}")
+        if m["errores"]:
+            problemas.append(f"{tamano}/{escenario}: {m['errores']} respuestas con código inesperado")
+        if m.get("dobles_reservas"):
+            problemas.append(f"{tamano}/{escenario}: {m['dobles_reservas']} reservas duplicadas del mismo turno")
+        print(f"{escenario:32} {m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f} {m['p99_ms']:>9.2f} "
+              f"{m['rps']:>8.0f} {m['consultas']:>6.1f}  {cambio}")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de la API de reservas.")
+    parser.add_argument("--tamanos", default="chico,mediano", help=f"Datasets separados por coma: {', '.join(DATASETS)}")
+    parser.add_argument("--iteraciones", type=int, default=200, help="Pedidos medidos por escenario")
+    parser.add_argument("--umbral", type=float, default=0.2, help="Empeoramiento máximo tolerado del p95 (0.2 = 20%%)")
+    parser.add_argument("--historial", type=Path, default=HISTORIAL)
+    parser.add_argument("--sin-guardar", action="store_true", help="No agrega la corrida al historial")
+    # Uso interno: medición de un dataset en un subproceso
+    parser.add_argument("--ejecutar", help=argparse.SUPPRESS)
+    parser.add_argument("--base", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.ejecutar:
+        print(json.dumps(_ejecutar(args.base, args.ejecutar, args.iteraciones)))
+        return
+
+    tamanos = [t.strip() for t in args.tamanos.split(",") if t.strip()]
+    desconocidos = set(tamanos) - set(DATASETS)
+    if desconocidos:
+        parser.error(f"Datasets desconocidos: {', '.join(sorted(desconocidos))}")
+
+    historial = json.loads(args.historial.read_text(encoding="utf-8")) if args.historial.exists() else []
+    corrida = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "iteraciones": args.iteraciones,
+        "resultados": {},
+    }
+    problemas = []
+    for tamano in tamanos:
+        corrida["resultados"][tamano] = _medir_dataset(tamano, args.iteraciones)
+        problemas += _comparar(tamano, corrida["resultados"][tamano], _anterior(historial, tamano), args.umbral)
+
+    if problemas:
+        # Una corrida con regresiones no se guarda: no debe pasar a ser la referencia de la siguiente
+        print("\n❌ Regresiones (la corrida no se agrega al historial):")
+        for problema in problemas:
+            print(f"  - {problema}")
+        sys.exit(1)
+
+    if not args.sin_guardar:
+        args.historial.parent.mkdir(parents=True, exist_ok=True)
+        args.historial.write_text(json.dumps(historial + [corrida], indent=2, ensure_ascii=False), encoding="utf-8")
+    print("\n✅ Sin regresiones.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
 
 # Configuración de la página
 st.set_page_config(
@@ -16,6 +20,13 @@ st.set_page_config(
 
 # URL del backend FastAPI (ajustar según tu configuración)
 API_BASE_URL = "http://localhost:8000"  # Cambiar según tu puerto
+API_TIMEOUT = 10  # Segundos máximos de espera por respuesta
+# Segundos durante los que se reutiliza la respuesta de un GET (cualquier alta/baja/modificación la descarta)
+CACHE_TTL_SEGUNDOS = 30
+# Los listados paginados indican en este header el after_id de la página siguiente
+HEADER_CURSOR = "X-Siguiente-Cursor"
+PAGINA_MAXIMA = 1000  # Límite máximo de registros por página que acepta la API
+PAGINAS_MAXIMAS = 5  # Páginas que se siguen por listado; si hay más se avisa que la lista está incompleta
 
 # Estilos CSS personalizados
 st.markdown("""
@@ -49,25 +60,94 @@ st.markdown("""
 
 # ===================== FUNCIONES DE API =====================
 
-def api_request(endpoint: str, method: str = "GET", data: Optional[Dict] = None):
+@st.cache_resource
+def http_session() -> requests.Session:
+    """Sesión HTTP compartida por todos los reruns: reutiliza las conexiones (keep-alive) y reintenta fallas transitorias"""
+    session = requests.Session()
+    # Los errores de conexión se reintentan siempre; las respuestas 502/503/504 solo en GET
+    reintentos = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=frozenset({"GET"}))
+    adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=reintentos)
+    session.mount("http://", adaptador)
+    session.mount("https://", adaptador)
+    return session
+
+
+@st.cache_resource
+def http_executor() -> ThreadPoolExecutor:
+    """Hilos para pedir en paralelo endpoints independientes"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="api")
+
+
+def _pagina_siguiente(url: str, cursor: str) -> str:
+    partes = urlsplit(url)
+    parametros = dict(parse_qsl(partes.query))
+    parametros.update(after_id=cursor, limit=PAGINA_MAXIMA)
+    return urlunsplit(partes._replace(query=urlencode(parametros)))
+
+
+def _get(url: str):
+    """Devuelve (datos, truncado): de los listados se siguen hasta PAGINAS_MAXIMAS páginas"""
+    response = http_session().get(url, timeout=API_TIMEOUT)
+    response.raise_for_status()
+    datos = response.json() if response.content else None
+    paginas = 1
+    while isinstance(datos, list) and HEADER_CURSOR in response.headers:
+        if paginas == PAGINAS_MAXIMAS:
+            return datos, True
+        response = http_session().get(_pagina_siguiente(url, response.headers[HEADER_CURSOR]), timeout=API_TIMEOUT)
+        response.raise_for_status()
+        datos.extend(response.json())
+        paginas += 1
+    return datos, False
+
+
+@st.cache_data(ttl=CACHE_TTL_SEGUNDOS, show_spinner=False)
+def _api_get(url: str):
+    # Las excepciones no se guardan en cache: un error se vuelve a intentar en el próximo rerun
+    return _get(url)
+
+
+def _avisar_truncado(endpoint: str, datos: List) -> None:
+    st.warning(f"⚠️ {endpoint}: se muestran solo los primeros {len(datos)} registros. Use los filtros para acotar el listado.")
+
+
+def api_request(endpoint: str, method: str = "GET", data: Optional[Dict] = None, usar_cache: bool = True):
     """Función genérica para realizar peticiones a la API"""
     try:
         url = f"{API_BASE_URL}{endpoint}"
         if method == "GET":
-            response = requests.get(url)
-        elif method == "POST":
-            response = requests.post(url, json=data)
-        elif method == "PUT":
-            response = requests.put(url, json=data)
-        elif method == "DELETE":
-            response = requests.delete(url)
-        
+            datos, truncado = _api_get(url) if usar_cache else _get(url)
+            if truncado:
+                _avisar_truncado(endpoint, datos)
+            return datos
+
+        response = http_session().request(method, url, json=data, timeout=API_TIMEOUT)
         response.raise_for_status()
+        # Después de un alta, baja o modificación los GET guardados pueden estar desactualizados
+        _api_get.clear()
         return response.json() if response.content else None
     except requests.exceptions.RequestException as e:
         st.error(f"Error en la conexión con el servidor: {str(e)}")
         return None
 
+
+def api_requests_paralelo(*endpoints: str) -> List:
+    """Hace varios GET independientes a la vez: la demora total es la del más lento"""
+    def pedir(endpoint: str):
+        try:
+            return _api_get(f"{API_BASE_URL}{endpoint}"), None
+        except requests.exceptions.RequestException as e:
+            return (None, False), e
+
+    resultados = list(http_executor().map(pedir, endpoints))
+    # Los mensajes se muestran desde el hilo del script: los hilos del pool no tienen contexto de Streamlit
+    for endpoint, ((datos, truncado), error) in zip(endpoints, resultados):
+        if error:
+            st.error(f"Error en la conexión con el servidor: {str(error)}")
+        elif truncado:
+            _avisar_truncado(endpoint, datos)
+    return [datos for (datos, _), _ in resultados]
+
 # ===================== SECCIÓN: CLIENTES =====================
 
 def seccion_clientes():
@@ -304,11 +384,11 @@ def seccion_reservas():
         with col3:
             estado_filtro = st.selectbox("Estado", ["Todas", "Confirmada", "Cancelada", "Pendiente"])
         
-        reservas = api_request(f"/reservas?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+        endpoint = f"/reservas?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}"
+        if estado_filtro != "Todas":
+            endpoint += f"&estado={estado_filtro}"
+        reservas = api_request(endpoint)
         if reservas:
-            if estado_filtro != "Todas":
-                reservas = [r for r in reservas if r.get('estado', '') == estado_filtro]
-            
             df = pd.DataFrame(reservas)
             st.dataframe(df, use_container_width=True)
         else:
@@ -317,8 +397,7 @@ def seccion_reservas():
     with tab2:
         st.subheader("Crear Nueva Reserva")
         
-        clientes = api_request("/clientes")
-        canchas = api_request("/canchas")
+        clientes, canchas = api_requests_paralelo("/clientes", "/canchas")
         
         if not clientes:
             st.warning("⚠️ No hay clientes registrados. Por favor, registre un cliente primero.")
@@ -372,7 +451,7 @@ def seccion_reservas():
                     }
                     
                     # Validar disponibilidad
-                    disponible = api_request(f"/reservas/disponibilidad?cancha_id={cancha_id}&fecha={fecha}&hora_inicio={hora_inicio}&hora_fin={hora_fin_dt}")
+                    disponible = api_request(f"/reservas/disponibilidad?cancha_id={cancha_id}&fecha={fecha}&hora_inicio={hora_inicio}&hora_fin={hora_fin_dt}", usar_cache=False)
                     
                     if disponible and disponible.get('disponible', False):
                         resultado = api_request("/reservas", "POST", data)
@@ -431,6 +510,7 @@ def seccion_reportes():
     
     tab1, tab2, tab3, tab4 = st.tabs(["Reservas por Cliente", "Reservas por Cancha", "Canchas Más Usadas", "Estadísticas"])
     
+    # Los agrupamientos se calculan en el backend (/reportes): solo se reciben los totales
     with tab1:
         st.subheader("Reservas por Cliente")
         clientes = api_request("/clientes")
@@ -446,24 +526,21 @@ def seccion_reportes():
             
             if cliente_sel != "Todos":
                 cliente_id = int(cliente_sel.split(" - ")[0])
-                reservas = api_request(f"/reportes/cliente/{cliente_id}?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+                resumen = api_request(f"/reportes/cliente/{cliente_id}?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+                filas = resumen['por_cancha'] if resumen else []
             else:
-                reservas = api_request(f"/reservas?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+                filas = api_request(f"/reportes/clientes?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
             
-            if reservas:
-                df = pd.DataFrame(reservas)
+            if filas:
+                df = pd.DataFrame(filas)
                 st.dataframe(df, use_container_width=True)
                 
                 # Métricas
-                col1, col2, col3 = st.columns(3)
+                col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("Total Reservas", len(reservas))
+                    st.metric("Total Reservas", int(df['cantidad_reservas'].sum()))
                 with col2:
-                    total_horas = sum([r.get('duracion', 0) for r in reservas])
-                    st.metric("Total Horas", f"{total_horas:.1f}")
-                with col3:
-                    if 'precio_total' in df.columns:
-                        st.metric("Ingresos Totales", f"${df['precio_total'].sum():,.0f}")
+                    st.metric("Total Horas", f"{df['horas_totales'].sum():.1f}")
             else:
                 st.info("No hay reservas para mostrar")
     
@@ -482,23 +559,23 @@ def seccion_reportes():
             
             if cancha_sel != "Todas":
                 cancha_id = int(cancha_sel.split(" - ")[0])
-                reservas = api_request(f"/reportes/cancha/{cancha_id}?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+                ocupacion = api_request(f"/reportes/cancha/{cancha_id}?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+                ocupacion = [ocupacion] if ocupacion else []
             else:
-                reservas = api_request(f"/reservas?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
+                ocupacion = api_request(f"/reportes/ocupacion?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
             
-            if reservas:
-                df = pd.DataFrame(reservas)
+            if ocupacion:
+                df = pd.DataFrame(ocupacion)
                 st.dataframe(df, use_container_width=True)
                 
-                # Tasa de ocupación
-                dias_periodo = (fecha_hasta - fecha_desde).days + 1
-                horas_totales = sum([r.get('duracion', 0) for r in reservas])
-                horas_disponibles = dias_periodo * 12  # Asumiendo 12 horas disponibles por día
+                # Tasa de ocupación (horas disponibles según los horarios de cada cancha)
+                horas_totales = df['horas_reservadas'].sum()
+                horas_disponibles = df['horas_disponibles'].sum()
                 tasa_ocupacion = (horas_totales / horas_disponibles) * 100 if horas_disponibles > 0 else 0
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Total Reservas", len(reservas))
+                    st.metric("Total Reservas", int(df['cantidad_reservas'].sum()))
                 with col2:
                     st.metric("Horas Reservadas", f"{horas_totales:.1f}")
                 with col3:
@@ -515,24 +592,11 @@ def seccion_reportes():
         with col2:
             fecha_hasta = st.date_input("Hasta", value=datetime.now().date(), key="rep_top_hasta")
         
-        reservas = api_request(f"/reservas?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
-        canchas = api_request("/canchas")
+        uso_canchas = api_request(f"/reportes/canchas?fecha_desde={fecha_desde}&fecha_hasta={fecha_hasta}")
         
-        if reservas and canchas:
-            # Agrupar por cancha
-            df = pd.DataFrame(reservas)
-            uso_canchas = df.groupby('cancha_id').agg({
-                'id': 'count',
-                'duracion': 'sum'
-            }).reset_index()
-            uso_canchas.columns = ['cancha_id', 'cantidad_reservas', 'horas_totales']
-            
-            # Agregar nombres de canchas
-            cancha_dict = {c['id']: c['nombre'] for c in canchas}
-            uso_canchas['nombre_cancha'] = uso_canchas['cancha_id'].map(cancha_dict)
-            
-            # Ordenar por cantidad de reservas
-            uso_canchas = uso_canchas.sort_values('cantidad_reservas', ascending=False)
+        if uso_canchas:
+            # Ya viene agrupado por cancha y ordenado por cantidad de reservas
+            uso_canchas = pd.DataFrame(uso_canchas).rename(columns={'nombre': 'nombre_cancha'})
             
             # Mostrar tabla
             st.dataframe(uso_canchas[['nombre_cancha', 'cantidad_reservas', 'horas_totales']], use_container_width=True)
@@ -557,20 +621,13 @@ def seccion_reportes():
         
         año = st.selectbox("Año", [2024, 2025, 2026], index=1)
         
-        reservas = api_request(f"/reservas?año={año}")
+        uso_mensual = api_request(f"/reportes/mensual?año={año}")
         
-        if reservas:
-            df = pd.DataFrame(reservas)
-            df['fecha'] = pd.to_datetime(df['fecha'])
-            df['mes'] = df['fecha'].dt.month
-            df['mes_nombre'] = df['fecha'].dt.strftime('%B')
-            
-            # Agrupar por mes
-            uso_mensual = df.groupby(['mes', 'mes_nombre']).agg({
-                'id': 'count',
-                'duracion': 'sum'
-            }).reset_index()
-            uso_mensual.columns = ['mes', 'mes_nombre', 'cantidad_reservas', 'horas_totales']
+        if uso_mensual:
+            meses = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+                     "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+            uso_mensual = pd.DataFrame(uso_mensual)
+            uso_mensual['mes_nombre'] = uso_mensual['mes'].map(lambda m: meses[m - 1])
             
             # Gráfico de líneas
             fig = go.Figure()
@@ -592,17 +649,15 @@ def seccion_reportes():
             st.plotly_chart(fig_bar, use_container_width=True)
             
             # Métricas generales
-            col1, col2, col3, col4 = st.columns(4)
+            total_reservas = int(uso_mensual['cantidad_reservas'].sum())
+            col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total Reservas Año", df['id'].count())
+                st.metric("Total Reservas Año", total_reservas)
             with col2:
-                st.metric("Total Horas", f"{df['duracion'].sum():.1f}")
+                st.metric("Total Horas", f"{uso_mensual['horas_totales'].sum():.1f}")
             with col3:
-                promedio_mes = df['id'].count() / 12
+                promedio_mes = total_reservas / 12
                 st.metric("Promedio Mensual", f"{promedio_mes:.0f}")
-            with col4:
-                if 'precio_total' in df.columns:
-                    st.metric("Ingresos Anuales", f"${df['precio_total'].sum():,.0f}")
         else:
             st.info("No hay datos para el año seleccionado")
 
@@ -900,31 +955,22 @@ def seccion_dashboard():
     # Métricas principales
     st.subheader("📊 Métricas del Día")
     
-    hoy = datetime.now().date()
-    reservas_hoy = api_request(f"/reservas?fecha={hoy}")
-    clientes = api_request("/clientes")
-    canchas = api_request("/canchas")
+    # Todo el dashboard sale de un único resumen ya agregado en el backend
+    resumen = api_request("/dashboard/resumen") or {}
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        num_reservas = len(reservas_hoy) if reservas_hoy else 0
-        st.metric("Reservas Hoy", num_reservas, delta=None)
+        st.metric("Reservas Hoy", resumen.get('reservas_hoy', 0), delta=None)
     
     with col2:
-        num_clientes = len(clientes) if clientes else 0
-        st.metric("Clientes Totales", num_clientes)
+        st.metric("Clientes Totales", resumen.get('clientes_totales', 0))
     
     with col3:
-        num_canchas = len([c for c in canchas if c.get('activa', True)]) if canchas else 0
-        st.metric("Canchas Activas", num_canchas)
+        st.metric("Canchas Activas", resumen.get('canchas_activas', 0))
     
     with col4:
-        if reservas_hoy:
-            ingresos_hoy = sum([r.get('precio_total', 0) for r in reservas_hoy])
-            st.metric("Ingresos Hoy", f"${ingresos_hoy:,.0f}")
-        else:
-            st.metric("Ingresos Hoy", "$0")
+        st.metric("Ingresos Hoy", f"${resumen.get('ingresos_hoy', 0):,.0f}")
     
     st.write("---")
     
@@ -933,13 +979,12 @@ def seccion_dashboard():
     
     with col_left:
         st.subheader("📅 Próximas Reservas")
-        if reservas_hoy:
-            df_hoy = pd.DataFrame(reservas_hoy)
-            df_hoy = df_hoy.sort_values('hora_inicio')
-            st.dataframe(df_hoy[['id', 'cancha_id', 'hora_inicio', 'hora_fin', 'estado']].head(10), 
+        if resumen.get('proximas_reservas'):
+            df_proximas = pd.DataFrame(resumen['proximas_reservas'])
+            st.dataframe(df_proximas[['id', 'fecha', 'hora_inicio', 'hora_fin', 'cancha', 'cliente', 'estado']],
                         use_container_width=True, hide_index=True)
         else:
-            st.info("No hay reservas para hoy")
+            st.info("No hay próximas reservas")
     
     with col_right:
         st.subheader("🎯 Acciones Rápidas")
@@ -963,28 +1008,10 @@ def seccion_dashboard():
     
     # Gráfico de ocupación semanal
     st.subheader("📈 Ocupación Semanal")
-    fecha_inicio_semana = hoy - timedelta(days=hoy.weekday())
-    fecha_fin_semana = fecha_inicio_semana + timedelta(days=6)
-    
-    reservas_semana = api_request(f"/reservas?fecha_desde={fecha_inicio_semana}&fecha_hasta={fecha_fin_semana}")
     
-    if reservas_semana:
-        df_semana = pd.DataFrame(reservas_semana)
-        df_semana['fecha'] = pd.to_datetime(df_semana['fecha'])
-        df_semana['dia_semana'] = df_semana['fecha'].dt.day_name()
-        
-        ocupacion_dia = df_semana.groupby('dia_semana').agg({
-            'id': 'count',
-            'duracion': 'sum'
-        }).reset_index()
-        ocupacion_dia.columns = ['dia', 'reservas', 'horas']
-        
-        # Ordenar días de la semana
-        dias_orden = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        dias_español = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-        ocupacion_dia['dia'] = pd.Categorical(ocupacion_dia['dia'], categories=dias_orden, ordered=True)
-        ocupacion_dia = ocupacion_dia.sort_values('dia')
-        ocupacion_dia['dia'] = dias_español[:len(ocupacion_dia)]
+    semana = resumen.get('semana', [])
+    if any(dia['cantidad_reservas'] for dia in semana):
+        ocupacion_dia = pd.DataFrame(semana).rename(columns={'nombre_dia': 'dia', 'cantidad_reservas': 'reservas'})
         
         fig = px.bar(ocupacion_dia, x='dia', y='reservas',
                     title='Reservas por Día de la Semana',
@@ -0,0 +1,221 @@
+"""
+Generador de datos sintéticos para pruebas de carga y benchmarks.
+
+Crea canchas, horarios, clientes y reservas (cada una con su pago) con una distribución
+realista: más demanda de 18 a 22 los días de semana y a media mañana/tarde los fines de
+semana. Las filas se insertan con INSERT executemany en transacciones de a --lote filas,
+sin pasar por el ORM. El resultado depende solo de los parámetros y de --semilla.
+
+Uso:
+    python generar_datos.py --canchas 100 --clientes 50000 --reservas 1000000 --anios 3
+    DATABASE_URL=sqlite:///carga.db python generar_datos.py --reemplazar
+
+Con turnos de una hora entre HORA_APERTURA y HORA_CIERRE, cada cancha admite como mucho
+16 reservas por día: si se piden más reservas de las que entran, se ocupan todos los turnos.
+"""
+import argparse
+import random
+import time as reloj
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import func, insert, select, text
+from sqlmodel import Session, SQLModel
+
+from database import engine, init_db
+from src.models.Cancha import Cancha, TipoCancha
+from src.models.Cliente import Cliente
+from src.models.Horario import Horario
+from src.models.Pago import Pago, EstadoPago
+from src.models.Reserva import Reserva, EstadoReserva
+from src.utils.ocupacion import reconstruir_ocupacion
+
+HORA_APERTURA = 7
+HORA_CIERRE = 23
+# Días posteriores a "hoy" con reservas ya tomadas (quedan Pendientes)
+DIAS_FUTUROS = 30
+TASA_CANCELACION = 0.08
+
+# Demanda relativa de cada turno según la hora de inicio
+PESOS_SEMANA = {7: 0.15, 8: 0.2, 9: 0.2, 10: 0.2, 11: 0.25, 12: 0.3, 13: 0.3, 14: 0.25, 15: 0.3,
+                16: 0.4, 17: 0.6, 18: 0.9, 19: 1.0, 20: 1.0, 21: 0.9, 22: 0.6}
+PESOS_FINDE = {7: 0.2, 8: 0.35, 9: 0.6, 10: 0.8, 11: 0.85, 12: 0.7, 13: 0.5, 14: 0.55, 15: 0.7,
+               16: 0.8, 17: 0.8, 18: 0.75, 19: 0.7, 20: 0.6, 21: 0.5, 22: 0.3}
+# Proporción de canchas de cada tipo y precio del turno
+TIPOS_CANCHA = {"FUTBOL": (0.45, 30000), "PADEL": (0.35, 20000), "TENIS": (0.15, 15000), "VOLEY": (0.05, 12000)}
+
+NOMBRES = ["Juan", "María", "Lucas", "Sofía", "Mateo", "Valentina", "Martín", "Camila", "Diego", "Lucía"]
+APELLIDOS = ["Gómez", "Pérez", "Rodríguez", "Fernández", "López", "Martínez", "García", "Sánchez", "Romero", "Díaz"]
+
+
+def _lotes(filas: Iterable, tamano: int) -> Iterator[List]:
+    filas = iter(filas)
+    while lote := list(islice(filas, tamano)):
+        yield lote
+
+
+def _escala(dias: List[date], canchas: int, objetivo: int) -> float:
+    """Factor k tal que sumando min(1, k * peso) sobre todos los turnos se esperen 'objetivo' reservas."""
+    fines = sum(1 for d in dias if d.weekday() >= 5)
+    conteo = [(len(dias) - fines, PESOS_SEMANA), (fines, PESOS_FINDE)]
+
+    def esperadas(k: float) -> float:
+        return canchas * sum(n * min(1.0, k * p) for n, pesos in conteo for p in pesos.values())
+
+    bajo, alto = 0.0, 1.0 / min(min(PESOS_SEMANA.values()), min(PESOS_FINDE.values()))
+    if esperadas(alto) <= objetivo:
+        return alto
+    for _ in range(50):
+        medio = (bajo + alto) / 2
+        bajo, alto = (medio, alto) if esperadas(medio) < objetivo else (bajo, medio)
+    return alto
+
+
+def _asegurar_catalogos(session: Session) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+    # Los nombres de catálogo son Enum: se crean las filas que falten a partir de sus valores
+    for modelo in (EstadoReserva, EstadoPago, TipoCancha):
+        enum = modelo.__table__.c.nombre.type.enum_class
+        existentes = set(session.exec(select(modelo.nombre)).scalars().all())
+        for valor in enum:
+            if valor not in existentes:
+                session.add(modelo(nombre=valor, descripcion=valor.value) if modelo is TipoCancha else modelo(nombre=valor))
+    session.commit()
+
+    def ids(modelo, clave):
+        return {clave(nombre): id for id, nombre in session.exec(select(modelo.id, modelo.nombre)).all()}
+
+    return (
+        ids(EstadoReserva, lambda n: n.value),
+        ids(EstadoPago, lambda n: n.value),
+        ids(TipoCancha, lambda n: n.name),
+    )
+
+
+def _insertar(tabla, filas: Iterable[Dict], lote: int) -> int:
+    total = 0
+    for filas_lote in _lotes(filas, lote):
+        with engine.begin() as conn:
+            conn.execute(insert(tabla), filas_lote)
+        total += len(filas_lote)
+    return total
+
+
+def generar(canchas: int, clientes: int, reservas: int, anios: int, semilla: int,
+            hasta: date, lote: int, reemplazar: bool) -> None:
+    rng = random.Random(semilla)
+    inicio = reloj.perf_counter()
+
+    if reemplazar:
+        SQLModel.metadata.drop_all(engine)
+    init_db()
+
+    with Session(engine) as session:
+        if session.exec(select(func.count()).select_from(Reserva)).one()[0]:
+            raise SystemExit("La base ya tiene reservas: use --reemplazar o una DATABASE_URL nueva.")
+        estados_reserva, estados_pago, tipos = _asegurar_catalogos(session)
+        base_cancha = session.exec(select(func.coalesce(func.max(Cancha.id), 0))).one()[0]
+        base_cliente = session.exec(select(func.coalesce(func.max(Cliente.id), 0))).one()[0]
+        base_horario = session.exec(select(func.coalesce(func.max(Horario.id), 0))).one()[0]
+        base_pago = session.exec(select(func.coalesce(func.max(Pago.id), 0))).one()[0]
+
+    creado = datetime.combine(hasta, time.min) - timedelta(days=365 * anios)
+    hoy = hasta - timedelta(days=DIAS_FUTUROS)
+    horas = list(range(HORA_APERTURA, HORA_CIERRE))
+
+    # 1. Canchas, con el tipo sorteado según TIPOS_CANCHA
+    nombres_tipo = list(TIPOS_CANCHA)
+    tipo_de = [rng.choices(nombres_tipo, weights=[TIPOS_CANCHA[t][0] for t in nombres_tipo])[0] for _ in range(canchas)]
+    _insertar(Cancha.__table__, (
+        {"id": base_cancha + i + 1, "nombre": f"Cancha {base_cancha + i + 1}", "tipo_cancha_id": tipos[tipo_de[i]],
+         "fecha_creacion": creado, "fecha_actualizacion": creado}
+        for i in range(canchas)
+    ), lote)
+
+    # 2. Horarios: un turno de una hora por cancha y hora; el id se deduce de (cancha, hora)
+    def horario_id(i: int, hora: int) -> int:
+        return base_horario + i * len(horas) + (hora - HORA_APERTURA) + 1
+
+    _insertar(Horario.__table__, (
+        {"id": horario_id(i, h), "cancha_id": base_cancha + i + 1, "disponible": True,
+         "hora_inicio": time(h), "hora_fin": time(h + 1), "fecha_creacion": creado, "fecha_actualizacion": creado}
+        for i in range(canchas) for h in horas
+    ), lote)
+
+    # 3. Clientes
+    _insertar(Cliente.__table__, (
+        {"id": base_cliente + i + 1, "nombre": rng.choice(NOMBRES), "apellido": rng.choice(APELLIDOS),
+         "email": f"cliente{base_cliente + i + 1}@example.com", "telefono": f"11{rng.randrange(10**8):08d}",
+         "fecha_creacion": creado, "fecha_actualizacion": creado}
+        for i in range(clientes)
+    ), lote)
+
+    # 4. Reservas y pagos: cada turno se ocupa con probabilidad min(1, k * peso)
+    dias = [hasta - timedelta(days=d) for d in range(365 * anios, -1, -1)]
+    k = _escala(dias, canchas, reservas)
+    prob_semana = {h: min(1.0, k * p) for h, p in PESOS_SEMANA.items()}
+    prob_finde = {h: min(1.0, k * p) for h, p in PESOS_FINDE.items()}
+
+    def filas_reserva() -> Iterator[Tuple[Dict, Dict]]:
+        reserva_id = 0
+        for dia in dias:
+            prob = prob_finde if dia.weekday() >= 5 else prob_semana
+            fecha = datetime.combine(dia, time.min)
+            pasada = dia < hoy
+            for i in range(canchas):
+                for h in horas:
+                    if rng.random() >= prob[h]:
+                        continue
+                    reserva_id += 1
+                    cancelada = pasada and rng.random() < TASA_CANCELACION
+                    estado = "Cancelada" if cancelada else "Confirmada" if pasada else "Pendiente"
+                    reservada = fecha - timedelta(days=rng.randrange(15), hours=rng.randrange(24))
+                    # Unos pocos clientes concentran muchas reservas (distribución sesgada)
+                    cliente_id = base_cliente + int(clientes * rng.random() ** 2) + 1
+                    pago_id = base_pago + reserva_id
+                    yield (
+                        {"id": reserva_id, "cliente_id": cliente_id, "cancha_id": base_cancha + i + 1,
+                         "estado_reserva_id": estados_reserva[estado], "horario_id": horario_id(i, h),
+                         "fecha": fecha, "hora_inicio": time(h), "hora_fin": time(h + 1), "pago_id": pago_id,
+                         "fecha_creacion": reservada, "fecha_actualizacion": reservada},
+                        {"id": pago_id, "reserva_id": reserva_id,
+                         "estado_pago_id": estados_pago["Cobrado" if pasada and not cancelada else "Pendiente"],
+                         "monto": TIPOS_CANCHA[tipo_de[i]][1], "fecha_pago": fecha + timedelta(hours=h)},
+                    )
+
+    generadas = 0
+    for filas_lote in _lotes(filas_reserva(), lote):
+        # Reserva y pago se referencian mutuamente: van en la misma transacción
+        with engine.begin() as conn:
+            conn.execute(insert(Reserva.__table__), [r for r, _ in filas_lote])
+            conn.execute(insert(Pago.__table__), [p for _, p in filas_lote])
+        generadas += len(filas_lote)
+        print(f"  {generadas:,} reservas...", end="\r")
+
+    # 5. Resumen de ocupación y estadísticas del planificador
+    with Session(engine) as session:
+        filas_ocupacion = reconstruir_ocupacion(session, estados_reserva["Cancelada"])
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+    print(f"✅ {canchas:,} canchas, {canchas * len(horas):,} horarios, {clientes:,} clientes, "
+          f"{generadas:,} reservas y pagos, {filas_ocupacion:,} filas de ocupación "
+          f"en {reloj.perf_counter() - inicio:.1f} s.")
+    if generadas < reservas * 0.98:
+        print(f"⚠️ Se pidieron {reservas:,} reservas pero solo entran {generadas:,} en los turnos disponibles.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos para pruebas de carga.")
+    parser.add_argument("--canchas", type=int, default=100)
+    parser.add_argument("--clientes", type=int, default=50_000)
+    parser.add_argument("--reservas", type=int, default=1_000_000)
+    parser.add_argument("--anios", type=int, default=3, help="Años de historial hasta --hasta")
+    parser.add_argument("--hasta", type=date.fromisoformat, default=date.today(),
+                        help="Último día con reservas (AAAA-MM-DD); fijarlo hace reproducible el resultado")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--lote", type=int, default=20_000, help="Filas por transacción")
+    parser.add_argument("--reemplazar", action="store_true", help="Borra y recrea todas las tablas antes de generar")
+    args = parser.parse_args()
+    generar(args.canchas, args.clientes, args.reservas, args.anios, args.semilla, args.hasta, args.lote, args.reemplazar)
@@ -1,26 +1,57 @@
 from fastapi import FastAPI
-from database import init_db
-from src.routes.Canchas import canchas_router
-from src.routes.Clientes import clientes_router
-from src.routes.Reservas import reservas_router
-from src.routes.Horarios import horarios_router
+from fastapi.responses import ORJSONResponse
+from sqlmodel import Session
+from database import init_db, engine, cerrar_async_engine
+from src.utils.catalogos import catalogos
+from src.utils.perfilado import PerfiladoSQL
+from src.utils.metricas import MetricasHTTP
+from src.routes.Canchas import canchas_router, canchas_async_router
+from src.routes.Clientes import clientes_router, clientes_async_router
+from src.routes.Reservas import reservas_router, reservas_async_router
+from src.routes.Horarios import horarios_router, horarios_async_router
+from src.routes.Torneos import torneos_router, torneos_async_router
+from src.routes.Reportes import reportes_router
+from src.routes.Disponibilidad import disponibilidad_router
+from src.routes.Cache import cache_router
+from src.routes.Dashboard import dashboard_router
+from src.routes.Metricas import metricas_router
 from contextlib import asynccontextmanager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    with Session(engine) as session:
+        catalogos.cargar(session)
     yield
+    await cerrar_async_engine()
 
 
 
-app = FastAPI(title="Sistema de Reservas de Canchas Deportivas", lifespan=lifespan)
+# orjson serializa el resto de las respuestas bastante más rápido que json.dumps
+app = FastAPI(title="Sistema de Reservas de Canchas Deportivas", lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(PerfiladoSQL)
+# Se agrega último: envuelve a los demás y mide el pedido completo
+app.add_middleware(MetricasHTTP)
 
 
 app.include_router(clientes_router)
 app.include_router(reservas_router)
 app.include_router(canchas_router)
 app.include_router(horarios_router)
+app.include_router(torneos_router)
+app.include_router(reportes_router)
+app.include_router(disponibilidad_router)
+app.include_router(dashboard_router)
+app.include_router(cache_router)
+app.include_router(metricas_router)
+
+# Mismos endpoints sobre el stack async (AsyncSession), bajo /async, para compararlos
+app.include_router(clientes_async_router)
+app.include_router(reservas_async_router)
+app.include_router(canchas_async_router)
+app.include_router(horarios_async_router)
+app.include_router(torneos_async_router)
 
 
 @app.get("/")
@@ -30,4 +61,4 @@ def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
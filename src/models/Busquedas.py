@@ -10,7 +10,9 @@ class Servicio(SQLModel, table=True):
     nombre: str
     costo: float
     
-    reservas: List["Reserva"] = Relationship(back_populates="servicios")
+    reservas: List["Reserva"] = Relationship(
+        back_populates="servicios", sa_relationship_kwargs={"secondary": "reserva_servicio"}
+    )
     
 class ReservaServicio(SQLModel, table=True):
     __tablename__ = "reserva_servicio"
@@ -18,7 +20,4 @@ class ReservaServicio(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True, index=True)
     reserva_id: int = Field(foreign_key="reserva.id")
     servicio_id: int = Field(foreign_key="servicio.id")
-    
-    reserva: "Reserva" = Relationship(back_populates="reserva_servicios")
-    servicio: "Servicio" = Relationship(back_populates="reserva_servicios")
     
\ No newline at end of file
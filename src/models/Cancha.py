@@ -1,5 +1,3 @@
-from __future__ import annotations
-
 from typing import Optional, List, TYPE_CHECKING
 from sqlmodel import Relationship, Field, SQLModel
 from src.models.Torneo import CanchaTorneoLink
@@ -9,7 +7,6 @@ from src.models.BaseModel import BaseModel
 if TYPE_CHECKING:
     from src.models.Horario import Horario
     from src.models.Reserva import Reserva
-    from src.models.Busquedas import Servicio
     from src.models.Torneo import Torneo
 
 class TipoDeCancha(Enum):
@@ -24,10 +21,11 @@ class Cancha(BaseModel, table=True):
     nombre: str
     tipo_cancha_id: int = Field(foreign_key="tipo_cancha.id")
 
-    horarios: Optional[List["Horario"]] = Relationship(back_populates="cancha")
-    reservas: Optional[List["Reserva"]] = Relationship(back_populates="cancha")
-    servicios: Optional[List["Servicio"]] = Relationship(back_populates="cancha")
-    torneos: Optional[List["Torneo"]] = Relationship(
+    tipo_cancha: Optional["TipoCancha"] = Relationship()
+
+    horarios: List["Horario"] = Relationship(back_populates="cancha")
+    reservas: List["Reserva"] = Relationship(back_populates="cancha")
+    torneos: List["Torneo"] = Relationship(
         back_populates="canchas",
         link_model=CanchaTorneoLink
     ) 
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List
 from sqlmodel import Relationship
 
 from src.models.BaseModel import BaseModel
@@ -11,4 +11,4 @@ class Cliente(BaseModel, table=True):
     telefono: str
     email: str
 
-    reservas: Optional[List["Reserva"]] = Relationship(back_populates="cliente")
+    reservas: List["Reserva"] = Relationship(back_populates="cliente")
@@ -1,15 +1,21 @@
-from __future__ import annotations
 from datetime import time
 from src.models.BaseModel import BaseModel
 from sqlmodel import Relationship, Field
-from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index
+from typing import Optional, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.models.Cancha import Cancha
+    from src.models.Reserva import Reserva
 
 class Horario(BaseModel, table=True):
+    __table_args__ = (
+        # Cubre la búsqueda de superposición de HorariosService._check_overlap
+        Index("ix_horario_cancha_horas", "cancha_id", "hora_inicio", "hora_fin"),
+    )
+
     cancha_id: int = Field(foreign_key="cancha.id")
-    disponible: bool
+    disponible: bool = True
     hora_inicio: time
     hora_fin: time
 
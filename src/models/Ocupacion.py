@@ -0,0 +1,18 @@
+from sqlmodel import Field, SQLModel
+from datetime import date
+
+
+class OcupacionDiaria(SQLModel, table=True):
+    """
+    Resumen materializado de ocupación: una fila por (cancha_id, fecha) con reservas activas.
+    Lo mantienen ReservasService y HorariosService en cada escritura; los reportes de
+    ocupación leen esta tabla en lugar de recorrer todas las reservas.
+    """
+    __tablename__ = "ocupacion_diaria"
+
+    cancha_id: int = Field(foreign_key="cancha.id", primary_key=True)
+    fecha: date = Field(primary_key=True)
+    minutos_reservados: int = Field(default=0)
+    # Minutos habilitados ese día según los horarios disponibles de la cancha
+    minutos_disponibles: int = Field(default=0)
+    cantidad_reservas: int = Field(default=0)
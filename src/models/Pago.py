@@ -1,5 +1,6 @@
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
+from typing import Optional
 from src.models.Reserva import Reserva
 from enum import Enum
 
@@ -16,8 +17,8 @@ class Pago(SQLModel, table=True):
     monto: float
     fecha_pago: datetime
     
-    reserva: "Reserva" = Relationship(back_populates="pagos")
-    estado_pago: "EstadoPago" = Relationship(back_populates="pagos")
+    reserva: Optional["Reserva"] = Relationship(sa_relationship_kwargs={"foreign_keys": "[Pago.reserva_id]"})
+    estado_pago: Optional["EstadoPago"] = Relationship()
     
 class EstadoPago(SQLModel, table=True):
     __tablename__ = "estado_pago"
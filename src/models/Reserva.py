@@ -1,5 +1,6 @@
 from sqlmodel import Relationship, Field, SQLModel
-from datetime import datetime, time
+from sqlalchemy import Index
+from datetime import datetime, date, time
 from typing import Optional, List, TYPE_CHECKING
 from src.models.BaseModel import BaseModel
 from enum import Enum
@@ -18,25 +19,76 @@ class EstadoReserva(Enum):
 
 class Reserva(BaseModel, table=True):
     __tablename__ = "reserva"
+    __table_args__ = (
+        # Cubre la búsqueda de superposición de _check_availability
+        Index("ix_reserva_cancha_fecha_horas", "cancha_id", "fecha", "hora_inicio", "hora_fin", "estado_reserva_id"),
+    )
     
     cliente_id: int = Field(foreign_key="cliente.id")
     cancha_id: int = Field(foreign_key="cancha.id")
     estado_reserva_id: int = Field(foreign_key="estado_reserva.id")
-    horario_id: int = Field(foreign_key="horario.id")
+    # Se completan después del alta (el turno se elige por horas y el pago se registra aparte)
+    horario_id: Optional[int] = Field(default=None, foreign_key="horario.id")
     fecha: datetime
     hora_inicio: time
     hora_fin: time
-    pago_id: int = Field(foreign_key="pago.id")
+    pago_id: Optional[int] = Field(default=None, foreign_key="pago.id")
 
     cliente: Optional["Cliente"] = Relationship(back_populates="reservas")
     cancha: Optional["Cancha"] = Relationship(back_populates="reservas")
-    estado_reserva: Optional["EstadoReserva"] = Relationship(back_populates="reservas")
+    estado_reserva: Optional["EstadoReserva"] = Relationship()
     horario: Optional["Horario"] = Relationship(back_populates="reservas")
-    servicios: List["Servicio"] = Relationship(back_populates="reservas")
-    pago: Optional["Pago"] = Relationship(back_populates="reservas")
+    servicios: List["Servicio"] = Relationship(
+        back_populates="reservas", sa_relationship_kwargs={"secondary": "reserva_servicio"}
+    )
+    # Reserva y pago se referencian mutuamente (pago_id y Pago.reserva_id): se indica la FK de cada lado
+    pago: Optional["Pago"] = Relationship(sa_relationship_kwargs={"foreign_keys": "[Reserva.pago_id]"})
 
 class EstadoReserva(SQLModel, table=True):
     __tablename__ = "estado_reserva"
     
     id: int = Field(default=None, primary_key=True, index=True)
-    nombre: EstadoReserva
\ No newline at end of file
+    nombre: EstadoReserva
+
+class SemaforoCancha(SQLModel, table=True):
+    """
+    Una fila por (cancha_id, fecha). Al reservar se escribe primero esta fila, lo que
+    serializa únicamente las reservas que compiten por la misma cancha y día.
+    """
+    __tablename__ = "semaforo_cancha"
+
+    cancha_id: int = Field(foreign_key="cancha.id", primary_key=True)
+    fecha: date = Field(primary_key=True)
+    version: int = Field(default=0)
+
+class SerieReserva(BaseModel, table=True):
+    """
+    Reserva recurrente semanal (tipo RRULE FREQ=WEEKLY;INTERVAL=n): se repite cada
+    'intervalo_semanas' semanas el mismo día y horario, desde fecha_desde hasta fecha_hasta.
+    Las ocurrencias no se guardan como filas de Reserva: se calculan al consultarlas.
+    """
+    __tablename__ = "serie_reserva"
+    __table_args__ = (
+        Index("ix_serie_reserva_cancha_dia", "cancha_id", "dia_semana", "fecha_desde", "fecha_hasta"),
+    )
+
+    cliente_id: int = Field(foreign_key="cliente.id")
+    cancha_id: int = Field(foreign_key="cancha.id")
+    dia_semana: int  # 0 = lunes ... 6 = domingo (el de fecha_desde)
+    fecha_desde: date
+    fecha_hasta: date
+    hora_inicio: time
+    hora_fin: time
+    intervalo_semanas: int = Field(default=1)
+    activa: bool = Field(default=True)
+
+    excepciones: List["ExcepcionSerie"] = Relationship(back_populates="serie")
+
+class ExcepcionSerie(SQLModel, table=True):
+    """Fecha en la que una serie no se juega (equivale a EXDATE)."""
+    __tablename__ = "excepcion_serie"
+
+    serie_id: int = Field(foreign_key="serie_reserva.id", primary_key=True)
+    fecha: date = Field(primary_key=True)
+
+    serie: Optional["SerieReserva"] = Relationship(back_populates="excepciones")
@@ -2,6 +2,7 @@ from src.models.BaseModel import BaseModel
 from typing import Optional, List
 from datetime import datetime
 from sqlmodel import Relationship, SQLModel, Field
+from sqlalchemy import Index
 
 
 class CanchaTorneoLink(SQLModel, table=True):
@@ -19,3 +20,19 @@ class Torneo(BaseModel, table=True):
         link_model=CanchaTorneoLink
     )
 
+
+class BloqueoCancha(SQLModel, table=True):
+    """
+    Bloqueo de una cancha por un torneo: un único registro por rango [inicio, fin),
+    en lugar de una fila por turno. Mientras dure no se puede reservar la cancha.
+    """
+    __tablename__ = "bloqueo_cancha"
+    __table_args__ = (
+        Index("ix_bloqueo_cancha_rango", "cancha_id", "inicio", "fin"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    cancha_id: int = Field(foreign_key="cancha.id")
+    torneo_id: int = Field(foreign_key="torneo.id")
+    inicio: datetime
+    fin: datetime
@@ -0,0 +1,16 @@
+from sqlmodel import Field, SQLModel
+from datetime import datetime
+
+
+class VersionTabla(SQLModel, table=True):
+    """
+    Versión y fecha de última modificación de cada tabla. La incrementa cada commit que
+    escribe en la tabla, dentro de la misma transacción (ver src/utils/versiones.py): es el
+    estado compartido del que todas las instancias de la API derivan ETag y Last-Modified.
+    """
+    __tablename__ = "version_tabla"
+
+    tabla: str = Field(primary_key=True)
+    version: int = Field(default=0)
+    # UTC, con resolución de segundos (la de Last-Modified)
+    modificada: datetime
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from src.utils.cache import cache_resultados
+from typing import Any, Dict
+
+cache_router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+@cache_router.get("/estadisticas")
+def estadisticas_cache() -> Dict[str, Any]:
+    return cache_resultados.estadisticas()
+
+
+@cache_router.delete("/")
+def limpiar_cache() -> None:
+    cache_resultados.limpiar()
@@ -1,29 +1,79 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
-from database import get_session
-from src.models.Cancha import Cancha
-from typing import List
+from fastapi import APIRouter, Depends, Response
+from src.service.Cancha import CanchasService, CanchasServiceAsync
+from src.schemas.Cancha import CanchaCreate, CanchaUpdate, CanchaResponse
+from src.utils.paginacion import Paginacion
+from src.utils.versiones import CacheHTTP
+from src.utils.respuestas import RespuestaJSON
+from src.models.Cancha import Cancha, TipoCancha
+from typing import List, Optional
 
-canchas_router = APIRouter(prefix="/canchas", tags=["Canchas"])
+# Las canchas casi no cambian: el cliente puede reusar la respuesta un minuto sin revalidar
+cache_canchas = CacheHTTP(Cancha, TipoCancha, cache_control="private, max-age=60")
+respuesta_canchas = RespuestaJSON(List[CanchaResponse])
 
-@canchas_router.get("/")
-def listar_canchas(session: Session = Depends(get_session)) -> List[Cancha]:
-    pass
+canchas_router = APIRouter(prefix="/canchas", tags=["Canchas"], dependencies=[Depends(cache_canchas)])
+
+@canchas_router.get("/", response_model=List[CanchaResponse])
+def listar_canchas(
+    response: Response,
+    nombre: Optional[str] = None,
+    tipo_cancha_id: Optional[int] = None,
+    paginacion: Paginacion = Depends(),
+    canchas_service: CanchasService = Depends(CanchasService),
+) -> Response:
+    canchas = canchas_service.get_canchas(paginacion, nombre, tipo_cancha_id)
+    paginacion.agregar_cursor(response, canchas)
+    return respuesta_canchas(canchas, response)
 
 @canchas_router.get("/{id}")
-def obtener_cancha(id: int, session: Session = Depends(get_session)) -> Cancha:
-    pass
+def obtener_cancha(id: int, canchas_service: CanchasService = Depends(CanchasService)) -> CanchaResponse:
+    return canchas_service.get_cancha(id)
 
 @canchas_router.post("/")
-def crear_cancha(cancha: Cancha, session: Session = Depends(get_session)) -> Cancha:
-    pass
+def crear_cancha(cancha: CanchaCreate, canchas_service: CanchasService = Depends(CanchasService)) -> CanchaResponse:
+    return canchas_service.create_cancha(cancha)
 
 @canchas_router.put("/{id}")
 def actualizar_cancha(
-    id: int, cancha: Cancha, session: Session = Depends(get_session)
-) -> Cancha:
-    pass
+    id: int, cancha: CanchaUpdate, canchas_service: CanchasService = Depends(CanchasService)
+) -> CanchaResponse:
+    return canchas_service.update_cancha(id, cancha)
 
 @canchas_router.delete("/{id}")
-def eliminar_cancha(id: int, session: Session = Depends(get_session)) -> None:
-    pass
+def eliminar_cancha(id: int, canchas_service: CanchasService = Depends(CanchasService)) -> None:
+    return canchas_service.delete_cancha(id)
+
+
+# ===================== VERSIÓN ASYNC =====================
+
+canchas_async_router = APIRouter(prefix="/async/canchas", tags=["Canchas (async)"], dependencies=[Depends(cache_canchas)])
+
+@canchas_async_router.get("/", response_model=List[CanchaResponse])
+async def listar_canchas_async(
+    response: Response,
+    nombre: Optional[str] = None,
+    tipo_cancha_id: Optional[int] = None,
+    paginacion: Paginacion = Depends(),
+    canchas_service: CanchasServiceAsync = Depends(CanchasServiceAsync),
+) -> Response:
+    canchas = await canchas_service.get_canchas(paginacion, nombre, tipo_cancha_id)
+    paginacion.agregar_cursor(response, canchas)
+    return respuesta_canchas(canchas, response)
+
+@canchas_async_router.get("/{id}")
+async def obtener_cancha_async(id: int, canchas_service: CanchasServiceAsync = Depends(CanchasServiceAsync)) -> CanchaResponse:
+    return await canchas_service.get_cancha(id)
+
+@canchas_async_router.post("/")
+async def crear_cancha_async(cancha: CanchaCreate, canchas_service: CanchasServiceAsync = Depends(CanchasServiceAsync)) -> CanchaResponse:
+    return await canchas_service.create_cancha(cancha)
+
+@canchas_async_router.put("/{id}")
+async def actualizar_cancha_async(
+    id: int, cancha: CanchaUpdate, canchas_service: CanchasServiceAsync = Depends(CanchasServiceAsync)
+) -> CanchaResponse:
+    return await canchas_service.update_cancha(id, cancha)
+
+@canchas_async_router.delete("/{id}")
+async def eliminar_cancha_async(id: int, canchas_service: CanchasServiceAsync = Depends(CanchasServiceAsync)) -> None:
+    return await canchas_service.delete_cancha(id)
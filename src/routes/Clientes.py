@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends
-from src.service.Cliente import ClientesService
+from fastapi import APIRouter, Depends, Response
+from src.service.Cliente import ClientesService, ClientesServiceAsync
 from src.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
-from typing import List
+from src.utils.paginacion import Paginacion
+from src.utils.versiones import CacheHTTP
+from src.utils.respuestas import RespuestaJSON
+from src.models.Cliente import Cliente
+from typing import List, Optional
 
-clientes_router = APIRouter(prefix="/clientes", tags=["Clientes"])
+cache_clientes = CacheHTTP(Cliente)
+respuesta_clientes = RespuestaJSON(List[ClienteResponse])
 
-@clientes_router.get("/")
-def listar_clientes(clientes_service: ClientesService = Depends(ClientesService)) -> List[ClienteResponse]:
-    return clientes_service.get_clientes()
+clientes_router = APIRouter(prefix="/clientes", tags=["Clientes"], dependencies=[Depends(cache_clientes)])
+
+@clientes_router.get("/", response_model=List[ClienteResponse])
+def listar_clientes(
+    response: Response,
+    nombre: Optional[str] = None,
+    apellido: Optional[str] = None,
+    email: Optional[str] = None,
+    paginacion: Paginacion = Depends(),
+    clientes_service: ClientesService = Depends(ClientesService),
+) -> Response:
+    clientes = clientes_service.get_clientes(paginacion, nombre, apellido, email)
+    paginacion.agregar_cursor(response, clientes)
+    return respuesta_clientes(clientes, response)
 
 
 @clientes_router.get("/{id}")
@@ -30,3 +46,43 @@ def actualizar_cliente(
 @clientes_router.delete("/{id}")
 def eliminar_cliente(id: int, clientes_service: ClientesService = Depends(ClientesService)) -> None:
     return clientes_service.delete_cliente(id)
+
+
+# ===================== VERSIÓN ASYNC =====================
+
+clientes_async_router = APIRouter(prefix="/async/clientes", tags=["Clientes (async)"], dependencies=[Depends(cache_clientes)])
+
+@clientes_async_router.get("/", response_model=List[ClienteResponse])
+async def listar_clientes_async(
+    response: Response,
+    nombre: Optional[str] = None,
+    apellido: Optional[str] = None,
+    email: Optional[str] = None,
+    paginacion: Paginacion = Depends(),
+    clientes_service: ClientesServiceAsync = Depends(ClientesServiceAsync),
+) -> Response:
+    clientes = await clientes_service.get_clientes(paginacion, nombre, apellido, email)
+    paginacion.agregar_cursor(response, clientes)
+    return respuesta_clientes(clientes, response)
+
+
+@clientes_async_router.get("/{id}")
+async def obtener_cliente_async(id: int, clientes_service: ClientesServiceAsync = Depends(ClientesServiceAsync)) -> ClienteResponse:
+    return await clientes_service.get_cliente(id)
+
+
+@clientes_async_router.post("/")
+async def crear_cliente_async(cliente: ClienteCreate, clientes_service: ClientesServiceAsync = Depends(ClientesServiceAsync)) -> ClienteResponse:
+    return await clientes_service.create_cliente(cliente)
+
+
+@clientes_async_router.put("/{id}")
+async def actualizar_cliente_async(
+    id: int, cliente: ClienteUpdate, clientes_service: ClientesServiceAsync = Depends(ClientesServiceAsync)
+) -> ClienteResponse:
+    return await clientes_service.update_cliente(id, cliente)
+
+
+@clientes_async_router.delete("/{id}")
+async def eliminar_cliente_async(id: int, clientes_service: ClientesServiceAsync = Depends(ClientesServiceAsync)) -> None:
+    return await clientes_service.delete_cliente(id)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from src.service.Dashboard import DashboardService
+from src.schemas.Dashboard import ResumenDashboard
+from typing import Optional
+from datetime import date
+
+dashboard_router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@dashboard_router.get("/resumen")
+def resumen_dashboard(
+    fecha: Optional[date] = None, dashboard_service: DashboardService = Depends(DashboardService)
+) -> ResumenDashboard:
+    return dashboard_service.resumen(fecha)
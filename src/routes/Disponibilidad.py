@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from src.service.Disponibilidad import DisponibilidadService
+from src.schemas.Disponibilidad import DisponibilidadCancha
+from typing import List, Optional
+from datetime import date, time
+
+disponibilidad_router = APIRouter(prefix="/disponibilidad", tags=["Disponibilidad"])
+
+
+@disponibilidad_router.get("/")
+def buscar_disponibilidad(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    tipo_cancha_id: Optional[int] = None,
+    cancha_id: Optional[int] = None,
+    hora_desde: Optional[time] = None,
+    hora_hasta: Optional[time] = None,
+    dia_semana: Optional[int] = Query(None, ge=0, le=6, description="0 = lunes ... 6 = domingo"),
+    duracion_minima: int = Query(0, ge=0, description="Minutos mínimos de cada tramo libre"),
+    disponibilidad_service: DisponibilidadService = Depends(DisponibilidadService),
+) -> List[DisponibilidadCancha]:
+    return disponibilidad_service.get_disponibilidad(
+        fecha_desde, fecha_hasta, tipo_cancha_id, cancha_id, hora_desde, hora_hasta, dia_semana, duracion_minima
+    )
@@ -1,38 +1,97 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
-from database import get_session
+from fastapi import APIRouter, Depends, Response
+from src.service.Horario import HorariosService, HorariosServiceAsync
+from src.schemas.Horario import HorarioCreate, HorarioUpdate, HorarioResponse, HorarioGenerar
+from src.utils.versiones import CacheHTTP
+from src.utils.respuestas import RespuestaJSON
 from src.models.Horario import Horario
-from typing import List
+from typing import List, Optional
 
-horarios_router = APIRouter(prefix="/horarios", tags=["Horarios"])
+cache_horarios = CacheHTTP(Horario, cache_control="private, max-age=60")
+respuesta_horarios = RespuestaJSON(List[HorarioResponse])
 
+horarios_router = APIRouter(prefix="/horarios", tags=["Horarios"], dependencies=[Depends(cache_horarios)])
 
-@horarios_router.get("/{cancha_id}")
+
+# Debe declararse antes de las rutas /{cancha_id}
+@horarios_router.post("/generar")
+def generar_horarios(
+    datos: HorarioGenerar,
+    tipo_cancha_id: Optional[int] = None,
+    horarios_service: HorariosService = Depends(HorariosService),
+) -> List[HorarioResponse]:
+    return horarios_service.generar_horarios(datos, tipo_cancha_id)
+
+
+@horarios_router.get("/{cancha_id}", response_model=List[HorarioResponse])
 def listar_horarios(
-    cancha_id: int, session: Session = Depends(get_session)
-) -> List[Horario]:
-    pass
+    cancha_id: int, response: Response, horarios_service: HorariosService = Depends(HorariosService)
+) -> Response:
+    return respuesta_horarios(horarios_service.get_horarios(cancha_id), response)
 
 
 @horarios_router.post("/{cancha_id}")
 def crear_horario_cancha(
-    cancha_id: int, horario: Horario, session: Session = Depends(get_session)
-) -> Horario:
-    pass
+    cancha_id: int, horario: HorarioCreate, horarios_service: HorariosService = Depends(HorariosService)
+) -> HorarioResponse:
+    return horarios_service.create_horario_cancha(cancha_id, horario)
+
+
+@horarios_router.post("/{cancha_id}/generar")
+def generar_horarios_cancha(
+    cancha_id: int, datos: HorarioGenerar, horarios_service: HorariosService = Depends(HorariosService)
+) -> List[HorarioResponse]:
+    return horarios_service.generar_horarios_cancha(cancha_id, datos)
 
 
 @horarios_router.put("/{cancha_id}/{horario_id}")
 def actualizar_horario_cancha(
     cancha_id: int,
     horario_id: int,
-    horario: Horario,
-    session: Session = Depends(get_session),
-) -> Horario:
-    pass
+    horario: HorarioUpdate,
+    horarios_service: HorariosService = Depends(HorariosService),
+) -> HorarioResponse:
+    return horarios_service.update_horario_cancha(horario_id, horario)
 
 
 @horarios_router.delete("/{cancha_id}/{horario_id}")
 def eliminar_horario_cancha(
-    cancha_id: int, horario_id: int, session: Session = Depends(get_session)
+    cancha_id: int, horario_id: int, horarios_service: HorariosService = Depends(HorariosService)
+) -> None:
+    return horarios_service.delete_horario_cancha(horario_id)
+
+
+# ===================== VERSIÓN ASYNC =====================
+
+horarios_async_router = APIRouter(prefix="/async/horarios", tags=["Horarios (async)"], dependencies=[Depends(cache_horarios)])
+
+
+@horarios_async_router.get("/{cancha_id}", response_model=List[HorarioResponse])
+async def listar_horarios_async(
+    cancha_id: int, response: Response, horarios_service: HorariosServiceAsync = Depends(HorariosServiceAsync)
+) -> Response:
+    horarios = await horarios_service.get_horarios(cancha_id)
+    return respuesta_horarios(horarios, response)
+
+
+@horarios_async_router.post("/{cancha_id}")
+async def crear_horario_cancha_async(
+    cancha_id: int, horario: HorarioCreate, horarios_service: HorariosServiceAsync = Depends(HorariosServiceAsync)
+) -> HorarioResponse:
+    return await horarios_service.create_horario_cancha(cancha_id, horario)
+
+
+@horarios_async_router.put("/{cancha_id}/{horario_id}")
+async def actualizar_horario_cancha_async(
+    cancha_id: int,
+    horario_id: int,
+    horario: HorarioUpdate,
+    horarios_service: HorariosServiceAsync = Depends(HorariosServiceAsync),
+) -> HorarioResponse:
+    return await horarios_service.update_horario_cancha(horario_id, horario)
+
+
+@horarios_async_router.delete("/{cancha_id}/{horario_id}")
+async def eliminar_horario_cancha_async(
+    cancha_id: int, horario_id: int, horarios_service: HorariosServiceAsync = Depends(HorariosServiceAsync)
 ) -> None:
-    pass
+    return await horarios_service.delete_horario_cancha(horario_id)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.utils.metricas import RUTA_METRICAS, exponer_metricas
+
+metricas_router = APIRouter(tags=["Métricas"])
+
+
+@metricas_router.get(RUTA_METRICAS, response_class=PlainTextResponse)
+def metricas() -> PlainTextResponse:
+    # Formato de texto de Prometheus; cada instancia expone solo sus propios contadores
+    return PlainTextResponse(exponer_metricas(), media_type="text/plain; version=0.0.4; charset=utf-8")
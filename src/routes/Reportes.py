@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, Query
+from src.service.Reporte import ReportesService
+from src.schemas.Reporte import (
+    ReporteCancha, ReporteCliente, ReporteMensual, ReporteDiaSemana, ReporteOcupacion, ResumenCliente
+)
+from typing import List, Optional
+from datetime import date
+
+reportes_router = APIRouter(prefix="/reportes", tags=["Reportes"])
+
+
+@reportes_router.get("/canchas")
+def reporte_canchas(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> List[ReporteCancha]:
+    return reportes_service.por_cancha(fecha_desde, fecha_hasta)
+
+
+@reportes_router.get("/clientes")
+def reporte_clientes(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> List[ReporteCliente]:
+    return reportes_service.por_cliente(fecha_desde, fecha_hasta)
+
+
+@reportes_router.get("/mensual")
+def reporte_mensual(
+    anio: int = Query(alias="año"),
+    cancha_id: Optional[int] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> List[ReporteMensual]:
+    return reportes_service.mensual(anio, cancha_id)
+
+
+@reportes_router.get("/dia-semana")
+def reporte_dia_semana(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    cancha_id: Optional[int] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> List[ReporteDiaSemana]:
+    return reportes_service.por_dia_semana(fecha_desde, fecha_hasta, cancha_id)
+
+
+@reportes_router.get("/ocupacion")
+def reporte_ocupacion(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> List[ReporteOcupacion]:
+    return reportes_service.ocupacion(fecha_desde, fecha_hasta)
+
+
+@reportes_router.get("/cliente/{cliente_id}")
+def reporte_cliente(
+    cliente_id: int,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> ResumenCliente:
+    return reportes_service.resumen_cliente(cliente_id, fecha_desde, fecha_hasta)
+
+
+@reportes_router.get("/cancha/{cancha_id}")
+def reporte_cancha(
+    cancha_id: int,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    reportes_service: ReportesService = Depends(ReportesService),
+) -> ReporteOcupacion:
+    return reportes_service.resumen_cancha(cancha_id, fecha_desde, fecha_hasta)
@@ -1,12 +1,140 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session
-from typing import List
-from database import get_session
-from src.models.Reserva import Reserva
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Union
+from datetime import date
+from src.service.Reserva import ReservasService, ReservasServiceAsync
+from src.service.Serie import SeriesService
+from src.schemas.Reserva import (
+    ReservaCreate, ReservaResponse, ReservaFiltros, ReservaLoteCreate, ReservaLoteResponse,
+    SerieReservaCreate, SerieReservaResponse, ExcepcionSerieCreate, OcurrenciaSerie
+)
+from src.utils.paginacion import Paginacion
+from src.utils.respuestas import RespuestaJSON
+
+# Reservas y, en la primera página, las ocurrencias de las series del mismo rango
+ListadoReservas = List[Union[ReservaResponse, OcurrenciaSerie]]
+
+# Los listados de reservas pueden ser grandes: se serializan directo a bytes
+respuesta_reservas = RespuestaJSON(ListadoReservas)
 
 reservas_router = APIRouter(prefix="/reservas", tags=["Reservas"])
 
 
-@reservas_router.get("/")
-def listar_reservas(session: Session = Depends(get_session)) -> List[Reserva]:
-    pass
+@reservas_router.get("/", response_model=ListadoReservas)
+def listar_reservas(
+    response: Response,
+    filtros: ReservaFiltros = Depends(),
+    paginacion: Paginacion = Depends(),
+    reservas_service: ReservasService = Depends(ReservasService),
+) -> Response:
+    reservas = reservas_service.get_reservas(filtros, paginacion)
+    # El cursor recorre solo las reservas; las ocurrencias no tienen id y van en la primera página
+    paginacion.agregar_cursor(response, reservas)
+    ocurrencias = reservas_service.get_ocurrencias_series(filtros) if paginacion.after_id is None else []
+    return respuesta_reservas([*reservas, *ocurrencias], response)
+
+
+@reservas_router.get("/export")
+def exportar_reservas(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    filtros: ReservaFiltros = Depends(),
+    reservas_service: ReservasService = Depends(ReservasService),
+) -> StreamingResponse:
+    media_type = "text/csv" if formato == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        reservas_service.exportar_reservas(filtros, formato),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=reservas.{formato}"},
+    )
+
+
+@reservas_router.post("/")
+def crear_reserva(reserva: ReservaCreate, reservas_service: ReservasService = Depends(ReservasService)) -> ReservaResponse:
+    return reservas_service.create_reserva(reserva)
+
+
+@reservas_router.post("/bulk")
+def crear_reservas_lote(
+    lote: ReservaLoteCreate, reservas_service: ReservasService = Depends(ReservasService)
+) -> ReservaLoteResponse:
+    return reservas_service.create_reservas_lote(lote)
+
+
+@reservas_router.get("/series")
+def listar_series(
+    cancha_id: Optional[int] = None,
+    cliente_id: Optional[int] = None,
+    series_service: SeriesService = Depends(SeriesService),
+) -> List[SerieReservaResponse]:
+    return series_service.get_series(cancha_id, cliente_id)
+
+
+@reservas_router.get("/series/ocurrencias")
+def listar_ocurrencias_series(
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    cancha_id: Optional[int] = None,
+    cliente_id: Optional[int] = None,
+    series_service: SeriesService = Depends(SeriesService),
+) -> List[OcurrenciaSerie]:
+    return series_service.get_ocurrencias(fecha_desde, fecha_hasta, cancha_id, cliente_id)
+
+
+@reservas_router.post("/series")
+def crear_serie(serie: SerieReservaCreate, series_service: SeriesService = Depends(SeriesService)) -> SerieReservaResponse:
+    return series_service.create_serie(serie)
+
+
+@reservas_router.post("/series/{id}/excepciones")
+def agregar_excepcion_serie(
+    id: int, excepcion: ExcepcionSerieCreate, series_service: SeriesService = Depends(SeriesService)
+) -> SerieReservaResponse:
+    return series_service.agregar_excepcion(id, excepcion)
+
+
+@reservas_router.put("/series/{id}/cancelar")
+def cancelar_serie(id: int, series_service: SeriesService = Depends(SeriesService)) -> SerieReservaResponse:
+    return series_service.cancelar_serie(id)
+
+
+@reservas_router.put("/{id}/cancelar")
+def cancelar_reserva(id: int, reservas_service: ReservasService = Depends(ReservasService)) -> ReservaResponse:
+    return reservas_service.cancelar_reserva(id)
+
+
+@reservas_router.put("/{id}/confirmar")
+def confirmar_reserva(id: int, reservas_service: ReservasService = Depends(ReservasService)) -> ReservaResponse:
+    return reservas_service.confirmar_reserva(id)
+
+
+# ===================== VERSIÓN ASYNC =====================
+
+reservas_async_router = APIRouter(prefix="/async/reservas", tags=["Reservas (async)"])
+
+
+@reservas_async_router.get("/", response_model=ListadoReservas)
+async def listar_reservas_async(
+    response: Response,
+    filtros: ReservaFiltros = Depends(),
+    paginacion: Paginacion = Depends(),
+    reservas_service: ReservasServiceAsync = Depends(ReservasServiceAsync),
+) -> Response:
+    reservas = await reservas_service.get_reservas(filtros, paginacion)
+    paginacion.agregar_cursor(response, reservas)
+    ocurrencias = await reservas_service.get_ocurrencias_series(filtros) if paginacion.after_id is None else []
+    return respuesta_reservas([*reservas, *ocurrencias], response)
+
+
+@reservas_async_router.post("/")
+async def crear_reserva_async(reserva: ReservaCreate, reservas_service: ReservasServiceAsync = Depends(ReservasServiceAsync)) -> ReservaResponse:
+    return await reservas_service.create_reserva(reserva)
+
+
+@reservas_async_router.put("/{id}/cancelar")
+async def cancelar_reserva_async(id: int, reservas_service: ReservasServiceAsync = Depends(ReservasServiceAsync)) -> ReservaResponse:
+    return await reservas_service.cancelar_reserva(id)
+
+
+@reservas_async_router.put("/{id}/confirmar")
+async def confirmar_reserva_async(id: int, reservas_service: ReservasServiceAsync = Depends(ReservasServiceAsync)) -> ReservaResponse:
+    return await reservas_service.confirmar_reserva(id)
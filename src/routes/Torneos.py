@@ -1,23 +1,43 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlmodel import Session
 from database import get_session
-from src.models.Torneo import Torneo
-from src.models.Cancha import Cancha
-from typing import List
+from src.models.Torneo import Torneo, CanchaTorneoLink
+from src.models.Cancha import Cancha, TipoCancha
+from src.service.Torneo import TorneosService, TorneosServiceAsync
+from src.schemas.Torneo import TorneoCreate, TorneoResponse
+from src.schemas.Cancha import CanchaResponse
+from src.utils.paginacion import Paginacion
+from src.utils.versiones import CacheHTTP
+from src.utils.respuestas import RespuestaJSON
+from typing import List, Optional
+from datetime import date
 
-torneos_router = APIRouter(prefix="/torneos", tags=["Torneos"])
+# La respuesta incluye las canchas de cada torneo
+cache_torneos = CacheHTTP(Torneo, CanchaTorneoLink, Cancha, TipoCancha)
+respuesta_torneos = RespuestaJSON(List[TorneoResponse])
 
-@torneos_router.get("/")
-def listar_torneos(session: Session = Depends(get_session)) -> List[Torneo]:
-    pass
+torneos_router = APIRouter(prefix="/torneos", tags=["Torneos"], dependencies=[Depends(cache_torneos)])
+
+@torneos_router.get("/", response_model=List[TorneoResponse])
+def listar_torneos(
+    response: Response,
+    nombre: Optional[str] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    paginacion: Paginacion = Depends(),
+    torneos_service: TorneosService = Depends(TorneosService),
+) -> Response:
+    torneos = torneos_service.get_torneos(paginacion, nombre, fecha_desde, fecha_hasta)
+    paginacion.agregar_cursor(response, torneos)
+    return respuesta_torneos(torneos, response)
 
 @torneos_router.get("/{id}")
 def obtener_torneo(id: int, session: Session = Depends(get_session)) -> Torneo:
     pass
 
 @torneos_router.post("/")
-def crear_torneo(torneo: Torneo, session: Session = Depends(get_session)) -> Torneo:
-    pass
+def crear_torneo(torneo: TorneoCreate, torneos_service: TorneosService = Depends(TorneosService)) -> TorneoResponse:
+    return torneos_service.create_torneo(torneo)
 
 @torneos_router.put("/{id}")
 def actualizar_torneo(
@@ -27,9 +47,9 @@ def actualizar_torneo(
 
 @torneos_router.post("/{id}/canchas")
 def agregar_cancha_torneo(
-    id: int, cancha: Cancha, session: Session = Depends(get_session)
-) -> Cancha:
-    pass
+    id: int, cancha_id: int, torneos_service: TorneosService = Depends(TorneosService)
+) -> CanchaResponse:
+    return torneos_service.agregar_cancha_torneo(id, cancha_id)
 
 @torneos_router.get("/{id}/canchas")
 def listar_canchas_torneo(
@@ -40,3 +60,31 @@ def listar_canchas_torneo(
 @torneos_router.delete("/{id}")
 def eliminar_torneo(id: int, session: Session = Depends(get_session)) -> None:
     pass
+
+
+# ===================== VERSIÓN ASYNC =====================
+
+torneos_async_router = APIRouter(prefix="/async/torneos", tags=["Torneos (async)"], dependencies=[Depends(cache_torneos)])
+
+@torneos_async_router.get("/", response_model=List[TorneoResponse])
+async def listar_torneos_async(
+    response: Response,
+    nombre: Optional[str] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    paginacion: Paginacion = Depends(),
+    torneos_service: TorneosServiceAsync = Depends(TorneosServiceAsync),
+) -> Response:
+    torneos = await torneos_service.get_torneos(paginacion, nombre, fecha_desde, fecha_hasta)
+    paginacion.agregar_cursor(response, torneos)
+    return respuesta_torneos(torneos, response)
+
+@torneos_async_router.post("/")
+async def crear_torneo_async(torneo: TorneoCreate, torneos_service: TorneosServiceAsync = Depends(TorneosServiceAsync)) -> TorneoResponse:
+    return await torneos_service.create_torneo(torneo)
+
+@torneos_async_router.post("/{id}/canchas")
+async def agregar_cancha_torneo_async(
+    id: int, cancha_id: int, torneos_service: TorneosServiceAsync = Depends(TorneosServiceAsync)
+) -> CanchaResponse:
+    return await torneos_service.agregar_cancha_torneo(id, cancha_id)
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date, time
+
+
+class ProximaReserva(BaseModel):
+    id: int
+    fecha: date
+    hora_inicio: time
+    hora_fin: time
+    cancha_id: int
+    cancha: str
+    cliente: str
+    estado: str
+
+
+class DiaDashboard(BaseModel):
+    fecha: date
+    nombre_dia: str
+    cantidad_reservas: int
+    horas_reservadas: float
+
+
+class ResumenDashboard(BaseModel):
+    fecha: date
+    reservas_hoy: int
+    horas_reservadas_hoy: float
+    ingresos_hoy: float
+    clientes_totales: int
+    canchas_totales: int
+    canchas_activas: int  # con algún horario disponible y sin bloqueo de torneo en este momento
+    proximas_reservas: List[ProximaReserva]  # reservas individuales; las series solo suman en los totales
+    semana: List[DiaDashboard]  # lunes a domingo de la semana de 'fecha'
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date, time
+
+
+class TramoLibre(BaseModel):
+    hora_inicio: time
+    hora_fin: time
+
+
+class DisponibilidadDia(BaseModel):
+    fecha: date
+    libres: List[TramoLibre]
+
+
+class DisponibilidadCancha(BaseModel):
+    cancha_id: int
+    nombre: str
+    tipo_cancha_id: int
+    dias: List[DisponibilidadDia]
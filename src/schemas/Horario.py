@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import time, datetime
 from typing import Optional
 
@@ -27,3 +27,13 @@ class HorarioResponse(HorarioBase):
 
     class Config:
         from_attributes = True
+
+
+class HorarioGenerar(BaseModel):
+    """Franja de apertura que se divide en turnos consecutivos de duracion_minutos."""
+    hora_apertura: time
+    hora_cierre: time
+    duracion_minutos: int = Field(60, ge=15, le=720)
+    disponible: bool = True
+    # False: si algún turno se superpone con uno existente no se crea ninguno (409)
+    omitir_superpuestos: bool = False
@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ReporteCancha(BaseModel):
+    cancha_id: int
+    nombre: str
+    cantidad_reservas: int
+    horas_totales: float
+
+
+class ReporteCliente(BaseModel):
+    cliente_id: int
+    nombre: str
+    apellido: str
+    cantidad_reservas: int
+    horas_totales: float
+
+
+class ReporteMensual(BaseModel):
+    mes: int
+    cantidad_reservas: int
+    horas_totales: float
+
+
+class ReporteDiaSemana(BaseModel):
+    dia_semana: int  # 0 = lunes ... 6 = domingo
+    nombre_dia: str
+    cantidad_reservas: int
+    horas_totales: float
+
+
+class ReporteOcupacion(BaseModel):
+    cancha_id: int
+    nombre: str
+    cantidad_reservas: int
+    horas_reservadas: float
+    horas_disponibles: float
+    tasa_ocupacion: float  # porcentaje
+
+
+class ResumenCliente(BaseModel):
+    cliente_id: int
+    cantidad_reservas: int
+    horas_totales: float
+    por_cancha: List[ReporteCancha]
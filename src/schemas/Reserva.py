@@ -1,8 +1,8 @@
-from pydantic import BaseModel
-from datetime import datetime, time
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime, time
+from typing import Optional, List, Literal
 from src.schemas.cliente import ClienteResponse
-from src.schemas.cancha import CanchaResponse
+from src.schemas.Cancha import CanchaResponse
 from src.schemas.servicio import ServicioResponse
 from src.schemas.pago import PagoResponse
 
@@ -50,3 +50,80 @@ class ReservaResponse(ReservaBase):
 
     class Config:
         from_attributes = True
+
+class ReservaFiltros(BaseModel):
+    """Filtros del listado de reservas (se reciben como query params)."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    fecha: Optional[date] = None
+    fecha_desde: Optional[date] = None
+    fecha_hasta: Optional[date] = None
+    anio: Optional[int] = Field(None, alias="año")
+    cancha_id: Optional[int] = None
+    cliente_id: Optional[int] = None
+    estado: Optional[str] = None
+    # Agrega al listado las ocurrencias de las series (no tienen estado: se omiten al filtrar por uno)
+    incluir_series: bool = True
+
+# Máximo de reservas por pedido de alta masiva
+LOTE_MAXIMO_RESERVAS = 500
+
+class ReservaLoteCreate(BaseModel):
+    reservas: List[ReservaCreate] = Field(min_length=1, max_length=LOTE_MAXIMO_RESERVAS)
+    # todo_o_nada: si alguna falla no se crea ninguna; parcial: se crean las válidas
+    modo: Literal["todo_o_nada", "parcial"] = "todo_o_nada"
+
+class ErrorReservaLote(BaseModel):
+    indice: int  # posición en la lista enviada
+    status_code: int
+    detail: str
+
+class ReservaLoteResponse(BaseModel):
+    creadas: List[ReservaResponse]
+    errores: List[ErrorReservaLote]
+
+# Duración máxima de una serie (una temporada)
+DIAS_SERIE_MAXIMO = 366
+
+class SerieReservaCreate(BaseModel):
+    cliente_id: int
+    cancha_id: int
+    # La serie se juega el día de la semana de fecha_desde
+    fecha_desde: date
+    fecha_hasta: date
+    hora_inicio: time
+    hora_fin: time
+    intervalo_semanas: int = Field(1, ge=1, le=52)
+
+class ExcepcionSerieCreate(BaseModel):
+    fecha: date
+
+class ExcepcionSerieResponse(BaseModel):
+    fecha: date
+
+    class Config:
+        from_attributes = True
+
+class SerieReservaResponse(BaseModel):
+    id: int
+    cliente_id: int
+    cancha_id: int
+    dia_semana: int
+    fecha_desde: date
+    fecha_hasta: date
+    hora_inicio: time
+    hora_fin: time
+    intervalo_semanas: int
+    activa: bool
+    excepciones: List[ExcepcionSerieResponse]
+
+    class Config:
+        from_attributes = True
+
+class OcurrenciaSerie(BaseModel):
+    serie_id: int
+    cliente_id: int
+    cancha_id: int
+    fecha: date
+    hora_inicio: time
+    hora_fin: time
@@ -34,4 +34,7 @@ class ClienteUpdate(ClienteBase):
 class ClienteResponse(ClienteBase):
     id: int
     fecha_creacion: datetime
-    fecha_actualizacion: datetime
\ No newline at end of file
+    fecha_actualizacion: datetime
+
+    class Config:
+        from_attributes = True
@@ -25,8 +25,6 @@ class PagoUpdate(BaseModel):
 class PagoResponse(PagoBase):
     id: int
     estado_pago_id: int
-    fecha_creacion: datetime
-    fecha_actualizacion: datetime
 
     estado_pago: EstadoPagoResponse
 
@@ -1,6 +1,5 @@
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 
 
 class ServicioBase(BaseModel):
@@ -19,8 +18,6 @@ class ServicioUpdate(ServicioBase):
 
 class ServicioResponse(ServicioBase):
     id: int
-    fecha_creacion: datetime
-    fecha_actualizacion: datetime
 
     class Config:
         from_attributes = True
@@ -1,20 +1,42 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, col
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import joinedload
 from fastapi import Depends, HTTPException
-from database import get_session
+from database import get_session, get_async_session
 from src.models.Cancha import Cancha, TipoCancha
 from src.schemas.Cancha import CanchaCreate, CanchaUpdate, CanchaResponse
+from src.utils.cache import cache_resultados
+from src.utils.catalogos import catalogos
+from src.utils.paginacion import Paginacion
 from typing import List, Optional
 
+# Tablas de las que depende el listado cacheado
+ETIQUETAS_CANCHAS = (Cancha.__tablename__, TipoCancha.__tablename__)
+
+
+def _filtrar_canchas(query, nombre: Optional[str] = None, tipo_cancha_id: Optional[int] = None):
+    if nombre:
+        query = query.where(col(Cancha.nombre).ilike(f"%{nombre}%"))
+    if tipo_cancha_id is not None:
+        query = query.where(Cancha.tipo_cancha_id == tipo_cancha_id)
+    return query
+
 
 class CanchasService:
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
-    def get_canchas(self) -> List[CanchaResponse]:
-        canchas = self.session.exec(
-            select(Cancha).order_by(Cancha.nombre)
-        ).all()
-        return [CanchaResponse.model_validate(cancha) for cancha in canchas]
+    def get_canchas(self, paginacion: Optional[Paginacion] = None, nombre: Optional[str] = None,
+                    tipo_cancha_id: Optional[int] = None) -> List[CanchaResponse]:
+        def consultar():
+            query = _filtrar_canchas(select(Cancha), nombre, tipo_cancha_id)
+            # Con paginación el orden es por id (keyset); sin ella se mantiene el orden por nombre
+            query = paginacion.aplicar(query, Cancha) if paginacion else query.order_by(Cancha.nombre)
+            canchas = self.session.exec(query.options(joinedload(Cancha.tipo_cancha))).all()
+            return [CanchaResponse.model_validate(cancha) for cancha in canchas]
+
+        clave = ("canchas", paginacion and paginacion.clave(), nombre, tipo_cancha_id)
+        return cache_resultados.obtener_o_calcular(clave, ETIQUETAS_CANCHAS, consultar)
 
     def get_cancha(self, id: int) -> CanchaResponse:
         cancha = self.session.get(Cancha, id)
@@ -23,8 +45,7 @@ class CanchasService:
         return CanchaResponse.model_validate(cancha)
 
     def create_cancha(self, cancha: CanchaCreate) -> CanchaResponse:
-        tipo_cancha = self.session.get(TipoCancha, cancha.tipo_cancha_id)
-        if not tipo_cancha:
+        if not catalogos.existe_tipo_cancha(self.session, cancha.tipo_cancha_id):
             raise HTTPException(status_code=400, detail="El tipo de cancha especificado no existe.")
 
         try:
@@ -44,8 +65,7 @@ class CanchasService:
             raise HTTPException(status_code=404, detail="Cancha no encontrada")
 
         if cancha_data.tipo_cancha_id is not None:
-            tipo_cancha = self.session.get(TipoCancha, cancha_data.tipo_cancha_id)
-            if not tipo_cancha:
+            if not catalogos.existe_tipo_cancha(self.session, cancha_data.tipo_cancha_id):
                 raise HTTPException(status_code=400, detail="El tipo de cancha especificado no existe.")
 
         update_data = cancha_data.model_dump(exclude_unset=True)
@@ -64,3 +84,69 @@ class CanchasService:
 
         self.session.delete(cancha_obj)
         self.session.commit()
+
+
+class CanchasServiceAsync:
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    async def get_canchas(self, paginacion: Optional[Paginacion] = None, nombre: Optional[str] = None,
+                          tipo_cancha_id: Optional[int] = None) -> List[CanchaResponse]:
+        async def consultar():
+            query = _filtrar_canchas(select(Cancha), nombre, tipo_cancha_id)
+            query = paginacion.aplicar(query, Cancha) if paginacion else query.order_by(Cancha.nombre)
+            canchas = (await self.session.exec(query.options(joinedload(Cancha.tipo_cancha)))).all()
+            return [CanchaResponse.model_validate(cancha) for cancha in canchas]
+
+        # Misma clave que la versión sync: ambas comparten la cache
+        clave = ("canchas", paginacion and paginacion.clave(), nombre, tipo_cancha_id)
+        return await cache_resultados.obtener_o_calcular_async(clave, ETIQUETAS_CANCHAS, consultar)
+
+    async def get_cancha(self, id: int) -> CanchaResponse:
+        cancha = await self.session.get(Cancha, id)
+        if not cancha:
+            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+        return CanchaResponse.model_validate(cancha)
+
+    async def create_cancha(self, cancha: CanchaCreate) -> CanchaResponse:
+        await catalogos.asegurar_cargado_async(self.session)
+        if not catalogos.existe_tipo_cancha(self.session.sync_session, cancha.tipo_cancha_id):
+            raise HTTPException(status_code=400, detail="El tipo de cancha especificado no existe.")
+
+        try:
+            new_cancha = Cancha.model_validate(cancha)
+            self.session.add(new_cancha)
+            await self.session.commit()
+            await self.session.refresh(new_cancha)
+            return CanchaResponse.model_validate(new_cancha)
+        except Exception as e:
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error al crear cancha: {e}")
+
+    async def update_cancha(self, id: int, cancha_data: CanchaUpdate) -> CanchaResponse:
+        cancha_obj = await self.session.get(Cancha, id)
+
+        if not cancha_obj:
+            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+
+        if cancha_data.tipo_cancha_id is not None:
+            await catalogos.asegurar_cargado_async(self.session)
+            if not catalogos.existe_tipo_cancha(self.session.sync_session, cancha_data.tipo_cancha_id):
+                raise HTTPException(status_code=400, detail="El tipo de cancha especificado no existe.")
+
+        update_data = cancha_data.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(cancha_obj, key, value)
+
+        self.session.add(cancha_obj)
+        await self.session.commit()
+        await self.session.refresh(cancha_obj)
+        return CanchaResponse.model_validate(cancha_obj)
+
+    async def delete_cancha(self, id: int) -> None:
+        cancha_obj = await self.session.get(Cancha, id)
+        if not cancha_obj:
+            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+
+        await self.session.delete(cancha_obj)
+        await self.session.commit()
@@ -1,16 +1,33 @@
 from sqlmodel import Session
 from src.models.Cliente import Cliente
 from src.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
-from sqlmodel import select
+from sqlmodel import select, col
+from src.utils.paginacion import Paginacion
+from typing import Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends, HTTPException
-from database import get_session
+from database import get_session, get_async_session
+
+def _filtrar_clientes(query, nombre: Optional[str] = None, apellido: Optional[str] = None, email: Optional[str] = None):
+    if nombre:
+        query = query.where(col(Cliente.nombre).ilike(f"%{nombre}%"))
+    if apellido:
+        query = query.where(col(Cliente.apellido).ilike(f"%{apellido}%"))
+    if email:
+        query = query.where(col(Cliente.email).ilike(f"%{email}%"))
+    return query
+
 
 class ClientesService:
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
-    def get_clientes(self):
-        clientes = self.session.exec(select(Cliente)).all()
+    def get_clientes(self, paginacion: Optional[Paginacion] = None, nombre: Optional[str] = None,
+                     apellido: Optional[str] = None, email: Optional[str] = None):
+        query = _filtrar_clientes(select(Cliente), nombre, apellido, email)
+        if paginacion:
+            query = paginacion.aplicar(query, Cliente)
+        clientes = self.session.exec(query).all()
         return [ClienteResponse.model_validate(cliente) for cliente in clientes]
     
     def get_cliente(self, id: int):
@@ -53,4 +70,59 @@ class ClientesService:
         cliente_obj = self.session.exec(select(Cliente).where(Cliente.id == id)).one()
         self.session.delete(cliente_obj)
         self.session.commit()
-        
+
+
+class ClientesServiceAsync:
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    async def get_clientes(self, paginacion: Optional[Paginacion] = None, nombre: Optional[str] = None,
+                           apellido: Optional[str] = None, email: Optional[str] = None):
+        query = _filtrar_clientes(select(Cliente), nombre, apellido, email)
+        if paginacion:
+            query = paginacion.aplicar(query, Cliente)
+        clientes = (await self.session.exec(query)).all()
+        return [ClienteResponse.model_validate(cliente) for cliente in clientes]
+
+    async def get_cliente(self, id: int):
+        cliente = await self.session.get(Cliente, id)
+        if not cliente:
+            raise HTTPException(status_code=404, detail="Cliente no encontrado")
+        return cliente
+
+    async def create_cliente(self, cliente: ClienteCreate) -> Cliente:
+        try:
+            new_cliente = Cliente(
+                nombre=cliente.nombre,
+                apellido=cliente.apellido,
+                telefono=cliente.telefono,
+                email=cliente.email
+            )
+            self.session.add(new_cliente)
+            await self.session.commit()
+            await self.session.refresh(new_cliente)
+            return ClienteResponse.model_validate(new_cliente)
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+
+    async def update_cliente(self, id: int, cliente_data: ClienteUpdate):
+        cliente_obj = await self.session.get(Cliente, id)
+
+        if not cliente_obj:
+            raise HTTPException(status_code=404, detail="Cliente no encontrado")
+
+        for key, value in cliente_data.model_dump().items():
+            setattr(cliente_obj, key, value)
+
+        self.session.add(cliente_obj)
+        await self.session.commit()
+        await self.session.refresh(cliente_obj)
+        return ClienteResponse.model_validate(cliente_obj)
+
+    async def delete_cliente(self, id: int):
+        cliente_obj = await self.session.get(Cliente, id)
+        if not cliente_obj:
+            raise HTTPException(status_code=404, detail="Cliente no encontrado")
+        await self.session.delete(cliente_obj)
+        await self.session.commit()
@@ -0,0 +1,129 @@
+# src/service/Dashboard.py
+from sqlmodel import Session, select, func, or_, exists
+from fastapi import Depends
+from database import get_session
+from src.models.Reserva import Reserva, EstadoReserva
+from src.models.Cancha import Cancha
+from src.models.Cliente import Cliente
+from src.models.Horario import Horario
+from src.models.Pago import Pago
+from src.models.Torneo import BloqueoCancha
+from src.models.Ocupacion import OcupacionDiaria
+from src.schemas.Dashboard import ResumenDashboard, ProximaReserva, DiaDashboard
+from src.service.Reporte import DIAS_SEMANA
+from src.utils.catalogos import catalogos
+from typing import Optional
+from datetime import date, datetime, time, timedelta
+
+# Cantidad de reservas que se listan como próximas
+PROXIMAS_RESERVAS = 10
+
+
+class DashboardService:
+    """
+    Todo lo que muestra el dashboard en tres consultas agregadas: totales, próximas
+    reservas y resumen semanal (este último sale de ocupacion_diaria, que ya incluye las series).
+    """
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def resumen(self, fecha: Optional[date] = None) -> ResumenDashboard:
+        ahora = datetime.now()
+        fecha = fecha or ahora.date()
+        inicio_dia = datetime.combine(fecha, time.min)
+        # Con una fecha pasada o futura se toma el día completo como referencia
+        momento = ahora if fecha == ahora.date() else inicio_dia
+        estado_cancelada_id = catalogos.estado_reserva_id(self.session, 'Cancelada')
+
+        # 1. Totales en una sola fila (subconsultas escalares).
+        # Ingresos = pagos cobrados de las reservas del día
+        ingresos = (
+            select(func.coalesce(func.sum(Pago.monto), 0))
+            .join(Reserva, Reserva.pago_id == Pago.id)
+            .where(
+                Reserva.fecha >= inicio_dia,
+                Reserva.fecha < inicio_dia + timedelta(days=1),
+                Reserva.estado_reserva_id != estado_cancelada_id,
+                Pago.estado_pago_id == catalogos.estado_pago_id(self.session, 'Cobrado'),
+            )
+            .scalar_subquery()
+        )
+        canchas_activas = (
+            select(func.count(func.distinct(Horario.cancha_id)))
+            .where(
+                Horario.disponible == True,  # noqa: E712
+                ~exists().where(
+                    BloqueoCancha.cancha_id == Horario.cancha_id,
+                    BloqueoCancha.inicio <= momento,
+                    BloqueoCancha.fin > momento,
+                ),
+            )
+            .scalar_subquery()
+        )
+        clientes_totales, canchas_totales, canchas_activas, ingresos_hoy = self.session.exec(
+            select(
+                select(func.count()).select_from(Cliente).scalar_subquery(),
+                select(func.count()).select_from(Cancha).scalar_subquery(),
+                canchas_activas,
+                ingresos,
+            )
+        ).one()
+
+        # 2. Próximas reservas (desde este momento) con los nombres ya resueltos
+        filas = self.session.exec(
+            select(
+                Reserva.id, Reserva.fecha, Reserva.hora_inicio, Reserva.hora_fin,
+                Cancha.id, Cancha.nombre, Cliente.nombre, Cliente.apellido, EstadoReserva.nombre
+            )
+            .join(Cancha, Cancha.id == Reserva.cancha_id)
+            .join(Cliente, Cliente.id == Reserva.cliente_id)
+            .join(EstadoReserva, EstadoReserva.id == Reserva.estado_reserva_id)
+            .where(
+                Reserva.estado_reserva_id != estado_cancelada_id,
+                Reserva.fecha >= datetime.combine(momento.date(), time.min),
+                or_(Reserva.fecha >= datetime.combine(momento.date() + timedelta(days=1), time.min),
+                    Reserva.hora_fin > momento.time()),
+            )
+            .order_by(Reserva.fecha, Reserva.hora_inicio, Reserva.id)
+            .limit(PROXIMAS_RESERVAS)
+        ).all()
+        proximas = [
+            ProximaReserva(
+                id=id, fecha=fecha_reserva.date(), hora_inicio=hora_inicio, hora_fin=hora_fin,
+                cancha_id=cancha_id, cancha=cancha, cliente=f"{nombre} {apellido}",
+                estado=getattr(estado, "value", estado)
+            )
+            for id, fecha_reserva, hora_inicio, hora_fin, cancha_id, cancha, nombre, apellido, estado in filas
+        ]
+
+        # 3. Reservas y horas por día de la semana, desde el resumen materializado
+        lunes = fecha - timedelta(days=fecha.weekday())
+        por_dia = {
+            dia: (cantidad, minutos)
+            for dia, cantidad, minutos in self.session.exec(
+                select(OcupacionDiaria.fecha, func.sum(OcupacionDiaria.cantidad_reservas),
+                       func.sum(OcupacionDiaria.minutos_reservados))
+                .where(OcupacionDiaria.fecha >= lunes, OcupacionDiaria.fecha <= lunes + timedelta(days=6))
+                .group_by(OcupacionDiaria.fecha)
+            ).all()
+        }
+        semana = []
+        for i in range(7):
+            dia = lunes + timedelta(days=i)
+            cantidad, minutos = por_dia.get(dia, (0, 0))
+            semana.append(DiaDashboard(
+                fecha=dia, nombre_dia=DIAS_SEMANA[i], cantidad_reservas=cantidad or 0, horas_reservadas=round((minutos or 0) / 60, 2)
+            ))
+
+        return ResumenDashboard(
+            fecha=fecha,
+            reservas_hoy=semana[fecha.weekday()].cantidad_reservas,
+            horas_reservadas_hoy=semana[fecha.weekday()].horas_reservadas,
+            ingresos_hoy=float(ingresos_hoy or 0),
+            clientes_totales=clientes_totales,
+            canchas_totales=canchas_totales,
+            canchas_activas=canchas_activas,
+            proximas_reservas=proximas,
+            semana=semana,
+        )
@@ -0,0 +1,142 @@
+# src/service/Disponibilidad.py
+from sqlmodel import Session, select
+from fastapi import Depends, HTTPException
+from database import get_session
+from src.models.Cancha import Cancha
+from src.models.Horario import Horario
+from src.models.Reserva import Reserva
+from src.models.Torneo import BloqueoCancha
+from src.schemas.Disponibilidad import DisponibilidadCancha, DisponibilidadDia, TramoLibre
+from src.utils.catalogos import catalogos
+from src.utils.intervalos import restar_intervalos
+from src.utils.ocupacion import minutos_entre
+from src.utils.series import ocurrencias, consulta_series_rango, consulta_excepciones
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+
+# Rango máximo de días por consulta
+DIAS_DISPONIBILIDAD_MAXIMO = 62
+
+
+class DisponibilidadService:
+    """
+    Tramos libres de todas las canchas (o de un tipo) en un rango de fechas.
+    Se consultan los horarios, las reservas activas, las series y los bloqueos del rango;
+    la resta de intervalos se resuelve en memoria con un barrido lineal por cancha y día.
+    """
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def get_disponibilidad(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        tipo_cancha_id: Optional[int] = None,
+        cancha_id: Optional[int] = None,
+        hora_desde: Optional[time] = None,
+        hora_hasta: Optional[time] = None,
+        dia_semana: Optional[int] = None,
+        duracion_minima: int = 0,
+    ) -> List[DisponibilidadCancha]:
+        fecha_desde = fecha_desde or date.today()
+        fecha_hasta = fecha_hasta or fecha_desde
+        if fecha_desde > fecha_hasta:
+            raise HTTPException(status_code=400, detail="fecha_desde debe ser anterior a fecha_hasta.")
+        if (fecha_hasta - fecha_desde).days + 1 > DIAS_DISPONIBILIDAD_MAXIMO:
+            raise HTTPException(status_code=400, detail=f"El rango no puede superar {DIAS_DISPONIBILIDAD_MAXIMO} días.")
+        if tipo_cancha_id is not None and not catalogos.existe_tipo_cancha(self.session, tipo_cancha_id):
+            raise HTTPException(status_code=400, detail="El tipo de cancha especificado no existe.")
+
+        # 1. Canchas
+        query_canchas = select(Cancha.id, Cancha.nombre, Cancha.tipo_cancha_id).order_by(Cancha.id)
+        if tipo_cancha_id is not None:
+            query_canchas = query_canchas.where(Cancha.tipo_cancha_id == tipo_cancha_id)
+        if cancha_id is not None:
+            query_canchas = query_canchas.where(Cancha.id == cancha_id)
+        canchas = self.session.exec(query_canchas).all()
+        if not canchas:
+            return []
+        ids = [c[0] for c in canchas]
+
+        # 2. Ventanas habilitadas por cancha (los horarios se repiten todos los días),
+        # recortadas a la franja pedida
+        ventanas: Dict[int, List[Tuple[time, time]]] = defaultdict(list)
+        horarios = self.session.exec(
+            select(Horario.cancha_id, Horario.hora_inicio, Horario.hora_fin)
+            .where(Horario.cancha_id.in_(ids), Horario.disponible == True)  # noqa: E712
+        ).all()
+        for id, inicio, fin in horarios:
+            inicio = max(inicio, hora_desde) if hora_desde else inicio
+            fin = min(fin, hora_hasta) if hora_hasta else fin
+            if inicio < fin:
+                ventanas[id].append((inicio, fin))
+
+        # 3. Reservas CONFIRMADAS/PENDIENTES del rango, agrupadas por (cancha, día)
+        estados_activos = [
+            catalogos.estado_reserva_id(self.session, 'Confirmada'),
+            catalogos.estado_reserva_id(self.session, 'Pendiente'),
+        ]
+        ocupados: Dict[Tuple[int, date], List[Tuple[time, time]]] = defaultdict(list)
+        reservas = self.session.exec(
+            select(Reserva.cancha_id, Reserva.fecha, Reserva.hora_inicio, Reserva.hora_fin).where(
+                Reserva.cancha_id.in_(ids),
+                Reserva.fecha >= datetime.combine(fecha_desde, time.min),
+                Reserva.fecha < datetime.combine(fecha_hasta + timedelta(days=1), time.min),
+                Reserva.estado_reserva_id.in_(estados_activos)
+            )
+        ).all()
+        for id, fecha, inicio, fin in reservas:
+            ocupados[(id, fecha.date())].append((inicio, fin))
+
+        # Ocurrencias de reservas recurrentes, expandidas solo dentro del rango
+        series = self.session.exec(consulta_series_rango(ids, fecha_desde, fecha_hasta)).all()
+        excepciones = defaultdict(set)
+        if series:
+            for serie_id, fecha in self.session.exec(consulta_excepciones([s.id for s in series])).all():
+                excepciones[serie_id].add(fecha)
+        for serie in series:
+            for dia in ocurrencias(serie, fecha_desde, fecha_hasta, excepciones[serie.id]):
+                ocupados[(serie.cancha_id, dia)].append((serie.hora_inicio, serie.hora_fin))
+
+        # Bloqueos por torneos: cada uno ocupa, en cada día que toca, la parte del día que cubre
+        bloqueos = self.session.exec(
+            select(BloqueoCancha.cancha_id, BloqueoCancha.inicio, BloqueoCancha.fin).where(
+                BloqueoCancha.cancha_id.in_(ids),
+                BloqueoCancha.inicio < datetime.combine(fecha_hasta + timedelta(days=1), time.min),
+                BloqueoCancha.fin > datetime.combine(fecha_desde, time.min)
+            )
+        ).all()
+        for id, inicio, fin in bloqueos:
+            dia = max(inicio.date(), fecha_desde)
+            while dia <= min(fin.date(), fecha_hasta):
+                desde = inicio.time() if dia == inicio.date() else time.min
+                hasta = fin.time() if dia == fin.date() else time.max
+                if desde < hasta:
+                    ocupados[(id, dia)].append((desde, hasta))
+                dia += timedelta(days=1)
+
+        # 4. Resta de intervalos por cancha y día
+        dias = [fecha_desde + timedelta(days=i) for i in range((fecha_hasta - fecha_desde).days + 1)]
+        if dia_semana is not None:
+            dias = [d for d in dias if d.weekday() == dia_semana]
+
+        disponibilidad = []
+        for id, nombre, tipo_id in canchas:
+            if not ventanas[id]:
+                continue
+            dias_libres = []
+            for dia in dias:
+                libres = [
+                    TramoLibre(hora_inicio=inicio, hora_fin=fin)
+                    for inicio, fin in restar_intervalos(ventanas[id], ocupados.get((id, dia), []))
+                    if minutos_entre(inicio, fin) >= duracion_minima
+                ]
+                if libres:
+                    dias_libres.append(DisponibilidadDia(fecha=dia, libres=libres))
+            if dias_libres:
+                disponibilidad.append(DisponibilidadCancha(
+                    cancha_id=id, nombre=nombre, tipo_cancha_id=tipo_id, dias=dias_libres
+                ))
+        return disponibilidad
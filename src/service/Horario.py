@@ -1,12 +1,32 @@
 # src/service/Horario.py
 from sqlmodel import Session, select, and_, or_
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends, HTTPException
-from database import get_session
+from database import get_session, get_async_session
 from src.models.Horario import Horario
-from src.schemas.Horario import HorarioCreate, HorarioUpdate, HorarioResponse
+from src.schemas.Horario import HorarioCreate, HorarioUpdate, HorarioResponse, HorarioGenerar
 from src.models.Cancha import Cancha  # Para validar la FK
-from typing import List, Optional
-from datetime import time
+from src.utils.cache import cache_resultados
+from src.utils.catalogos import catalogos
+from src.utils.intervalos import indices_superpuestos
+from src.utils.ocupacion import actualizar_disponibles
+from collections import defaultdict
+from typing import List, Optional, Tuple
+from datetime import datetime, time
+
+# Tablas de las que depende el listado cacheado (el 404 depende de que exista la cancha)
+ETIQUETAS_HORARIOS = (Horario.__tablename__, Cancha.__tablename__)
+
+
+def _turnos(datos: HorarioGenerar) -> List[Tuple[time, time]]:
+    # Turnos consecutivos entre apertura y cierre; un resto menor a la duración se descarta
+    apertura = datos.hora_apertura.hour * 60 + datos.hora_apertura.minute
+    cierre = datos.hora_cierre.hour * 60 + datos.hora_cierre.minute
+    return [
+        (time(inicio // 60, inicio % 60), time((inicio + datos.duracion_minutos) // 60, (inicio + datos.duracion_minutos) % 60))
+        for inicio in range(apertura, cierre - datos.duracion_minutos + 1, datos.duracion_minutos)
+    ]
 
 
 class HorariosService:
@@ -34,14 +54,17 @@ class HorariosService:
             )
 
     def get_horarios(self, cancha_id: int) -> List[HorarioResponse]:
-        cancha = self.session.get(Cancha, cancha_id)
-        if not cancha:
-            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+        def consultar():
+            cancha = self.session.get(Cancha, cancha_id)
+            if not cancha:
+                raise HTTPException(status_code=404, detail="Cancha no encontrada")
 
-        horarios = self.session.exec(
-            select(Horario).where(Horario.cancha_id == cancha_id).order_by(Horario.hora_inicio)
-        ).all()
-        return [HorarioResponse.model_validate(h) for h in horarios]
+            horarios = self.session.exec(
+                select(Horario).where(Horario.cancha_id == cancha_id).order_by(Horario.hora_inicio)
+            ).all()
+            return [HorarioResponse.model_validate(h) for h in horarios]
+
+        return cache_resultados.obtener_o_calcular(("horarios", cancha_id), ETIQUETAS_HORARIOS, consultar)
 
     def create_horario_cancha(self, cancha_id: int, horario_data: HorarioCreate) -> HorarioResponse:
         cancha = self.session.get(Cancha, cancha_id)
@@ -54,6 +77,8 @@ class HorariosService:
         try:
             new_horario = Horario.model_validate(horario_data, update={'cancha_id': cancha_id})
             self.session.add(new_horario)
+            # Los días futuros del resumen de ocupación pasan a tener más minutos disponibles
+            self.session.exec(actualizar_disponibles(cancha_id))
             self.session.commit()
             self.session.refresh(new_horario)
             return HorarioResponse.model_validate(new_horario)
@@ -63,6 +88,79 @@ class HorariosService:
             self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Error al crear horario: {e}")
 
+    def _generar(self, cancha_ids: List[int], datos: HorarioGenerar) -> List[HorarioResponse]:
+        if datos.hora_apertura >= datos.hora_cierre:
+            raise HTTPException(status_code=400, detail="hora_apertura debe ser anterior a hora_cierre.")
+        turnos = _turnos(datos)
+        if not turnos:
+            raise HTTPException(status_code=400, detail="La franja es más corta que la duración del turno.")
+
+        # 1. Horarios existentes de todas las canchas en una sola consulta
+        existentes = defaultdict(list)
+        filas = self.session.exec(
+            select(Horario.cancha_id, Horario.hora_inicio, Horario.hora_fin).where(Horario.cancha_id.in_(cancha_ids))
+        ).all()
+        for cancha_id, hora_inicio, hora_fin in filas:
+            existentes[cancha_id].append((hora_inicio, hora_fin))
+
+        # 2. Superposición en memoria, por cancha
+        nuevos = []
+        for cancha_id in cancha_ids:
+            superpuestos = set(indices_superpuestos(turnos, existentes[cancha_id]))
+            if superpuestos and not datos.omitir_superpuestos:
+                inicio, fin = turnos[min(superpuestos)]
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"El turno {inicio} a {fin} se superpone con un horario existente de la cancha {cancha_id}"
+                )
+            nuevos.extend(
+                {"cancha_id": cancha_id, "disponible": datos.disponible, "hora_inicio": inicio, "hora_fin": fin}
+                for i, (inicio, fin) in enumerate(turnos) if i not in superpuestos
+            )
+        if not nuevos:
+            return []
+
+        # 3. Alta de todos los turnos en una transacción, con un único INSERT (executemany)
+        ahora = datetime.now()
+        try:
+            self.session.exec(
+                insert(Horario),
+                params=[{**n, "fecha_creacion": ahora, "fecha_actualizacion": ahora} for n in nuevos]
+            )
+            self.session.exec(actualizar_disponibles(*cancha_ids))
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error al generar horarios: {e}")
+
+        # Se releen los turnos recién insertados (executemany no devuelve los ids)
+        creados = self.session.exec(
+            select(Horario).where(
+                Horario.cancha_id.in_(cancha_ids),
+                Horario.hora_inicio.in_({n["hora_inicio"] for n in nuevos}),
+                Horario.fecha_creacion == ahora
+            ).order_by(Horario.cancha_id, Horario.hora_inicio)
+        ).all()
+        return [HorarioResponse.model_validate(h) for h in creados]
+
+    def generar_horarios_cancha(self, cancha_id: int, datos: HorarioGenerar) -> List[HorarioResponse]:
+        cancha = self.session.get(Cancha, cancha_id)
+        if not cancha:
+            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+        return self._generar([cancha_id], datos)
+
+    def generar_horarios(self, datos: HorarioGenerar, tipo_cancha_id: Optional[int] = None) -> List[HorarioResponse]:
+        """Genera los mismos turnos para todas las canchas (o las de un tipo)."""
+        query = select(Cancha.id).order_by(Cancha.id)
+        if tipo_cancha_id is not None:
+            if not catalogos.existe_tipo_cancha(self.session, tipo_cancha_id):
+                raise HTTPException(status_code=400, detail="El tipo de cancha especificado no existe.")
+            query = query.where(Cancha.tipo_cancha_id == tipo_cancha_id)
+        cancha_ids = list(self.session.exec(query).all())
+        if not cancha_ids:
+            return []
+        return self._generar(cancha_ids, datos)
+
     def update_horario_cancha(self, horario_id: int, horario_data: HorarioUpdate) -> HorarioResponse:
         horario_obj = self.session.get(Horario, horario_id)
 
@@ -81,6 +179,7 @@ class HorariosService:
             setattr(horario_obj, key, value)
 
         self.session.add(horario_obj)
+        self.session.exec(actualizar_disponibles(horario_obj.cancha_id))
         self.session.commit()
         self.session.refresh(horario_obj)
         return HorarioResponse.model_validate(horario_obj)
@@ -93,4 +192,90 @@ class HorariosService:
         # Opcional: Agregar lógica para verificar que no haya reservas futuras asociadas.
 
         self.session.delete(horario_obj)
-        self.session.commit()
\ No newline at end of file
+        self.session.exec(actualizar_disponibles(horario_obj.cancha_id))
+        self.session.commit()
+
+
+class HorariosServiceAsync:
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    async def _check_overlap(self, cancha_id: int, hora_inicio: time, hora_fin: time, horario_id: Optional[int] = None):
+        # Misma condición que HorariosService._check_overlap
+        query = select(Horario).where(
+            Horario.cancha_id == cancha_id,
+            Horario.hora_inicio < hora_fin,
+            Horario.hora_fin > hora_inicio
+        )
+        if horario_id:
+            query = query.where(Horario.id != horario_id)
+
+        overlap_horario = (await self.session.exec(query)).first()
+        if overlap_horario:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Horario se superpone con el horario existente {overlap_horario.id} ({overlap_horario.hora_inicio} a {overlap_horario.hora_fin})"
+            )
+
+    async def get_horarios(self, cancha_id: int) -> List[HorarioResponse]:
+        async def consultar():
+            cancha = await self.session.get(Cancha, cancha_id)
+            if not cancha:
+                raise HTTPException(status_code=404, detail="Cancha no encontrada")
+
+            horarios = (await self.session.exec(
+                select(Horario).where(Horario.cancha_id == cancha_id).order_by(Horario.hora_inicio)
+            )).all()
+            return [HorarioResponse.model_validate(h) for h in horarios]
+
+        return await cache_resultados.obtener_o_calcular_async(("horarios", cancha_id), ETIQUETAS_HORARIOS, consultar)
+
+    async def create_horario_cancha(self, cancha_id: int, horario_data: HorarioCreate) -> HorarioResponse:
+        cancha = await self.session.get(Cancha, cancha_id)
+        if not cancha:
+            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+
+        await self._check_overlap(cancha_id, horario_data.hora_inicio, horario_data.hora_fin)
+
+        try:
+            new_horario = Horario.model_validate(horario_data, update={'cancha_id': cancha_id})
+            self.session.add(new_horario)
+            await self.session.exec(actualizar_disponibles(cancha_id))
+            await self.session.commit()
+            await self.session.refresh(new_horario)
+            return HorarioResponse.model_validate(new_horario)
+        except HTTPException:
+            raise
+        except Exception as e:
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error al crear horario: {e}")
+
+    async def update_horario_cancha(self, horario_id: int, horario_data: HorarioUpdate) -> HorarioResponse:
+        horario_obj = await self.session.get(Horario, horario_id)
+
+        if not horario_obj:
+            raise HTTPException(status_code=404, detail="Horario no encontrado")
+
+        update_data = horario_data.model_dump(exclude_unset=True)
+        hora_inicio = update_data.get('hora_inicio', horario_obj.hora_inicio)
+        hora_fin = update_data.get('hora_fin', horario_obj.hora_fin)
+
+        await self._check_overlap(horario_obj.cancha_id, hora_inicio, hora_fin, horario_id)
+
+        for key, value in update_data.items():
+            setattr(horario_obj, key, value)
+
+        self.session.add(horario_obj)
+        await self.session.exec(actualizar_disponibles(horario_obj.cancha_id))
+        await self.session.commit()
+        await self.session.refresh(horario_obj)
+        return HorarioResponse.model_validate(horario_obj)
+
+    async def delete_horario_cancha(self, horario_id: int) -> None:
+        horario_obj = await self.session.get(Horario, horario_id)
+        if not horario_obj:
+            raise HTTPException(status_code=404, detail="Horario no encontrado")
+
+        await self.session.delete(horario_obj)
+        await self.session.exec(actualizar_disponibles(horario_obj.cancha_id))
+        await self.session.commit()
@@ -0,0 +1,187 @@
+# src/service/Reporte.py
+from sqlmodel import Session, select, func, extract
+from fastapi import Depends, HTTPException
+from database import get_session
+from src.models.Reserva import Reserva
+from src.models.Cancha import Cancha
+from src.models.Cliente import Cliente
+from src.models.Ocupacion import OcupacionDiaria
+from src.schemas.Reporte import (
+    ReporteCancha, ReporteCliente, ReporteMensual, ReporteDiaSemana, ReporteOcupacion, ResumenCliente
+)
+from src.utils.catalogos import catalogos
+from src.utils.ocupacion import minutos_sql, minutos_diarios
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+# Período por defecto de los reportes de ocupación
+DIAS_OCUPACION_DEFAULT = 30
+
+
+def _horas(minutos) -> float:
+    return round((minutos or 0) / 60, 2)
+
+
+class ReportesService:
+    """Reportes agregados en SQL: solo viaja el resultado agrupado, no las reservas."""
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def _condiciones(self, fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None) -> list:
+        # Las reservas canceladas no cuentan para ningún reporte
+        condiciones = []
+        estado_cancelada_id = catalogos.estado_reserva_id(self.session, 'Cancelada')
+        if estado_cancelada_id:
+            condiciones.append(Reserva.estado_reserva_id != estado_cancelada_id)
+        if fecha_desde:
+            condiciones.append(Reserva.fecha >= datetime.combine(fecha_desde, time.min))
+        if fecha_hasta:
+            condiciones.append(Reserva.fecha < datetime.combine(fecha_hasta + timedelta(days=1), time.min))
+        return condiciones
+
+    def por_cancha(self, fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None,
+                   cliente_id: Optional[int] = None) -> List[ReporteCancha]:
+        condiciones = self._condiciones(fecha_desde, fecha_hasta)
+        if cliente_id is not None:
+            condiciones.append(Reserva.cliente_id == cliente_id)
+
+        cantidad = func.count(Reserva.id)
+        filas = self.session.exec(
+            select(Cancha.id, Cancha.nombre, cantidad, func.sum(minutos_sql(Reserva.hora_inicio, Reserva.hora_fin)))
+            .join(Reserva, Reserva.cancha_id == Cancha.id)
+            .where(*condiciones)
+            .group_by(Cancha.id, Cancha.nombre)
+            .order_by(cantidad.desc())
+        ).all()
+        return [
+            ReporteCancha(cancha_id=id, nombre=nombre, cantidad_reservas=cant, horas_totales=_horas(minutos))
+            for id, nombre, cant, minutos in filas
+        ]
+
+    def por_cliente(self, fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None) -> List[ReporteCliente]:
+        cantidad = func.count(Reserva.id)
+        filas = self.session.exec(
+            select(Cliente.id, Cliente.nombre, Cliente.apellido, cantidad,
+                   func.sum(minutos_sql(Reserva.hora_inicio, Reserva.hora_fin)))
+            .join(Reserva, Reserva.cliente_id == Cliente.id)
+            .where(*self._condiciones(fecha_desde, fecha_hasta))
+            .group_by(Cliente.id, Cliente.nombre, Cliente.apellido)
+            .order_by(cantidad.desc())
+        ).all()
+        return [
+            ReporteCliente(cliente_id=id, nombre=nombre, apellido=apellido, cantidad_reservas=cant,
+                           horas_totales=_horas(minutos))
+            for id, nombre, apellido, cant, minutos in filas
+        ]
+
+    def mensual(self, anio: int, cancha_id: Optional[int] = None) -> List[ReporteMensual]:
+        condiciones = self._condiciones(date(anio, 1, 1), date(anio, 12, 31))
+        if cancha_id is not None:
+            condiciones.append(Reserva.cancha_id == cancha_id)
+
+        mes = extract('month', Reserva.fecha)
+        filas = self.session.exec(
+            select(mes, func.count(Reserva.id), func.sum(minutos_sql(Reserva.hora_inicio, Reserva.hora_fin)))
+            .where(*condiciones)
+            .group_by(mes)
+            .order_by(mes)
+        ).all()
+        return [
+            ReporteMensual(mes=int(m), cantidad_reservas=cant, horas_totales=_horas(minutos))
+            for m, cant, minutos in filas
+        ]
+
+    def por_dia_semana(self, fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None,
+                       cancha_id: Optional[int] = None) -> List[ReporteDiaSemana]:
+        condiciones = self._condiciones(fecha_desde, fecha_hasta)
+        if cancha_id is not None:
+            condiciones.append(Reserva.cancha_id == cancha_id)
+
+        # 'dow' devuelve 0 = domingo; se lleva a 0 = lunes
+        dow = extract('dow', Reserva.fecha)
+        filas = self.session.exec(
+            select(dow, func.count(Reserva.id), func.sum(minutos_sql(Reserva.hora_inicio, Reserva.hora_fin)))
+            .where(*condiciones)
+            .group_by(dow)
+        ).all()
+        reporte = []
+        for d, cant, minutos in filas:
+            dia = (int(d) + 6) % 7
+            reporte.append(ReporteDiaSemana(
+                dia_semana=dia, nombre_dia=DIAS_SEMANA[dia], cantidad_reservas=cant, horas_totales=_horas(minutos)
+            ))
+        return sorted(reporte, key=lambda r: r.dia_semana)
+
+    def ocupacion(self, fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None,
+                  cancha_id: Optional[int] = None) -> List[ReporteOcupacion]:
+        fecha_hasta = fecha_hasta or date.today()
+        fecha_desde = fecha_desde or fecha_hasta - timedelta(days=DIAS_OCUPACION_DEFAULT - 1)
+        if fecha_desde > fecha_hasta:
+            raise HTTPException(status_code=400, detail="fecha_desde debe ser anterior a fecha_hasta.")
+        dias = (fecha_hasta - fecha_desde).days + 1
+
+        # Se lee el resumen materializado (una fila por cancha y día con reservas),
+        # no las reservas: el costo depende de los días del período, no de su volumen
+        resumen = (
+            select(
+                OcupacionDiaria.cancha_id.label("cancha_id"),
+                func.sum(OcupacionDiaria.cantidad_reservas).label("cantidad"),
+                func.sum(OcupacionDiaria.minutos_reservados).label("minutos_reservados"),
+                func.sum(OcupacionDiaria.minutos_disponibles).label("minutos_disponibles"),
+                func.count().label("dias"),
+            )
+            .where(OcupacionDiaria.fecha >= fecha_desde, OcupacionDiaria.fecha <= fecha_hasta)
+            .group_by(OcupacionDiaria.cancha_id)
+            .subquery()
+        )
+
+        query = (
+            select(
+                Cancha.id, Cancha.nombre, resumen.c.cantidad, resumen.c.minutos_reservados,
+                resumen.c.minutos_disponibles, resumen.c.dias, minutos_diarios(Cancha.id)
+            )
+            .outerjoin(resumen, resumen.c.cancha_id == Cancha.id)
+            .order_by(Cancha.id)
+        )
+        if cancha_id is not None:
+            query = query.where(Cancha.id == cancha_id)
+
+        reporte = []
+        filas = self.session.exec(query).all()
+        for id, nombre, cant, minutos_reservados, minutos_disponibles, dias_con_reservas, minutos_por_dia in filas:
+            # Los días sin reservas no tienen fila: se cuentan con los horarios actuales
+            minutos_disponibles = (minutos_disponibles or 0) + (dias - (dias_con_reservas or 0)) * minutos_por_dia
+            horas_disponibles = _horas(minutos_disponibles)
+            horas_reservadas = _horas(minutos_reservados)
+            reporte.append(ReporteOcupacion(
+                cancha_id=id,
+                nombre=nombre,
+                cantidad_reservas=cant or 0,
+                horas_reservadas=horas_reservadas,
+                horas_disponibles=horas_disponibles,
+                tasa_ocupacion=round(horas_reservadas / horas_disponibles * 100, 1) if horas_disponibles else 0.0,
+            ))
+        return reporte
+
+    def resumen_cliente(self, cliente_id: int, fecha_desde: Optional[date] = None,
+                        fecha_hasta: Optional[date] = None) -> ResumenCliente:
+        if not self.session.get(Cliente, cliente_id):
+            raise HTTPException(status_code=404, detail="Cliente no encontrado")
+
+        por_cancha = self.por_cancha(fecha_desde, fecha_hasta, cliente_id)
+        return ResumenCliente(
+            cliente_id=cliente_id,
+            cantidad_reservas=sum(r.cantidad_reservas for r in por_cancha),
+            horas_totales=round(sum(r.horas_totales for r in por_cancha), 2),
+            por_cancha=por_cancha,
+        )
+
+    def resumen_cancha(self, cancha_id: int, fecha_desde: Optional[date] = None,
+                       fecha_hasta: Optional[date] = None) -> ReporteOcupacion:
+        reporte = self.ocupacion(fecha_desde, fecha_hasta, cancha_id)
+        if not reporte:
+            raise HTTPException(status_code=404, detail="Cancha no encontrada")
+        return reporte[0]
@@ -1,103 +1,703 @@
 # src/service/Reserva.py
+import csv
+import io
+import json
 from sqlmodel import Session, select, and_
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from fastapi import Depends, HTTPException
-from database import get_session
-from src.models.Reserva import Reserva, EstadoReserva  # EstadoReserva es clave
+from database import engine, get_session, get_async_session
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.Reserva import Reserva, EstadoReserva, SemaforoCancha  # EstadoReserva es clave
 from src.models.Cancha import Cancha
 from src.models.Cliente import Cliente
 from src.models.Busquedas import Servicio, ReservaServicio
-from src.schemas.Reserva import ReservaCreate, ReservaUpdate, ReservaResponse
-from typing import List
-from datetime import datetime
+from src.models.Pago import Pago
+from src.models.Torneo import BloqueoCancha
+from src.schemas.Reserva import (
+    ReservaCreate, ReservaUpdate, ReservaResponse, ReservaFiltros,
+    ReservaLoteCreate, ReservaLoteResponse, ErrorReservaLote, OcurrenciaSerie
+)
+from src.utils.intervalos import IndiceIntervalos
+from src.utils.catalogos import catalogos
+from src.utils.candados import CandadosPorClave, CandadosPorClaveAsync
+from src.utils.paginacion import Paginacion
+from src.utils.series import (
+    es_ocurrencia, ocurrencias, consulta_series_dia, consulta_series_rango, consulta_series_filtros, consulta_excepciones
+)
+from src.utils.ocupacion import sumar_reservas, sumar_reservas_varias, restar_reservas, minutos_entre
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, date, time, timedelta
+
+
+# Serializa, dentro del proceso, solo las reservas de la misma (cancha_id, fecha).
+# La disponibilidad se valida siempre contra la base, dentro de la transacción y después
+# de tomar el semáforo: no hay estado por proceso que pueda quedar viejo cuando otro
+# worker o un script reserva o cancela. Con los índices compuestos de reserva y
+# bloqueo_cancha cada validación es una búsqueda por rango de índice.
+candados_reservas = CandadosPorClave()
+candados_reservas_async = CandadosPorClaveAsync()
+
+
+def _relaciones_respuesta():
+    """
+    Relaciones que arma ReservaResponse, cargadas de antemano para no hacer una consulta
+    por fila al serializar (N+1). Las muchos-a-uno van en el mismo SELECT (joinedload) y
+    los servicios en una sola consulta extra (selectinload): 2 consultas por listado.
+    Además con AsyncSession no hay lazy loading, así que son obligatorias.
+    """
+    return (
+        joinedload(Reserva.cliente),
+        joinedload(Reserva.cancha).joinedload(Cancha.tipo_cancha),
+        joinedload(Reserva.estado_reserva),
+        joinedload(Reserva.pago).joinedload(Pago.estado_pago),
+        selectinload(Reserva.servicios),
+    )
+
+
+def _ocupante(id) -> str:
+    # Las ocurrencias de series se identifican con ("serie", serie_id)
+    return f"la serie {id[1]}" if isinstance(id, tuple) else f"la reserva {id}"
+
+
+def _ocurrencias_del_dia(series, dia: date) -> list:
+    return [(s.hora_inicio, s.hora_fin, ("serie", s.id)) for s in series if es_ocurrencia(s, dia)]
+
+
+def consulta_canchas_reservables(*cancha_ids: int):
+    """
+    Canchas en las que se va a reservar. En PostgreSQL toma FOR SHARE sobre sus filas hasta el
+    commit: las reservas de una misma cancha no se esperan entre sí por esto, pero sí esperan
+    a un torneo que la está bloqueando (FOR UPDATE). SQLite ignora la cláusula: ahí la
+    primera escritura de la transacción ya toma el bloqueo de toda la base.
+    """
+    return select(Cancha.id).where(Cancha.id.in_(cancha_ids)).with_for_update(read=True)
+
+
+def _error_bloqueo(torneo_id: int) -> HTTPException:
+    return HTTPException(status_code=409, detail=f"Cancha no disponible. Está bloqueada por el torneo {torneo_id}.")
+
+
+def _dia(fecha) -> date:
+    return fecha.date() if isinstance(fecha, datetime) else fecha
+
+
+def _filtrar_reservas(query, filtros: ReservaFiltros, estado_id: Optional[int] = None):
+    # 'fecha' es DATETIME: los días se filtran como rangos [desde 00:00, hasta+1 00:00)
+    if filtros.fecha:
+        query = query.where(
+            Reserva.fecha >= datetime.combine(filtros.fecha, time.min),
+            Reserva.fecha < datetime.combine(filtros.fecha + timedelta(days=1), time.min)
+        )
+    if filtros.fecha_desde:
+        query = query.where(Reserva.fecha >= datetime.combine(filtros.fecha_desde, time.min))
+    if filtros.fecha_hasta:
+        query = query.where(Reserva.fecha < datetime.combine(filtros.fecha_hasta + timedelta(days=1), time.min))
+    if filtros.anio:
+        query = query.where(
+            Reserva.fecha >= datetime(filtros.anio, 1, 1),
+            Reserva.fecha < datetime(filtros.anio + 1, 1, 1)
+        )
+    if filtros.cancha_id is not None:
+        query = query.where(Reserva.cancha_id == filtros.cancha_id)
+    if filtros.cliente_id is not None:
+        query = query.where(Reserva.cliente_id == filtros.cliente_id)
+    if estado_id is not None:
+        query = query.where(Reserva.estado_reserva_id == estado_id)
+    return query
+
+
+def _rango_filtros(filtros: ReservaFiltros) -> Tuple[Optional[date], Optional[date]]:
+    # El mismo rango de días que aplica _filtrar_reservas (los filtros se combinan con AND)
+    desde, hasta = filtros.fecha_desde, filtros.fecha_hasta
+    if filtros.fecha:
+        desde, hasta = max(desde or filtros.fecha, filtros.fecha), min(hasta or filtros.fecha, filtros.fecha)
+    if filtros.anio:
+        desde = max(desde or date(filtros.anio, 1, 1), date(filtros.anio, 1, 1))
+        hasta = min(hasta or date(filtros.anio, 12, 31), date(filtros.anio, 12, 31))
+    return desde, hasta
+
+
+def _consulta_ocurrencias(filtros: ReservaFiltros):
+    """Consulta de las series a expandir en el listado, o None si los filtros las excluyen."""
+    if not filtros.incluir_series or filtros.estado:
+        return None
+    desde, hasta = _rango_filtros(filtros)
+    if desde is not None and hasta is not None and desde > hasta:
+        return None
+    return consulta_series_filtros(desde, hasta, filtros.cancha_id, filtros.cliente_id)
+
+
+def _expandir_ocurrencias(series, excepciones: Dict[int, set], filtros: ReservaFiltros) -> List[OcurrenciaSerie]:
+    desde, hasta = _rango_filtros(filtros)
+    resultado = [
+        OcurrenciaSerie(
+            serie_id=s.id, cliente_id=s.cliente_id, cancha_id=s.cancha_id,
+            fecha=dia, hora_inicio=s.hora_inicio, hora_fin=s.hora_fin
+        )
+        for s in series
+        for dia in ocurrencias(s, desde, hasta, excepciones[s.id])
+    ]
+    return sorted(resultado, key=lambda o: (o.fecha, o.hora_inicio, o.cancha_id))
+
+
+# Columnas de la exportación, en orden (encabezado del CSV)
+COLUMNAS_EXPORTACION = (
+    "id", "cliente_id", "cancha_id", "fecha", "hora_inicio", "hora_fin", "estado", "pago_id"
+)
+
+# Filas que se traen de la base por tanda al exportar
+TANDA_EXPORTACION = 1000
+
+
+def _valor_exportable(valor):
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    # Columnas Enum (estado)
+    return getattr(valor, "value", valor)
+
+
+def _estado_filtro_id(session: Session, filtros: ReservaFiltros) -> Optional[int]:
+    if not filtros.estado:
+        return None
+    estado_id = catalogos.estado_reserva_id(session, filtros.estado)
+    if not estado_id:
+        raise HTTPException(status_code=400, detail=f"Estado de reserva '{filtros.estado}' inválido.")
+    return estado_id
 
 
 class ReservasService:
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
-    def _check_availability(self, cancha_id: int, fecha: datetime, inicio: datetime.time, fin: datetime.time,
-                            reserva_id: Optional[int] = None):
-        # 1. Verificar si hay reservas CONFIRMADAS o PENDIENTES que se superpongan
-
-        # Encontrar el ID del estado 'Confirmada' y 'Pendiente' (asumiendo que los nombres se cargaron correctamente)
-        estado_confirmada_id = self.session.exec(
-            select(EstadoReserva.id).where(EstadoReserva.nombre == 'Confirmada')).first()
-        estado_pendiente_id = self.session.exec(
-            select(EstadoReserva.id).where(EstadoReserva.nombre == 'Pendiente')).first()
-
-        if not estado_confirmada_id or not estado_pendiente_id:
-            raise HTTPException(status_code=500, detail="Error de configuración: Faltan estados de reserva.")
-
-        # Condición de superposición: (hora_inicio_existente < hora_fin_nueva) AND (hora_fin_existente > hora_inicio_nueva)
-        query = select(Reserva).where(
-            Reserva.cancha_id == cancha_id,
-            Reserva.fecha == fecha.date(),  # Comparar solo la fecha
-            Reserva.hora_inicio < fin,
-            Reserva.hora_fin > inicio,
-            Reserva.estado_reserva_id.in_([estado_confirmada_id, estado_pendiente_id])
-        )
+    def _get_estado_id(self, nombre: str) -> int:
+        estado_id = catalogos.estado_reserva_id(self.session, nombre)
+        if not estado_id:
+            raise HTTPException(status_code=500, detail=f"Error de configuración: Estado '{nombre}' no encontrado.")
+        return estado_id
+
+    def _obtener(self, id: int) -> Reserva:
+        return self.session.exec(
+            select(Reserva).where(Reserva.id == id).options(*_relaciones_respuesta())
+        ).unique().one()
 
-        if reserva_id:
-            query = query.where(Reserva.id != reserva_id)
+    def _tomar_semaforo(self, cancha_id: int, dia: date):
+        self._tomar_semaforos([(cancha_id, dia)])
 
-        overlap_reserva = self.session.exec(query).first()
-        if overlap_reserva:
+    def _tomar_semaforos(self, claves: List[Tuple[int, date]]):
+        # Primera escritura de la transacción: toma el bloqueo de escritura en SQLite o el
+        # bloqueo de fila (cancha_id, fecha) en PostgreSQL hasta el commit/rollback.
+        # Las claves van ordenadas para que dos lotes no se bloqueen mutuamente.
+        dialecto = postgresql if self.session.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialecto.insert(SemaforoCancha).values(
+            [{"cancha_id": cancha_id, "fecha": dia, "version": 1} for cancha_id, dia in sorted(set(claves))]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cancha_id", "fecha"],
+            set_={"version": SemaforoCancha.version + 1}
+        )
+        self.session.exec(stmt)
+
+    def _check_availability(self, cancha_id: int, dia: date, inicio: time, fin: time):
+        # Dentro de la transacción y con el semáforo tomado: ve las reservas de todos los workers
+        inicio_dia = datetime.combine(dia, time.min)
+        overlap_id = self.session.exec(
+            select(Reserva.id).where(
+                Reserva.cancha_id == cancha_id,
+                Reserva.fecha >= inicio_dia,
+                Reserva.fecha < inicio_dia + timedelta(days=1),
+                Reserva.hora_inicio < fin,
+                Reserva.hora_fin > inicio,
+                Reserva.estado_reserva_id.in_([self._get_estado_id('Confirmada'), self._get_estado_id('Pendiente')])
+            )
+        ).first()
+        if not overlap_id:
+            # Las series se verifican de forma analítica, sin materializar sus ocurrencias
+            series = self.session.exec(consulta_series_dia(cancha_id, dia, inicio, fin)).all()
+            overlap_id = next((o[2] for o in _ocurrencias_del_dia(series, dia)), None)
+        if overlap_id:
             raise HTTPException(
                 status_code=409,
-                detail=f"Cancha no disponible. Se superpone con la reserva {overlap_reserva.id}."
+                detail=f"Cancha no disponible. Se superpone con {_ocupante(overlap_id)}."
+            )
+
+        torneo_id = self.session.exec(
+            select(BloqueoCancha.torneo_id).where(
+                BloqueoCancha.cancha_id == cancha_id,
+                BloqueoCancha.inicio < datetime.combine(dia, fin),
+                BloqueoCancha.fin > datetime.combine(dia, inicio)
             )
+        ).first()
+        if torneo_id:
+            raise _error_bloqueo(torneo_id)
 
-    def get_reservas(self) -> List[ReservaResponse]:
-        reservas = self.session.exec(select(Reserva)).all()
+    def get_reservas(self, filtros: Optional[ReservaFiltros] = None,
+                     paginacion: Optional[Paginacion] = None) -> List[ReservaResponse]:
+        filtros = filtros or ReservaFiltros()
+        query = _filtrar_reservas(select(Reserva), filtros, _estado_filtro_id(self.session, filtros))
+        if paginacion:
+            query = paginacion.aplicar(query, Reserva)
+        reservas = self.session.exec(query.options(*_relaciones_respuesta())).unique().all()
         return [ReservaResponse.model_validate(r) for r in reservas]
 
+    def get_ocurrencias_series(self, filtros: Optional[ReservaFiltros] = None) -> List[OcurrenciaSerie]:
+        """Ocurrencias de las series dentro de los filtros del listado (se expanden en memoria)."""
+        query = _consulta_ocurrencias(filtros or ReservaFiltros())
+        if query is None:
+            return []
+        series = self.session.exec(query).all()
+        excepciones = defaultdict(set)
+        if series:
+            for serie_id, fecha in self.session.exec(consulta_excepciones([s.id for s in series])).all():
+                excepciones[serie_id].add(fecha)
+        return _expandir_ocurrencias(series, excepciones, filtros or ReservaFiltros())
+
+    def exportar_reservas(self, filtros: ReservaFiltros, formato: str = "ndjson") -> Iterator[str]:
+        """
+        Devuelve un generador con las reservas filtradas en NDJSON o CSV. Las filas se leen
+        por tandas (yield_per) y se escriben a medida que llegan: la memoria no depende
+        de la cantidad de reservas.
+        """
+        # Se valida antes de empezar a transmitir, para poder responder 400
+        estado_id = _estado_filtro_id(self.session, filtros)
+        query = _filtrar_reservas(
+            select(
+                Reserva.id, Reserva.cliente_id, Reserva.cancha_id, Reserva.fecha,
+                Reserva.hora_inicio, Reserva.hora_fin, EstadoReserva.nombre, Reserva.pago_id
+            ).join(EstadoReserva, EstadoReserva.id == Reserva.estado_reserva_id),
+            filtros,
+            estado_id
+        ).order_by(Reserva.id).execution_options(yield_per=TANDA_EXPORTACION)
+
+        def generar() -> Iterator[str]:
+            # Sesión propia: el generador sigue corriendo después de que termina el endpoint
+            with Session(engine) as session:
+                filas = session.exec(query)
+                if formato == "csv":
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    writer.writerow(COLUMNAS_EXPORTACION)
+                    for tanda in filas.partitions():
+                        writer.writerows([[_valor_exportable(v) for v in fila] for fila in tanda])
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                    yield buffer.getvalue()
+                else:
+                    for tanda in filas.partitions():
+                        yield "".join(
+                            json.dumps(dict(zip(COLUMNAS_EXPORTACION, map(_valor_exportable, fila))), ensure_ascii=False) + "\n"
+                            for fila in tanda
+                        )
+
+        return generar()
+
     def create_reserva(self, reserva_data: ReservaCreate) -> ReservaResponse:
-        # 0. Validar existencia de FKs
+        # 0. Validar el horario (igual que el alta masiva) y la existencia de FKs
+        if reserva_data.hora_inicio >= reserva_data.hora_fin:
+            raise HTTPException(status_code=400, detail="hora_inicio debe ser anterior a hora_fin.")
         if not self.session.get(Cliente, reserva_data.cliente_id):
             raise HTTPException(status_code=400, detail="Cliente no existe.")
-        if not self.session.get(Cancha, reserva_data.cancha_id):
+        if not self.session.exec(consulta_canchas_reservables(reserva_data.cancha_id)).first():
             raise HTTPException(status_code=400, detail="Cancha no existe.")
+        for servicio_id in reserva_data.servicios_ids or []:
+            if not self.session.get(Servicio, servicio_id):
+                raise HTTPException(status_code=400, detail=f"Servicio con ID {servicio_id} no existe.")
+
+        estado_pendiente_id = self._get_estado_id('Pendiente')
+        dia = _dia(reserva_data.fecha)
+
+        with candados_reservas.tomar((reserva_data.cancha_id, dia)):
+            try:
+                # 1. Validar Disponibilidad (función clave del proyecto) y crear en una única
+                # transacción, serializada por (cancha, fecha)
+                self._tomar_semaforo(reserva_data.cancha_id, dia)
+                self._check_availability(
+                    reserva_data.cancha_id,
+                    dia,
+                    reserva_data.hora_inicio,
+                    reserva_data.hora_fin
+                )
+
+                # Crear la reserva con estado inicial PENDIENTE
+                new_reserva = Reserva(
+                    **reserva_data.model_dump(exclude={'servicios_ids'}),
+                    estado_reserva_id=estado_pendiente_id
+                )
+                self.session.add(new_reserva)
+                self.session.flush()
+
+                # 3. Manejar Servicios Adicionales (Tabla N:M)
+                for servicio_id in reserva_data.servicios_ids or []:
+                    self.session.add(ReservaServicio(reserva_id=new_reserva.id, servicio_id=servicio_id))
+
+                # 4. Actualizar el resumen de ocupación en la misma transacción
+                self.session.exec(sumar_reservas(
+                    self.session.get_bind().dialect.name, new_reserva.cancha_id, dia,
+                    minutos_entre(new_reserva.hora_inicio, new_reserva.hora_fin)
+                ))
+
+                self.session.commit()
+                return ReservaResponse.model_validate(self._obtener(new_reserva.id))
+
+            except HTTPException:
+                self.session.rollback()
+                raise
+            except Exception as e:
+                self.session.rollback()
+                raise HTTPException(status_code=500, detail=f"Error al crear reserva: {e}")
+
+    def _ids_existentes(self, modelo, ids) -> set:
+        if not ids:
+            return set()
+        return set(self.session.exec(select(modelo.id).where(modelo.id.in_(ids))).all())
 
-        estado_pendiente = self.session.exec(select(EstadoReserva).where(EstadoReserva.nombre == 'Pendiente')).first()
-        if not estado_pendiente:
-            raise HTTPException(status_code=500, detail="Error de configuración: Estado 'Pendiente' no encontrado.")
+    def create_reservas_lote(self, lote: ReservaLoteCreate) -> ReservaLoteResponse:
+        """
+        Alta masiva en una sola transacción. Las FKs se validan con una consulta por tabla
+        y los conflictos (dentro del lote y contra reservas existentes) en una sola pasada
+        sobre un índice de intervalos local, cargado con una única consulta.
+        """
+        errores: Dict[int, ErrorReservaLote] = {}
 
-        # 1. Validar Disponibilidad (función clave del proyecto)
-        self._check_availability(
-            reserva_data.cancha_id,
-            reserva_data.fecha,
-            reserva_data.hora_inicio,
-            reserva_data.hora_fin
+        def registrar_error(indice: int, status_code: int, detail: str):
+            errores.setdefault(indice, ErrorReservaLote(indice=indice, status_code=status_code, detail=detail))
+
+        # 0. Validar existencia de FKs (una consulta por tabla)
+        clientes = self._ids_existentes(Cliente, {r.cliente_id for r in lote.reservas})
+        canchas = set(self.session.exec(consulta_canchas_reservables(*{r.cancha_id for r in lote.reservas})).all())
+        servicios = self._ids_existentes(Servicio, {s for r in lote.reservas for s in r.servicios_ids or []})
+        for i, r in enumerate(lote.reservas):
+            if r.cliente_id not in clientes:
+                registrar_error(i, 400, "Cliente no existe.")
+            elif r.cancha_id not in canchas:
+                registrar_error(i, 400, "Cancha no existe.")
+            elif r.hora_inicio >= r.hora_fin:
+                registrar_error(i, 400, "hora_inicio debe ser anterior a hora_fin.")
+            else:
+                for servicio_id in r.servicios_ids or []:
+                    if servicio_id not in servicios:
+                        registrar_error(i, 400, f"Servicio con ID {servicio_id} no existe.")
+                        break
+
+        if errores and lote.modo == "todo_o_nada":
+            raise HTTPException(status_code=400, detail=[e.model_dump() for e in errores.values()])
+
+        validas = [i for i in range(len(lote.reservas)) if i not in errores]
+        claves = sorted({(lote.reservas[i].cancha_id, _dia(lote.reservas[i].fecha)) for i in validas})
+        estado_pendiente_id = self._get_estado_id('Pendiente')
+        estados_activos = [self._get_estado_id('Confirmada'), estado_pendiente_id]
+
+        ids = []
+        with candados_reservas.tomar(*claves):
+            try:
+                if claves:
+                    # 1. Serializar contra otras altas de las mismas (cancha, fecha)
+                    self._tomar_semaforos(claves)
+
+                    # 2. Reservas activas de todas las claves del lote, en una consulta
+                    desde, hasta = min(d for _, d in claves), max(d for _, d in claves)
+                    existentes = defaultdict(list)
+                    claves_lote = set(claves)
+                    filas = self.session.exec(
+                        select(Reserva.cancha_id, Reserva.fecha, Reserva.hora_inicio, Reserva.hora_fin, Reserva.id).where(
+                            Reserva.cancha_id.in_({c for c, _ in claves}),
+                            Reserva.fecha >= datetime.combine(desde, time.min),
+                            Reserva.fecha < datetime.combine(hasta + timedelta(days=1), time.min),
+                            Reserva.estado_reserva_id.in_(estados_activos)
+                        )
+                    ).all()
+                    for cancha_id, fecha, inicio, fin, id in filas:
+                        existentes[(cancha_id, _dia(fecha))].append((inicio, fin, id))
+
+                    # Ocurrencias de series en las mismas claves, expandidas en memoria
+                    series = self.session.exec(consulta_series_rango({c for c, _ in claves}, desde, hasta)).all()
+                    excepciones = defaultdict(set)
+                    if series:
+                        for serie_id, fecha in self.session.exec(consulta_excepciones([s.id for s in series])).all():
+                            excepciones[serie_id].add(fecha)
+                    for serie in series:
+                        for dia in ocurrencias(serie, desde, hasta, excepciones[serie.id]):
+                            if (serie.cancha_id, dia) in claves_lote:
+                                existentes[(serie.cancha_id, dia)].append((serie.hora_inicio, serie.hora_fin, ("serie", serie.id)))
+
+                    indice_lote = IndiceIntervalos()
+                    for clave in claves:
+                        indice_lote.cargar(clave, existentes[clave])
+
+                    # Bloqueos por torneos que tocan el rango del lote
+                    bloqueos = defaultdict(list)
+                    for cancha_id, inicio, fin, torneo_id in self.session.exec(
+                        select(BloqueoCancha.cancha_id, BloqueoCancha.inicio, BloqueoCancha.fin, BloqueoCancha.torneo_id).where(
+                            BloqueoCancha.cancha_id.in_({c for c, _ in claves}),
+                            BloqueoCancha.inicio < datetime.combine(hasta + timedelta(days=1), time.min),
+                            BloqueoCancha.fin > datetime.combine(desde, time.min)
+                        )
+                    ).all():
+                        bloqueos[cancha_id].append((inicio, fin, torneo_id))
+                    bloqueos_lote = IndiceIntervalos()
+                    for cancha_id, entradas in bloqueos.items():
+                        bloqueos_lote.cargar(cancha_id, entradas)
+
+                    # 3. Conflictos en una pasada: cada reserva aceptada entra al índice local
+                    for i in validas:
+                        r = lote.reservas[i]
+                        clave = (r.cancha_id, _dia(r.fecha))
+                        bloqueo = bloqueos_lote.buscar_superposicion(
+                            r.cancha_id, datetime.combine(clave[1], r.hora_inicio), datetime.combine(clave[1], r.hora_fin)
+                        )
+                        if bloqueo:
+                            registrar_error(i, 409, _error_bloqueo(bloqueo[2]).detail)
+                            continue
+                        overlap = indice_lote.buscar_superposicion(clave, r.hora_inicio, r.hora_fin)
+                        if overlap is None:
+                            indice_lote.agregar(clave, r.hora_inicio, r.hora_fin, ("lote", i))
+                        elif isinstance(overlap[2], tuple) and overlap[2][0] == "lote":
+                            registrar_error(i, 409, f"Se superpone con la reserva {overlap[2][1]} del lote.")
+                        else:
+                            registrar_error(i, 409, f"Cancha no disponible. Se superpone con {_ocupante(overlap[2])}.")
+
+                if errores and lote.modo == "todo_o_nada":
+                    raise HTTPException(status_code=409, detail=[e.model_dump() for e in sorted(errores.values(), key=lambda e: e.indice)])
+
+                # 4. Insertar todo en la misma transacción
+                aceptadas = [i for i in validas if i not in errores]
+                creadas: List[Reserva] = [
+                    Reserva(**lote.reservas[i].model_dump(exclude={'servicios_ids'}), estado_reserva_id=estado_pendiente_id)
+                    for i in aceptadas
+                ]
+                self.session.add_all(creadas)
+                self.session.flush()
+                links = [
+                    {"reserva_id": reserva.id, "servicio_id": servicio_id}
+                    for i, reserva in zip(aceptadas, creadas)
+                    for servicio_id in lote.reservas[i].servicios_ids or []
+                ]
+                if links:
+                    self.session.exec(insert(ReservaServicio), params=links)
+
+                # Resumen de ocupación: un único upsert para todas las (cancha, fecha)
+                por_clave = defaultdict(lambda: [0, 0])
+                for reserva in creadas:
+                    acumulado = por_clave[(reserva.cancha_id, _dia(reserva.fecha))]
+                    acumulado[0] += minutos_entre(reserva.hora_inicio, reserva.hora_fin)
+                    acumulado[1] += 1
+                if por_clave:
+                    self.session.exec(sumar_reservas_varias(
+                        self.session.get_bind().dialect.name,
+                        [(cancha_id, dia, minutos, cantidad) for (cancha_id, dia), (minutos, cantidad) in por_clave.items()]
+                    ))
+
+                # Se leen antes del commit, que expira los objetos
+                ids = [r.id for r in creadas]
+                self.session.commit()
+            except HTTPException:
+                self.session.rollback()
+                raise
+            except Exception as e:
+                self.session.rollback()
+                raise HTTPException(status_code=500, detail=f"Error al crear reservas: {e}")
+
+        cargadas = self.session.exec(
+            select(Reserva).where(Reserva.id.in_(ids)).order_by(Reserva.id).options(*_relaciones_respuesta())
+        ).unique().all() if ids else []
+        return ReservaLoteResponse(
+            creadas=[ReservaResponse.model_validate(r) for r in cargadas],
+            errores=sorted(errores.values(), key=lambda e: e.indice),
         )
 
-        try:
-            # 2. Crear la reserva con estado inicial PENDIENTE
-            new_reserva = Reserva(
-                **reserva_data.model_dump(exclude={'servicios_ids'}),
-                estado_reserva_id=estado_pendiente.id
+    def cancelar_reserva(self, id: int) -> ReservaResponse:
+        reserva_obj = self.session.get(Reserva, id)
+        if not reserva_obj:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+
+        estado_cancelada_id = self._get_estado_id('Cancelada')
+        if reserva_obj.estado_reserva_id != estado_cancelada_id:
+            self.session.exec(restar_reservas(
+                reserva_obj.cancha_id, _dia(reserva_obj.fecha),
+                minutos_entre(reserva_obj.hora_inicio, reserva_obj.hora_fin)
+            ))
+
+        reserva_obj.estado_reserva_id = estado_cancelada_id
+        self.session.add(reserva_obj)
+        self.session.commit()
+        return ReservaResponse.model_validate(self._obtener(id))
+
+    def confirmar_reserva(self, id: int) -> ReservaResponse:
+        reserva_obj = self.session.get(Reserva, id)
+        if not reserva_obj:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+
+        if reserva_obj.estado_reserva_id == self._get_estado_id('Cancelada'):
+            raise HTTPException(status_code=400, detail="No se puede confirmar una reserva cancelada.")
+
+        reserva_obj.estado_reserva_id = self._get_estado_id('Confirmada')
+        self.session.add(reserva_obj)
+        self.session.commit()
+        return ReservaResponse.model_validate(self._obtener(id))
+
+    # Otras operaciones CRUD (update, delete) irían aquí, incluyendo validación de superposición.
+
+
+class ReservasServiceAsync:
+    """Versión async de ReservasService: misma validación contra la base y la misma lógica de bloqueo."""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    async def _get_estado_id(self, nombre: str) -> int:
+        await catalogos.asegurar_cargado_async(self.session)
+        estado_id = catalogos.estado_reserva_id(self.session.sync_session, nombre)
+        if not estado_id:
+            raise HTTPException(status_code=500, detail=f"Error de configuración: Estado '{nombre}' no encontrado.")
+        return estado_id
+
+    async def _estados_activos(self) -> List[int]:
+        return [await self._get_estado_id('Confirmada'), await self._get_estado_id('Pendiente')]
+
+    async def _obtener(self, id: int) -> Reserva:
+        return (await self.session.exec(
+            select(Reserva).where(Reserva.id == id).options(*_relaciones_respuesta())
+        )).unique().one()
+
+    async def _tomar_semaforo(self, cancha_id: int, dia: date):
+        dialecto = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        stmt = dialecto.insert(SemaforoCancha).values(cancha_id=cancha_id, fecha=dia, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cancha_id", "fecha"],
+            set_={"version": SemaforoCancha.version + 1}
+        )
+        await self.session.exec(stmt)
+
+    async def _check_availability(self, cancha_id: int, dia: date, inicio: time, fin: time):
+        inicio_dia = datetime.combine(dia, time.min)
+        overlap_id = (await self.session.exec(
+            select(Reserva.id).where(
+                Reserva.cancha_id == cancha_id,
+                Reserva.fecha >= inicio_dia,
+                Reserva.fecha < inicio_dia + timedelta(days=1),
+                Reserva.hora_inicio < fin,
+                Reserva.hora_fin > inicio,
+                Reserva.estado_reserva_id.in_(await self._estados_activos())
             )
-            self.session.add(new_reserva)
-            self.session.commit()
-            self.session.refresh(new_reserva)
-
-            # 3. Manejar Servicios Adicionales (Tabla N:M)
-            if reserva_data.servicios_ids:
-                for servicio_id in reserva_data.servicios_ids:
-                    if not self.session.get(Servicio, servicio_id):
-                        raise HTTPException(status_code=400, detail=f"Servicio con ID {servicio_id} no existe.")
-
-                    link = ReservaServicio(reserva_id=new_reserva.id, servicio_id=servicio_id)
-                    self.session.add(link)
-                self.session.commit()
-                self.session.refresh(new_reserva)
+        )).first()
+        if not overlap_id:
+            series = (await self.session.exec(consulta_series_dia(cancha_id, dia, inicio, fin))).all()
+            overlap_id = next((o[2] for o in _ocurrencias_del_dia(series, dia)), None)
+        if overlap_id:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Cancha no disponible. Se superpone con {_ocupante(overlap_id)}."
+            )
+
+        torneo_id = (await self.session.exec(
+            select(BloqueoCancha.torneo_id).where(
+                BloqueoCancha.cancha_id == cancha_id,
+                BloqueoCancha.inicio < datetime.combine(dia, fin),
+                BloqueoCancha.fin > datetime.combine(dia, inicio)
+            )
+        )).first()
+        if torneo_id:
+            raise _error_bloqueo(torneo_id)
+
+    async def get_reservas(self, filtros: Optional[ReservaFiltros] = None,
+                           paginacion: Optional[Paginacion] = None) -> List[ReservaResponse]:
+        filtros = filtros or ReservaFiltros()
+        await catalogos.asegurar_cargado_async(self.session)
+        query = _filtrar_reservas(select(Reserva), filtros, _estado_filtro_id(self.session.sync_session, filtros))
+        if paginacion:
+            query = paginacion.aplicar(query, Reserva)
+        reservas = (await self.session.exec(query.options(*_relaciones_respuesta()))).unique().all()
+        return [ReservaResponse.model_validate(r) for r in reservas]
+
+    async def get_ocurrencias_series(self, filtros: Optional[ReservaFiltros] = None) -> List[OcurrenciaSerie]:
+        query = _consulta_ocurrencias(filtros or ReservaFiltros())
+        if query is None:
+            return []
+        series = (await self.session.exec(query)).all()
+        excepciones = defaultdict(set)
+        if series:
+            for serie_id, fecha in (await self.session.exec(consulta_excepciones([s.id for s in series]))).all():
+                excepciones[serie_id].add(fecha)
+        return _expandir_ocurrencias(series, excepciones, filtros or ReservaFiltros())
+
+    async def create_reserva(self, reserva_data: ReservaCreate) -> ReservaResponse:
+        if reserva_data.hora_inicio >= reserva_data.hora_fin:
+            raise HTTPException(status_code=400, detail="hora_inicio debe ser anterior a hora_fin.")
+        if not await self.session.get(Cliente, reserva_data.cliente_id):
+            raise HTTPException(status_code=400, detail="Cliente no existe.")
+        if not (await self.session.exec(consulta_canchas_reservables(reserva_data.cancha_id))).first():
+            raise HTTPException(status_code=400, detail="Cancha no existe.")
+        for servicio_id in reserva_data.servicios_ids or []:
+            if not await self.session.get(Servicio, servicio_id):
+                raise HTTPException(status_code=400, detail=f"Servicio con ID {servicio_id} no existe.")
+
+        estado_pendiente_id = await self._get_estado_id('Pendiente')
+        dia = _dia(reserva_data.fecha)
+
+        async with candados_reservas_async.tomar((reserva_data.cancha_id, dia)):
+            try:
+                await self._tomar_semaforo(reserva_data.cancha_id, dia)
+                await self._check_availability(
+                    reserva_data.cancha_id,
+                    dia,
+                    reserva_data.hora_inicio,
+                    reserva_data.hora_fin
+                )
+
+                new_reserva = Reserva(
+                    **reserva_data.model_dump(exclude={'servicios_ids'}),
+                    estado_reserva_id=estado_pendiente_id
+                )
+                self.session.add(new_reserva)
+                await self.session.flush()
+
+                for servicio_id in reserva_data.servicios_ids or []:
+                    self.session.add(ReservaServicio(reserva_id=new_reserva.id, servicio_id=servicio_id))
+
+                await self.session.exec(sumar_reservas(
+                    self.session.bind.dialect.name, new_reserva.cancha_id, dia,
+                    minutos_entre(new_reserva.hora_inicio, new_reserva.hora_fin)
+                ))
+
+                await self.session.commit()
+                return ReservaResponse.model_validate(await self._obtener(new_reserva.id))
+
+            except HTTPException:
+                await self.session.rollback()
+                raise
+            except Exception as e:
+                await self.session.rollback()
+                raise HTTPException(status_code=500, detail=f"Error al crear reserva: {e}")
+
+    async def cancelar_reserva(self, id: int) -> ReservaResponse:
+        reserva_obj = await self.session.get(Reserva, id)
+        if not reserva_obj:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+
+        estado_cancelada_id = await self._get_estado_id('Cancelada')
+        if reserva_obj.estado_reserva_id != estado_cancelada_id:
+            await self.session.exec(restar_reservas(
+                reserva_obj.cancha_id, _dia(reserva_obj.fecha),
+                minutos_entre(reserva_obj.hora_inicio, reserva_obj.hora_fin)
+            ))
+
+        reserva_obj.estado_reserva_id = estado_cancelada_id
+        self.session.add(reserva_obj)
+        await self.session.commit()
+        return ReservaResponse.model_validate(await self._obtener(id))
 
-            return ReservaResponse.model_validate(new_reserva)
+    async def confirmar_reserva(self, id: int) -> ReservaResponse:
+        reserva_obj = await self.session.get(Reserva, id)
+        if not reserva_obj:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
 
-        except HTTPException:
-            self.session.rollback()
-            raise
-        except Exception as e:
-            self.session.rollback()
-            raise HTTPException(status_code=500, detail=f"Error al crear reserva: {e}")
+        if reserva_obj.estado_reserva_id == await self._get_estado_id('Cancelada'):
+            raise HTTPException(status_code=400, detail="No se puede confirmar una reserva cancelada.")
 
-    # Otras operaciones CRUD (update, delete) irían aquí, incluyendo validación de superposición.
\ No newline at end of file
+        reserva_obj.estado_reserva_id = await self._get_estado_id('Confirmada')
+        self.session.add(reserva_obj)
+        await self.session.commit()
+        return ReservaResponse.model_validate(await self._obtener(id))
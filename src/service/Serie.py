@@ -0,0 +1,211 @@
+# src/service/Serie.py
+from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from fastapi import Depends, HTTPException
+from database import get_session
+from src.models.Reserva import Reserva, SerieReserva, ExcepcionSerie
+from src.models.Cliente import Cliente
+from src.models.Torneo import BloqueoCancha
+from src.schemas.Reserva import (
+    SerieReservaCreate, SerieReservaResponse, ExcepcionSerieCreate, OcurrenciaSerie, DIAS_SERIE_MAXIMO
+)
+from src.service.Reserva import ReservasService, candados_reservas, consulta_canchas_reservables
+from src.utils.series import es_ocurrencia, ocurrencias, primera_coincidencia, consulta_series_filtros, consulta_excepciones
+from src.utils.catalogos import catalogos
+from src.utils.ocupacion import sumar_reservas_varias, restar_reservas, restar_reservas_dias, minutos_entre
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from datetime import date, datetime, time, timedelta
+
+
+class SeriesService:
+    """
+    Reservas recurrentes. Las ocurrencias nunca se guardan como filas: se calculan
+    cuando se listan y los conflictos contra otras series se resuelven de forma analítica.
+    """
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+        self.reservas = ReservasService(session)
+
+    def _obtener(self, id: int) -> SerieReserva:
+        serie = self.session.exec(
+            select(SerieReserva).where(SerieReserva.id == id).options(selectinload(SerieReserva.excepciones))
+        ).first()
+        if not serie:
+            raise HTTPException(status_code=404, detail="Serie no encontrada")
+        return serie
+
+    def _excepciones(self, serie_ids) -> Dict[int, Set[date]]:
+        excepciones = defaultdict(set)
+        if serie_ids:
+            for serie_id, fecha in self.session.exec(consulta_excepciones(serie_ids)).all():
+                excepciones[serie_id].add(fecha)
+        return excepciones
+
+    def _check_conflictos(self, serie: SerieReserva):
+        # 1. Reservas activas de la cancha en el rango y la franja: solo cuentan las que caen en una ocurrencia
+        estados_activos = [
+            catalogos.estado_reserva_id(self.session, 'Confirmada'),
+            catalogos.estado_reserva_id(self.session, 'Pendiente'),
+        ]
+        reservas = self.session.exec(
+            select(Reserva.id, Reserva.fecha).where(
+                Reserva.cancha_id == serie.cancha_id,
+                Reserva.fecha >= datetime.combine(serie.fecha_desde, time.min),
+                Reserva.fecha < datetime.combine(serie.fecha_hasta + timedelta(days=1), time.min),
+                Reserva.hora_inicio < serie.hora_fin,
+                Reserva.hora_fin > serie.hora_inicio,
+                Reserva.estado_reserva_id.in_(estados_activos)
+            ).order_by(Reserva.fecha)
+        ).all()
+        for reserva_id, fecha in reservas:
+            if es_ocurrencia(serie, fecha.date()):
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Cancha no disponible el {fecha.date()}. Se superpone con la reserva {reserva_id}."
+                )
+
+        # 2. Otras series del mismo día y franja: se busca la primera fecha en común
+        otras = self.session.exec(
+            select(SerieReserva).where(
+                SerieReserva.cancha_id == serie.cancha_id,
+                SerieReserva.activa == True,  # noqa: E712
+                SerieReserva.dia_semana == serie.dia_semana,
+                SerieReserva.fecha_desde <= serie.fecha_hasta,
+                SerieReserva.fecha_hasta >= serie.fecha_desde,
+                SerieReserva.hora_inicio < serie.hora_fin,
+                SerieReserva.hora_fin > serie.hora_inicio,
+            )
+        ).all()
+        excepciones = self._excepciones([o.id for o in otras])
+        for otra in otras:
+            coincidencia = primera_coincidencia(serie, otra, excepciones_b=excepciones[otra.id])
+            if coincidencia:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Cancha no disponible el {coincidencia}. Se superpone con la serie {otra.id}."
+                )
+
+        # 3. Bloqueos por torneos: solo se recorren las ocurrencias dentro de cada bloqueo
+        bloqueos = self.session.exec(
+            select(BloqueoCancha).where(
+                BloqueoCancha.cancha_id == serie.cancha_id,
+                BloqueoCancha.inicio < datetime.combine(serie.fecha_hasta + timedelta(days=1), time.min),
+                BloqueoCancha.fin > datetime.combine(serie.fecha_desde, time.min)
+            )
+        ).all()
+        for bloqueo in bloqueos:
+            for dia in ocurrencias(serie, bloqueo.inicio.date(), bloqueo.fin.date()):
+                if datetime.combine(dia, serie.hora_inicio) < bloqueo.fin and datetime.combine(dia, serie.hora_fin) > bloqueo.inicio:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Cancha no disponible el {dia}. Está bloqueada por el torneo {bloqueo.torneo_id}."
+                    )
+
+    def get_series(self, cancha_id: Optional[int] = None, cliente_id: Optional[int] = None) -> List[SerieReservaResponse]:
+        query = select(SerieReserva).options(selectinload(SerieReserva.excepciones)).order_by(SerieReserva.id)
+        if cancha_id is not None:
+            query = query.where(SerieReserva.cancha_id == cancha_id)
+        if cliente_id is not None:
+            query = query.where(SerieReserva.cliente_id == cliente_id)
+        return [SerieReservaResponse.model_validate(s) for s in self.session.exec(query).all()]
+
+    def get_ocurrencias(self, fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None,
+                        cancha_id: Optional[int] = None, cliente_id: Optional[int] = None) -> List[OcurrenciaSerie]:
+        fecha_desde = fecha_desde or date.today()
+        fecha_hasta = fecha_hasta or fecha_desde + timedelta(days=30)
+        if fecha_desde > fecha_hasta:
+            raise HTTPException(status_code=400, detail="fecha_desde debe ser anterior a fecha_hasta.")
+        if (fecha_hasta - fecha_desde).days + 1 > DIAS_SERIE_MAXIMO:
+            raise HTTPException(status_code=400, detail=f"El rango no puede superar {DIAS_SERIE_MAXIMO} días.")
+
+        # También las canceladas: conservan las ocurrencias ya jugadas
+        series = self.session.exec(consulta_series_filtros(fecha_desde, fecha_hasta, cancha_id, cliente_id)).all()
+        excepciones = self._excepciones([s.id for s in series])
+
+        # Expansión perezosa: solo las fechas del rango pedido
+        resultado = [
+            OcurrenciaSerie(
+                serie_id=s.id, cliente_id=s.cliente_id, cancha_id=s.cancha_id,
+                fecha=dia, hora_inicio=s.hora_inicio, hora_fin=s.hora_fin
+            )
+            for s in series
+            for dia in ocurrencias(s, fecha_desde, fecha_hasta, excepciones[s.id])
+        ]
+        return sorted(resultado, key=lambda o: (o.fecha, o.hora_inicio, o.cancha_id))
+
+    def create_serie(self, serie_data: SerieReservaCreate) -> SerieReservaResponse:
+        if not self.session.get(Cliente, serie_data.cliente_id):
+            raise HTTPException(status_code=400, detail="Cliente no existe.")
+        if not self.session.exec(consulta_canchas_reservables(serie_data.cancha_id)).first():
+            raise HTTPException(status_code=400, detail="Cancha no existe.")
+        if serie_data.hora_inicio >= serie_data.hora_fin:
+            raise HTTPException(status_code=400, detail="hora_inicio debe ser anterior a hora_fin.")
+        if serie_data.fecha_desde > serie_data.fecha_hasta:
+            raise HTTPException(status_code=400, detail="fecha_desde debe ser anterior a fecha_hasta.")
+        if (serie_data.fecha_hasta - serie_data.fecha_desde).days + 1 > DIAS_SERIE_MAXIMO:
+            raise HTTPException(status_code=400, detail=f"La serie no puede superar {DIAS_SERIE_MAXIMO} días.")
+
+        serie = SerieReserva.model_validate(serie_data, update={'dia_semana': serie_data.fecha_desde.weekday()})
+        fechas = list(ocurrencias(serie))
+        claves = [(serie.cancha_id, dia) for dia in fechas]
+
+        # Mismo esquema de bloqueo que una reserva, pero sobre todas las fechas de la serie
+        with candados_reservas.tomar(*claves):
+            try:
+                self.reservas._tomar_semaforos(claves)
+                self._check_conflictos(serie)
+
+                self.session.add(serie)
+                self.session.flush()
+                minutos = minutos_entre(serie.hora_inicio, serie.hora_fin)
+                self.session.exec(sumar_reservas_varias(
+                    self.session.get_bind().dialect.name,
+                    [(serie.cancha_id, dia, minutos, 1) for dia in fechas]
+                ))
+                serie_id = serie.id
+                self.session.commit()
+            except HTTPException:
+                self.session.rollback()
+                raise
+            except Exception as e:
+                self.session.rollback()
+                raise HTTPException(status_code=500, detail=f"Error al crear serie: {e}")
+
+        return SerieReservaResponse.model_validate(self._obtener(serie_id))
+
+    def agregar_excepcion(self, serie_id: int, excepcion: ExcepcionSerieCreate) -> SerieReservaResponse:
+        serie = self._obtener(serie_id)
+        excepciones = {e.fecha for e in serie.excepciones}
+        if not serie.activa or not es_ocurrencia(serie, excepcion.fecha, excepciones):
+            raise HTTPException(status_code=400, detail=f"La serie no se juega el {excepcion.fecha}.")
+
+        self.session.add(ExcepcionSerie(serie_id=serie_id, fecha=excepcion.fecha))
+        self.session.exec(restar_reservas(
+            serie.cancha_id, excepcion.fecha, minutos_entre(serie.hora_inicio, serie.hora_fin)
+        ))
+        self.session.commit()
+        return SerieReservaResponse.model_validate(self._obtener(serie_id))
+
+    def cancelar_serie(self, serie_id: int) -> SerieReservaResponse:
+        """
+        Libera las ocurrencias desde hoy; las ya jugadas quedan en el historial (la serie
+        termina ayer). Una serie que todavía no empezó queda sin ocurrencias.
+        """
+        serie = self._obtener(serie_id)
+        if not serie.activa:
+            raise HTTPException(status_code=400, detail="La serie ya está cancelada.")
+
+        hoy = date.today()
+        futuras = list(ocurrencias(serie, hoy, None, {e.fecha for e in serie.excepciones}))
+        if futuras:
+            self.session.exec(restar_reservas_dias(
+                serie.cancha_id, futuras, minutos_entre(serie.hora_inicio, serie.hora_fin)
+            ))
+
+        serie.fecha_hasta = min(serie.fecha_hasta, hoy - timedelta(days=1))
+        serie.activa = False
+        self.session.add(serie)
+        self.session.commit()
+        return SerieReservaResponse.model_validate(self._obtener(serie_id))
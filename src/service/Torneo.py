@@ -1,19 +1,125 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, col, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from fastapi import Depends, HTTPException
-from database import get_session
-from src.models.Torneo import Torneo, CanchaTorneoLink
-from src.models.Cancha import Cancha
+from database import get_session, get_async_session
+from src.models.Torneo import Torneo, CanchaTorneoLink, BloqueoCancha
+from src.models.Reserva import Reserva
+from src.models.Cancha import Cancha, TipoCancha
 from src.schemas.Torneo import TorneoCreate, TorneoUpdate, TorneoResponse
-from typing import List
+from src.service.Reserva import candados_reservas, candados_reservas_async
+from src.utils.cache import cache_resultados
+from src.utils.catalogos import catalogos
+from src.utils.paginacion import Paginacion
+from src.utils.series import ocurrencias, consulta_series_rango, consulta_excepciones
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+
+# Tablas de las que depende el listado cacheado (cada torneo incluye sus canchas)
+ETIQUETAS_TORNEOS = (
+    Torneo.__tablename__, CanchaTorneoLink.__tablename__, Cancha.__tablename__, TipoCancha.__tablename__
+)
+
+
+def _filtrar_torneos(query, nombre: Optional[str] = None, fecha_desde: Optional[date] = None,
+                     fecha_hasta: Optional[date] = None):
+    # Un torneo entra en el rango si se solapa con [fecha_desde, fecha_hasta]
+    if nombre:
+        query = query.where(col(Torneo.nombre).ilike(f"%{nombre}%"))
+    if fecha_desde:
+        query = query.where(Torneo.fecha_fin >= datetime.combine(fecha_desde, time.min))
+    if fecha_hasta:
+        query = query.where(Torneo.fecha_inicio < datetime.combine(fecha_hasta + timedelta(days=1), time.min))
+    return query
+
+
+def _dias_rango(inicio: datetime, fin: datetime) -> List[date]:
+    # Días que toca [inicio, fin); si termina a las 00:00 el último día no cuenta
+    ultimo = fin.date() if fin.time() > time.min else fin.date() - timedelta(days=1)
+    return [inicio.date() + timedelta(days=i) for i in range((ultimo - inicio.date()).days + 1)]
+
+
+def _bloquear_cancha(cancha_id: int):
+    # Bloquea todo el rango del torneo de una vez: FOR UPDATE sobre la fila de la cancha, que
+    # las reservas toman con FOR SHARE (ver consulta_canchas_reservables). En SQLite no aplica:
+    # ahí la primera escritura de la transacción ya toma el bloqueo de toda la base.
+    return select(Cancha.id).where(Cancha.id == cancha_id).with_for_update()
+
+
+def _consulta_reservas_en_conflicto(cancha_id: int, inicio: datetime, fin: datetime, estados_activos: List[int]):
+    # Una sola consulta: reservas activas cuyo [fecha + hora_inicio, fecha + hora_fin)
+    # se cruza con [inicio, fin). Solo el primer y el último día comparan horas.
+    primer_dia = datetime.combine(inicio.date(), time.min)
+    ultimo_dia = datetime.combine(fin.date(), time.min)
+    return select(Reserva.id).where(
+        Reserva.cancha_id == cancha_id,
+        Reserva.estado_reserva_id.in_(estados_activos),
+        Reserva.fecha >= primer_dia,
+        Reserva.fecha < ultimo_dia + timedelta(days=1),
+        or_(Reserva.fecha >= primer_dia + timedelta(days=1), Reserva.hora_fin > inicio.time()),
+        or_(Reserva.fecha < ultimo_dia, Reserva.hora_inicio < fin.time()),
+    ).order_by(Reserva.id)
+
+
+def _series_en_conflicto(series, excepciones: dict, inicio: datetime, fin: datetime) -> List[int]:
+    return [
+        serie.id for serie in series
+        if any(
+            datetime.combine(dia, serie.hora_inicio) < fin and datetime.combine(dia, serie.hora_fin) > inicio
+            for dia in ocurrencias(serie, inicio.date(), fin.date(), excepciones.get(serie.id, set()))
+        )
+    ]
+
+
+def _consulta_otro_torneo(cancha_id: int, inicio: datetime, fin: datetime):
+    return select(BloqueoCancha.torneo_id).where(
+        BloqueoCancha.cancha_id == cancha_id,
+        BloqueoCancha.inicio < fin,
+        BloqueoCancha.fin > inicio
+    )
+
+
+def _validar_agregar_cancha(torneo: Optional[Torneo], cancha: Optional[Cancha], existing_link) -> None:
+    if not torneo or not cancha:
+        raise HTTPException(status_code=404, detail="Torneo o Cancha no encontrado.")
+    if existing_link:
+        raise HTTPException(status_code=409, detail="La cancha ya está asociada a este torneo.")
+    if torneo.fecha_inicio >= torneo.fecha_fin:
+        raise HTTPException(status_code=400, detail="La fecha de fin del torneo debe ser posterior a la de inicio.")
+
+
+def _error_otro_torneo(otro_torneo_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"La cancha ya está bloqueada por el torneo {otro_torneo_id} en esas fechas."
+    )
+
+
+def _error_reservas_en_conflicto(reservas: List[int], series: List[int]) -> HTTPException:
+    return HTTPException(status_code=409, detail={
+        "mensaje": "La cancha tiene reservas durante el torneo.",
+        "reservas": reservas,
+        "series": series,
+    })
 
 
 class TorneosService:
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
-    def get_torneos(self) -> List[TorneoResponse]:
-        torneos = self.session.exec(select(Torneo)).all()
-        return [TorneoResponse.model_validate(t) for t in torneos]
+    def get_torneos(self, paginacion: Optional[Paginacion] = None, nombre: Optional[str] = None,
+                    fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None) -> List[TorneoResponse]:
+        def consultar():
+            query = _filtrar_torneos(select(Torneo), nombre, fecha_desde, fecha_hasta)
+            if paginacion:
+                query = paginacion.aplicar(query, Torneo)
+            torneos = self.session.exec(
+                query.options(selectinload(Torneo.canchas).joinedload(Cancha.tipo_cancha))
+            ).all()
+            return [TorneoResponse.model_validate(t) for t in torneos]
+
+        clave = ("torneos", paginacion and paginacion.clave(), nombre, fecha_desde, fecha_hasta)
+        return cache_resultados.obtener_o_calcular(clave, ETIQUETAS_TORNEOS, consultar)
 
     def create_torneo(self, torneo_data: TorneoCreate) -> TorneoResponse:
         try:
@@ -26,23 +132,138 @@ class TorneosService:
             self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Error al crear torneo: {e}")
 
+    def _reservas_en_conflicto(self, cancha_id: int, inicio: datetime, fin: datetime) -> List[int]:
+        estados_activos = [
+            catalogos.estado_reserva_id(self.session, 'Confirmada'),
+            catalogos.estado_reserva_id(self.session, 'Pendiente'),
+        ]
+        return list(self.session.exec(_consulta_reservas_en_conflicto(cancha_id, inicio, fin, estados_activos)).all())
+
+    def _series_en_conflicto(self, cancha_id: int, inicio: datetime, fin: datetime) -> List[int]:
+        series = self.session.exec(consulta_series_rango([cancha_id], inicio.date(), fin.date())).all()
+        excepciones = {}
+        if series:
+            for serie_id, fecha in self.session.exec(consulta_excepciones([s.id for s in series])).all():
+                excepciones.setdefault(serie_id, set()).add(fecha)
+        return _series_en_conflicto(series, excepciones, inicio, fin)
+
     def agregar_cancha_torneo(self, torneo_id: int, cancha_id: int) -> Cancha:
         torneo = self.session.get(Torneo, torneo_id)
         cancha = self.session.get(Cancha, cancha_id)
+        _validar_agregar_cancha(torneo, cancha, self.session.get(CanchaTorneoLink, (cancha_id, torneo_id)))
+        inicio, fin = torneo.fecha_inicio, torneo.fecha_fin
+
+        # Dentro del proceso se esperan las reservas en curso de esos días; en la base el
+        # rango se bloquea una sola vez (_bloquear_cancha) y el vínculo es la primera escritura
+        with candados_reservas.tomar(*[(cancha_id, dia) for dia in _dias_rango(inicio, fin)]):
+            try:
+                self.session.exec(_bloquear_cancha(cancha_id))
+                self.session.add(CanchaTorneoLink(torneo_id=torneo_id, cancha_id=cancha_id))
+                self.session.flush()
+
+                # 1. Torneos superpuestos en la misma cancha
+                otro_torneo_id = self.session.exec(_consulta_otro_torneo(cancha_id, inicio, fin)).first()
+                if otro_torneo_id:
+                    raise _error_otro_torneo(otro_torneo_id)
+
+                # 2. Reservas y series que quedarían dentro del bloqueo, informadas todas juntas
+                reservas = self._reservas_en_conflicto(cancha_id, inicio, fin)
+                series = self._series_en_conflicto(cancha_id, inicio, fin)
+                if reservas or series:
+                    raise _error_reservas_en_conflicto(reservas, series)
 
-        if not torneo or not cancha:
-            raise HTTPException(status_code=404, detail="Torneo o Cancha no encontrado.")
+                self.session.add(BloqueoCancha(cancha_id=cancha_id, torneo_id=torneo_id, inicio=inicio, fin=fin))
+                self.session.commit()
+            except HTTPException:
+                self.session.rollback()
+                raise
+            except Exception as e:
+                self.session.rollback()
+                raise HTTPException(status_code=500, detail=f"Error al agregar cancha al torneo: {e}")
+        self.session.refresh(cancha)
+        return cancha
 
-        link = CanchaTorneoLink(torneo_id=torneo_id, cancha_id=cancha_id)
 
-        existing_link = self.session.get(CanchaTorneoLink, primary_key=(cancha_id, torneo_id))
-        if existing_link:
-            raise HTTPException(status_code=409, detail="La cancha ya está asociada a este torneo.")
+class TorneosServiceAsync:
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    async def get_torneos(self, paginacion: Optional[Paginacion] = None, nombre: Optional[str] = None,
+                          fecha_desde: Optional[date] = None, fecha_hasta: Optional[date] = None) -> List[TorneoResponse]:
+        async def consultar():
+            query = _filtrar_torneos(select(Torneo), nombre, fecha_desde, fecha_hasta)
+            if paginacion:
+                query = paginacion.aplicar(query, Torneo)
+            # Con AsyncSession no hay lazy loading: las canchas se cargan junto con los torneos
+            torneos = (await self.session.exec(
+                query.options(selectinload(Torneo.canchas).joinedload(Cancha.tipo_cancha))
+            )).all()
+            return [TorneoResponse.model_validate(t) for t in torneos]
+
+        clave = ("torneos", paginacion and paginacion.clave(), nombre, fecha_desde, fecha_hasta)
+        return await cache_resultados.obtener_o_calcular_async(clave, ETIQUETAS_TORNEOS, consultar)
 
+    async def create_torneo(self, torneo_data: TorneoCreate) -> TorneoResponse:
         try:
-            self.session.add(link)
-            self.session.commit()
-            return cancha
+            new_torneo = Torneo.model_validate(torneo_data)
+            self.session.add(new_torneo)
+            await self.session.commit()
+            torneo = (await self.session.exec(
+                select(Torneo).where(Torneo.id == new_torneo.id).options(
+                    selectinload(Torneo.canchas).joinedload(Cancha.tipo_cancha)
+                )
+            )).one()
+            return TorneoResponse.model_validate(torneo)
         except Exception as e:
-            self.session.rollback()
-            raise HTTPException(status_code=500, detail=f"Error al agregar cancha al torneo: {e}")
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error al crear torneo: {e}")
+
+    async def _reservas_en_conflicto(self, cancha_id: int, inicio: datetime, fin: datetime) -> List[int]:
+        await catalogos.asegurar_cargado_async(self.session)
+        estados_activos = [
+            catalogos.estado_reserva_id(self.session.sync_session, 'Confirmada'),
+            catalogos.estado_reserva_id(self.session.sync_session, 'Pendiente'),
+        ]
+        return list((await self.session.exec(_consulta_reservas_en_conflicto(cancha_id, inicio, fin, estados_activos))).all())
+
+    async def _series_en_conflicto(self, cancha_id: int, inicio: datetime, fin: datetime) -> List[int]:
+        series = (await self.session.exec(consulta_series_rango([cancha_id], inicio.date(), fin.date()))).all()
+        excepciones = {}
+        if series:
+            for serie_id, fecha in (await self.session.exec(consulta_excepciones([s.id for s in series]))).all():
+                excepciones.setdefault(serie_id, set()).add(fecha)
+        return _series_en_conflicto(series, excepciones, inicio, fin)
+
+    async def agregar_cancha_torneo(self, torneo_id: int, cancha_id: int) -> Cancha:
+        # Misma validación y bloqueo que la versión sync, con los candados async del proceso
+        torneo = await self.session.get(Torneo, torneo_id)
+        cancha = await self.session.get(Cancha, cancha_id)
+        _validar_agregar_cancha(torneo, cancha, await self.session.get(CanchaTorneoLink, (cancha_id, torneo_id)))
+        inicio, fin = torneo.fecha_inicio, torneo.fecha_fin
+
+        async with candados_reservas_async.tomar(*[(cancha_id, dia) for dia in _dias_rango(inicio, fin)]):
+            try:
+                await self.session.exec(_bloquear_cancha(cancha_id))
+                self.session.add(CanchaTorneoLink(torneo_id=torneo_id, cancha_id=cancha_id))
+                await self.session.flush()
+
+                otro_torneo_id = (await self.session.exec(_consulta_otro_torneo(cancha_id, inicio, fin))).first()
+                if otro_torneo_id:
+                    raise _error_otro_torneo(otro_torneo_id)
+
+                reservas = await self._reservas_en_conflicto(cancha_id, inicio, fin)
+                series = await self._series_en_conflicto(cancha_id, inicio, fin)
+                if reservas or series:
+                    raise _error_reservas_en_conflicto(reservas, series)
+
+                self.session.add(BloqueoCancha(cancha_id=cancha_id, torneo_id=torneo_id, inicio=inicio, fin=fin))
+                await self.session.commit()
+            except HTTPException:
+                await self.session.rollback()
+                raise
+            except Exception as e:
+                await self.session.rollback()
+                raise HTTPException(status_code=500, detail=f"Error al agregar cancha al torneo: {e}")
+        return (await self.session.exec(
+            select(Cancha).where(Cancha.id == cancha_id).options(joinedload(Cancha.tipo_cancha))
+        )).one()
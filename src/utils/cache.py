@@ -0,0 +1,171 @@
+import asyncio
+import os
+import pickle
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from cachetools import TLRUCache
+
+from src.utils.versiones import TABLAS_SIN_VERSION, versiones
+
+CACHE_TTL_SEGUNDOS = int(os.getenv("CACHE_TTL_SEGUNDOS", "300"))
+CACHE_TAMANO_MAXIMO = int(os.getenv("CACHE_TAMANO_MAXIMO", "1000"))
+# Si se define, la cache se comparte entre procesos a través de Redis (dependencia opcional)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+
+
+class BackendCache(ABC):
+    """Almacenamiento de la cache: entradas con TTL, desalojadas por LRU."""
+
+    @abstractmethod
+    def obtener(self, clave: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def guardar(self, clave: str, valor: Any, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    def limpiar(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        # Cantidad de entradas, solo para las estadísticas: un backend que no puede contarlas barato devuelve 0
+        return 0
+
+
+class BackendMemoria(BackendCache):
+    """Backend local del proceso: LRU acotado por cantidad de entradas, con TTL por entrada."""
+
+    def __init__(self, tamano_maximo: int = CACHE_TAMANO_MAXIMO):
+        # Cada valor se guarda como (ttl, valor) para que TLRUCache calcule su vencimiento
+        self._entradas = TLRUCache(maxsize=tamano_maximo, ttu=lambda clave, valor, ahora: ahora + valor[0])
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+        return entrada[1] if entrada is not None else None
+
+    def guardar(self, clave: str, valor: Any, ttl: int) -> None:
+        with self._lock:
+            self._entradas[clave] = (ttl, valor)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._entradas.expire()
+            return len(self._entradas)
+
+
+class BackendRedis(BackendCache):
+    """
+    Backend compartido entre procesos. El desalojo LRU lo hace el servidor
+    (maxmemory-policy allkeys-lru); el TTL se fija en cada SET.
+    """
+
+    PREFIJO = "reservas:cache:"
+
+    def __init__(self, url: str):
+        import redis  # Solo hace falta si se configura CACHE_REDIS_URL
+        self._cliente = redis.Redis.from_url(url)
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        valor = self._cliente.get(self.PREFIJO + clave)
+        return pickle.loads(valor) if valor is not None else None
+
+    def guardar(self, clave: str, valor: Any, ttl: int) -> None:
+        self._cliente.set(self.PREFIJO + clave, pickle.dumps(valor), ex=ttl)
+
+    def limpiar(self) -> None:
+        for clave in self._cliente.scan_iter(f"{self.PREFIJO}*"):
+            self._cliente.delete(clave)
+
+
+class CacheResultados:
+    """
+    Cache de resultados de lecturas de los servicios. Las etiquetas son las tablas que lee
+    cada resultado, y la clave de la entrada incluye su versión en version_tabla (las mismas
+    que usa el ETag de CacheHTTP): un commit que escribe en una de ellas, desde cualquier
+    instancia o script, deja inalcanzables las entradas viejas hasta que el LRU o el TTL las
+    descarten. Cada lectura cuesta una consulta por clave primaria en lugar del listado.
+    """
+
+    def __init__(self, backend: BackendCache, ttl: int = CACHE_TTL_SEGUNDOS):
+        self.backend = backend
+        self.ttl = ttl
+        # Desde el arranque o la última limpieza (estadísticas)
+        self.aciertos = 0
+        self.fallos = 0
+        # Desde el arranque: limpiar() no los reinicia (contadores de /metrics)
+        self.aciertos_totales = 0
+        self.fallos_totales = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _etiquetas(etiquetas: Iterable[str]) -> Tuple[str, ...]:
+        etiquetas = tuple(etiquetas)
+        sin_version = TABLAS_SIN_VERSION.intersection(etiquetas)
+        if sin_version:
+            raise ValueError(f"Las tablas {sorted(sin_version)} no llevan versión: no pueden usarse como etiqueta")
+        return etiquetas
+
+    @staticmethod
+    def _clave(clave: Hashable, etiquetas: Sequence[str], numeros: Sequence[int]) -> str:
+        versiones_etiquetas = ",".join(f"{e}:{n}" for e, n in zip(etiquetas, numeros))
+        return f"{clave!r}|{versiones_etiquetas}"
+
+    def _contar(self, acierto: bool) -> None:
+        with self._lock:
+            if acierto:
+                self.aciertos += 1
+                self.aciertos_totales += 1
+            else:
+                self.fallos += 1
+                self.fallos_totales += 1
+
+    def obtener_o_calcular(self, clave: Hashable, etiquetas: Iterable[str], calcular: Callable[[], Any],
+                           ttl: Optional[int] = None) -> Any:
+        etiquetas = self._etiquetas(etiquetas)
+        clave_completa = self._clave(clave, etiquetas, versiones.numeros(*etiquetas))
+        valor = self.backend.obtener(clave_completa)
+        self._contar(valor is not None)
+        if valor is None:
+            valor = calcular()
+            self.backend.guardar(clave_completa, valor, ttl or self.ttl)
+        return valor
+
+    async def obtener_o_calcular_async(self, clave: Hashable, etiquetas: Iterable[str],
+                                       calcular: Callable[[], Awaitable[Any]], ttl: Optional[int] = None) -> Any:
+        etiquetas = self._etiquetas(etiquetas)
+        # Las versiones se leen con el engine sincrónico, fuera del event loop
+        numeros = await asyncio.to_thread(versiones.numeros, *etiquetas)
+        clave_completa = self._clave(clave, etiquetas, numeros)
+        valor = self.backend.obtener(clave_completa)
+        self._contar(valor is not None)
+        if valor is None:
+            valor = await calcular()
+            self.backend.guardar(clave_completa, valor, ttl or self.ttl)
+        return valor
+
+    def limpiar(self) -> None:
+        self.backend.limpiar()
+        with self._lock:
+            self.aciertos = self.fallos = 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            "entradas": len(self.backend),
+            "backend": type(self.backend).__name__,
+        }
+
+
+cache_resultados = CacheResultados(BackendRedis(CACHE_REDIS_URL) if CACHE_REDIS_URL else BackendMemoria())
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Hashable
+from weakref import WeakValueDictionary
+
+
+class CandadosPorClave:
+    """
+    Candados en memoria por clave (por ejemplo (cancha_id, fecha)). Solo se serializan
+    los hilos que usan la misma clave; los candados sin uso se liberan solos.
+    """
+
+    def __init__(self):
+        self._candados: "WeakValueDictionary[Hashable, threading.Lock]" = WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def _candado(self, clave: Hashable) -> threading.Lock:
+        with self._lock:
+            candado = self._candados.get(clave)
+            if candado is None:
+                candado = threading.Lock()
+                self._candados[clave] = candado
+            return candado
+
+    @contextmanager
+    def tomar(self, *claves: Hashable):
+        # Se toman siempre en el mismo orden para evitar deadlocks entre hilos
+        candados = [self._candado(clave) for clave in sorted(set(claves))]
+        for candado in candados:
+            candado.acquire()
+        try:
+            yield
+        finally:
+            for candado in reversed(candados):
+                candado.release()
+
+
+class CandadosPorClaveAsync:
+    """Equivalente de CandadosPorClave para código async (no bloquea el event loop)."""
+
+    def __init__(self):
+        self._candados: "WeakValueDictionary[Hashable, asyncio.Lock]" = WeakValueDictionary()
+
+    def _candado(self, clave: Hashable) -> asyncio.Lock:
+        candado = self._candados.get(clave)
+        if candado is None:
+            candado = asyncio.Lock()
+            self._candados[clave] = candado
+        return candado
+
+    @asynccontextmanager
+    async def tomar(self, *claves: Hashable):
+        candados = [self._candado(clave) for clave in sorted(set(claves))]
+        for candado in candados:
+            await candado.acquire()
+        try:
+            yield
+        finally:
+            for candado in reversed(candados):
+                candado.release()
@@ -0,0 +1,76 @@
+import threading
+from typing import Dict, Optional, Set
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from src.models.Reserva import EstadoReserva
+from src.models.Pago import EstadoPago
+from src.models.Cancha import TipoCancha
+
+
+def _nombre(valor) -> str:
+    # Las columnas 'nombre' son Enum: se indexa por su valor ("Pendiente", "Cobrado", ...)
+    return getattr(valor, "value", valor)
+
+
+class CacheCatalogos:
+    """
+    Cache en memoria de las tablas de catálogo (estado_reserva, estado_pago, tipo_cancha).
+    Se llena al iniciar la API (lifespan de main.py) o, si no, en la primera consulta,
+    y se invalida explícitamente cuando alguna de esas tablas cambia.
+    """
+
+    def __init__(self):
+        self._estados_reserva: Dict[str, int] = {}
+        self._estados_pago: Dict[str, int] = {}
+        self._tipos_cancha: Set[int] = set()
+        self._cargado = False
+        self._lock = threading.Lock()
+
+    def cargar(self, session: Session) -> None:
+        estados_reserva = {_nombre(e.nombre): e.id for e in session.exec(select(EstadoReserva)).all()}
+        estados_pago = {_nombre(e.nombre): e.id for e in session.exec(select(EstadoPago)).all()}
+        tipos_cancha = set(session.exec(select(TipoCancha.id)).all())
+        with self._lock:
+            self._estados_reserva = estados_reserva
+            self._estados_pago = estados_pago
+            self._tipos_cancha = tipos_cancha
+            self._cargado = True
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._cargado = False
+
+    async def asegurar_cargado_async(self, session) -> None:
+        # Con AsyncSession la carga corre sobre su sesión sincrónica interna
+        if not self._cargado:
+            await session.run_sync(self.cargar)
+
+    def _asegurar_cargado(self, session: Session) -> None:
+        if not self._cargado:
+            self.cargar(session)
+
+    def estado_reserva_id(self, session: Session, nombre: str) -> Optional[int]:
+        self._asegurar_cargado(session)
+        return self._estados_reserva.get(nombre)
+
+    def estado_pago_id(self, session: Session, nombre: str) -> Optional[int]:
+        self._asegurar_cargado(session)
+        return self._estados_pago.get(nombre)
+
+    def existe_tipo_cancha(self, session: Session, tipo_cancha_id: int) -> bool:
+        self._asegurar_cargado(session)
+        return tipo_cancha_id in self._tipos_cancha
+
+
+catalogos = CacheCatalogos()
+
+
+def _invalidar_catalogos(mapper, connection, target):
+    catalogos.invalidar()
+
+
+# Cualquier alta, baja o modificación de un catálogo invalida la cache
+for _modelo in (EstadoReserva, EstadoPago, TipoCancha):
+    for _evento in ("after_insert", "after_update", "after_delete"):
+        event.listen(_modelo, _evento, _invalidar_catalogos)
@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+from typing import List
+from sqlalchemy import event
+
+
+class ContadorConsultas:
+    def __init__(self):
+        self.cantidad = 0
+        self.sentencias: List[str] = []
+
+
+@contextmanager
+def contar_consultas(engine):
+    """
+    Cuenta las sentencias SQL que ejecuta el engine dentro del bloque. Sirve para
+    verificar que un listado hace una cantidad acotada de consultas (sin N+1):
+
+        with contar_consultas(engine) as contador:
+            service.get_reservas()
+        assert contador.cantidad <= 2
+    """
+    contador = ContadorConsultas()
+
+    def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+        contador.cantidad += 1
+        contador.sentencias.append(statement)
+
+    # Funciona tanto con Engine como con AsyncEngine (sus eventos van al engine sincrónico)
+    destino = getattr(engine, "sync_engine", engine)
+    event.listen(destino, "before_cursor_execute", _antes_de_ejecutar)
+    try:
+        yield contador
+    finally:
+        event.remove(destino, "before_cursor_execute", _antes_de_ejecutar)
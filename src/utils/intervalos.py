@@ -0,0 +1,148 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Cada entrada es (inicio, fin, id). Los intervalos son semiabiertos [inicio, fin).
+Intervalo = Tuple[Any, Any, Any]
+
+
+class IndiceIntervalos:
+    """
+    Índice en memoria de intervalos ordenados por inicio, agrupados por clave
+    (por ejemplo (cancha_id, fecha)).
+
+    Las claves se cargan de forma perezosa desde la base de datos y se mantienen
+    al día con agregar()/quitar(). La búsqueda de superposición es O(log n)
+    porque los intervalos válidos de una misma clave nunca se superponen entre sí
+    (todas las altas pasan antes por la validación de disponibilidad).
+    """
+
+    def __init__(self):
+        self._intervalos: Dict[Hashable, List[Intervalo]] = {}
+        # Versión por clave: permite descartar una carga que quedó vieja porque
+        # otro hilo modificó la clave mientras se consultaba la base.
+        self._versiones: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+
+    def esta_cargado(self, clave: Hashable) -> bool:
+        with self._lock:
+            return clave in self._intervalos
+
+    def version(self, clave: Hashable) -> int:
+        with self._lock:
+            return self._versiones.get(clave, 0)
+
+    def cargar(self, clave: Hashable, intervalos: Iterable[Intervalo], version: Optional[int] = None) -> bool:
+        """Carga los intervalos de una clave. Devuelve False si la carga quedó desactualizada."""
+        ordenados = sorted(intervalos, key=lambda e: e[0])
+        with self._lock:
+            if version is not None and self._versiones.get(clave, 0) != version:
+                return False
+            self._intervalos[clave] = ordenados
+            return True
+
+    def agregar(self, clave: Hashable, inicio: Any, fin: Any, id: Any) -> None:
+        with self._lock:
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+            entradas = self._intervalos.get(clave)
+            # Si la clave no está cargada se leerá completa de la base la próxima vez
+            if entradas is None or any(e[2] == id for e in entradas):
+                return
+            insort(entradas, (inicio, fin, id), key=lambda e: e[0])
+
+    def quitar(self, clave: Hashable, id: Any) -> None:
+        with self._lock:
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+            entradas = self._intervalos.get(clave)
+            if entradas is None:
+                return
+            self._intervalos[clave] = [e for e in entradas if e[2] != id]
+
+    def buscar_superposicion(self, clave: Hashable, inicio: Any, fin: Any, excluir_id: Any = None) -> Optional[Intervalo]:
+        """
+        Devuelve el intervalo de la clave que se superpone con [inicio, fin), o None.
+        Superposición = (inicio_existente < fin_nuevo) AND (fin_existente > inicio_nuevo)
+        """
+        with self._lock:
+            entradas = self._intervalos.get(clave, [])
+            # Todos los intervalos antes de 'i' empiezan antes de 'fin'
+            i = bisect_left(entradas, fin, key=lambda e: e[0])
+            for j in range(i - 1, -1, -1):
+                existente = entradas[j]
+                if existente[1] <= inicio:
+                    # Al no haber superposiciones entre existentes, los anteriores terminan antes
+                    break
+                if excluir_id is None or existente[2] != excluir_id:
+                    return existente
+            return None
+
+    def invalidar(self, clave: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if clave is None:
+                for k in self._intervalos:
+                    self._versiones[k] = self._versiones.get(k, 0) + 1
+                self._intervalos.clear()
+                return
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+            self._intervalos.pop(clave, None)
+
+
+def restar_intervalos(ventanas: Iterable[Tuple[Any, Any]], ocupados: Iterable[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+    """
+    Devuelve los tramos de 'ventanas' que no cubre ningún intervalo de 'ocupados'
+    (semiabiertos [inicio, fin)). Barrido lineal sobre ambas listas ordenadas por inicio:
+    O(n log n) por el ordenamiento y O(n) el barrido. Las ventanas contiguas o
+    superpuestas se unen antes de restar.
+    """
+    unidas: List[List[Any]] = []
+    for inicio, fin in sorted(ventanas, key=lambda v: v[0]):
+        if unidas and inicio <= unidas[-1][1]:
+            unidas[-1][1] = max(unidas[-1][1], fin)
+        else:
+            unidas.append([inicio, fin])
+
+    ocupados = sorted(ocupados, key=lambda o: o[0])
+    libres: List[Tuple[Any, Any]] = []
+    j = 0
+    for inicio, fin in unidas:
+        # Los ocupados que terminan antes de esta ventana no afectan a las siguientes
+        while j < len(ocupados) and ocupados[j][1] <= inicio:
+            j += 1
+        cursor = inicio
+        k = j
+        while k < len(ocupados) and ocupados[k][0] < fin:
+            if ocupados[k][0] > cursor:
+                libres.append((cursor, ocupados[k][0]))
+            cursor = max(cursor, ocupados[k][1])
+            k += 1
+        if cursor < fin:
+            libres.append((cursor, fin))
+    return libres
+
+
+def indices_superpuestos(nuevos: List[Tuple[Any, Any]], existentes: Iterable[Tuple[Any, Any]]) -> List[int]:
+    """
+    Posiciones de 'nuevos' que se superponen con algún intervalo de 'existentes' o con
+    un nuevo anterior. Ordena una vez y recorre ambas listas a la par (sin una consulta
+    ni una búsqueda por cada intervalo nuevo).
+    """
+    existentes = sorted(existentes, key=lambda e: e[0])
+    orden = sorted(range(len(nuevos)), key=lambda i: nuevos[i][0])
+    superpuestos = set()
+    j = 0
+    fin_anterior = None
+    for i in orden:
+        inicio, fin = nuevos[i]
+        # Existentes que terminan antes de este inicio ya no pueden superponerse con los siguientes
+        while j < len(existentes) and existentes[j][1] <= inicio:
+            j += 1
+        k = j
+        while k < len(existentes) and existentes[k][0] < fin:
+            if existentes[k][1] > inicio:
+                superpuestos.add(i)
+                break
+            k += 1
+        if fin_anterior is not None and inicio < fin_anterior:
+            superpuestos.add(i)
+        fin_anterior = fin if fin_anterior is None else max(fin_anterior, fin)
+    return sorted(superpuestos)
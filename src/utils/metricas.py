@@ -0,0 +1,238 @@
+import threading
+import time as reloj
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.utils.cache import cache_resultados
+
+# Routers que se distinguen en las métricas; el resto de las rutas se agrupa en "otros"
+# para que un barrido de URLs inexistentes no multiplique las series
+ROUTERS = ("clientes", "canchas", "reservas", "horarios", "torneos", "reportes", "disponibilidad", "dashboard", "cache")
+RUTA_METRICAS = "/metrics"
+
+BUCKETS_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_POOL = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(nombres: Sequence[str], valores: Sequence, extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class Metrica:
+    """
+    Métrica en memoria del proceso, expuesta en el formato de texto de Prometheus.
+    Los valores se guardan por combinación de etiquetas; cada actualización toma un lock
+    propio de la métrica y es O(1) (el histograma, O(log buckets)).
+    """
+
+    tipo = "untyped"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+        registro.append(self)
+
+    def _muestras(self) -> List[str]:
+        with self._lock:
+            valores = dict(self._valores)
+        return [f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {valor}" for clave, valor in sorted(valores.items())]
+
+    def exponer(self) -> List[str]:
+        return [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}", *self._muestras()]
+
+
+class Contador(Metrica):
+    tipo = "counter"
+
+    def inc(self, *etiquetas, cantidad: float = 1) -> None:
+        with self._lock:
+            self._valores[etiquetas] = self._valores.get(etiquetas, 0) + cantidad
+
+
+class Medidor(Metrica):
+    tipo = "gauge"
+
+    def inc(self, *etiquetas, cantidad: float = 1) -> None:
+        with self._lock:
+            self._valores[etiquetas] = self._valores.get(etiquetas, 0) + cantidad
+
+    def dec(self, *etiquetas, cantidad: float = 1) -> None:
+        self.inc(*etiquetas, cantidad=-cantidad)
+
+
+class Histograma(Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (), buckets: Sequence[float] = BUCKETS_HTTP):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(buckets)
+
+    def observar(self, valor: float, *etiquetas) -> None:
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            # [conteo por bucket (sin acumular; el último es +Inf), suma]
+            datos = self._valores.get(etiquetas)
+            if datos is None:
+                datos = self._valores[etiquetas] = [[0] * (len(self.buckets) + 1), 0.0]
+            datos[0][indice] += 1
+            datos[1] += valor
+
+    def _muestras(self) -> List[str]:
+        with self._lock:
+            valores = {clave: (list(conteos), suma) for clave, (conteos, suma) in self._valores.items()}
+        lineas = []
+        for clave, (conteos, suma) in sorted(valores.items()):
+            acumulado = 0
+            for limite, conteo in zip((*self.buckets, "+Inf"), conteos):
+                acumulado += conteo
+                le = f'le="{limite}"'
+                lineas.append(f"{self.nombre}_bucket{_etiquetas(self.etiquetas, clave, le)} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{_etiquetas(self.etiquetas, clave)} {suma}")
+            lineas.append(f"{self.nombre}_count{_etiquetas(self.etiquetas, clave)} {acumulado}")
+        return lineas
+
+
+class MetricaCalculada(Metrica):
+    """Métrica cuyo valor se lee al exponerla (p.ej. contadores que ya lleva otro objeto)."""
+
+    def __init__(self, nombre: str, ayuda: str, tipo: str, calcular: Callable[[], Dict[Tuple, float]],
+                 etiquetas: Sequence[str] = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.tipo = tipo
+        self.calcular = calcular
+
+    def _muestras(self) -> List[str]:
+        return [f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {valor}" for clave, valor in sorted(self.calcular().items())]
+
+
+registro: List[Metrica] = []
+
+
+def exponer_metricas() -> str:
+    return "\n".join(linea for metrica in registro for linea in metrica.exponer()) + "\n"
+
+
+# ===================== HTTP =====================
+
+pedidos_total = Contador("http_pedidos_total", "Pedidos HTTP atendidos", ("router", "stack", "metodo", "estado"))
+pedidos_duracion = Histograma("http_pedidos_duracion_segundos", "Duración de los pedidos HTTP", ("router", "stack"))
+pedidos_en_curso = Medidor("http_pedidos_en_curso", "Pedidos HTTP en curso", ("router", "stack"))
+conflictos_reserva = Contador(
+    "reservas_conflictos_total", "Altas o cambios de reservas rechazados por superposición (409)", ("ruta",)
+)
+
+
+def _router(path: str) -> Tuple[str, str]:
+    # /async/canchas/3 -> ("canchas", "async"); /canchas/3 -> ("canchas", "sync")
+    partes = path.strip("/").split("/")
+    stack = "sync"
+    if partes[0] == "async":
+        stack, partes = "async", partes[1:] or [""]
+    return (partes[0] if partes[0] in ROUTERS else "otros"), stack
+
+
+class MetricasHTTP:
+    """
+    Middleware ASGI que cuenta pedidos por router, método y código, mide su duración y
+    lleva los pedidos en curso. Los 409 de los routers de reservas se cuentan además como
+    conflictos de reserva, por ruta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == RUTA_METRICAS:
+            await self.app(scope, receive, send)
+            return
+
+        router, stack = _router(scope["path"])
+        estado = 500
+        inicio = reloj.perf_counter()
+        pedidos_en_curso.inc(router, stack)
+
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            pedidos_en_curso.dec(router, stack)
+            pedidos_duracion.observar(reloj.perf_counter() - inicio, router, stack)
+            pedidos_total.inc(router, stack, scope["method"], estado)
+            if estado == 409 and router == "reservas":
+                conflictos_reserva.inc(getattr(scope.get("route"), "path", scope["path"]))
+
+
+# ===================== POOL DE CONEXIONES =====================
+
+espera_pool = Histograma(
+    "db_pool_espera_segundos", "Espera por una conexión del pool (incluye abrir conexiones nuevas)",
+    ("engine",), buckets=BUCKETS_POOL,
+)
+_engines: Dict[str, object] = {}
+
+
+class _MedirEspera:
+    ETIQUETA = "sync"
+
+    def _do_get(self):
+        inicio = reloj.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            espera_pool.observar(reloj.perf_counter() - inicio, self.ETIQUETA)
+
+
+class QueuePoolMedido(_MedirEspera, QueuePool):
+    """QueuePool que registra cuánto espera cada checkout."""
+
+
+class AsyncQueuePoolMedido(_MedirEspera, AsyncAdaptedQueuePool):
+    """Equivalente de QueuePoolMedido para el engine async."""
+    ETIQUETA = "async"
+
+
+def registrar_engine(etiqueta: str, engine) -> None:
+    """Expone el estado del pool del engine (se lee engine.pool en cada scrape: sobrevive a dispose())."""
+    _engines[etiqueta] = engine
+
+
+def _estado_pools(metodo: str) -> Callable[[], Dict[Tuple, float]]:
+    def calcular():
+        # SingletonThreadPool/StaticPool (SQLite en memoria) no llevan estas cuentas
+        return {(etiqueta,): getattr(engine.pool, metodo)() for etiqueta, engine in list(_engines.items())
+                if hasattr(engine.pool, metodo)}
+    return calcular
+
+
+MetricaCalculada("db_pool_conexiones_en_uso", "Conexiones del pool prestadas", "gauge",
+                 _estado_pools("checkedout"), ("engine",))
+MetricaCalculada("db_pool_conexiones_libres", "Conexiones abiertas disponibles en el pool", "gauge",
+                 _estado_pools("checkedin"), ("engine",))
+
+
+# ===================== CACHE DE RESULTADOS =====================
+# Los contadores usan los totales desde el arranque: DELETE /cache/ no los vuelve a cero
+
+MetricaCalculada("cache_resultados_aciertos_total", "Lecturas servidas desde la cache de resultados", "counter",
+                 lambda: {(): cache_resultados.aciertos_totales})
+MetricaCalculada("cache_resultados_fallos_total", "Lecturas que tuvieron que consultar la base", "counter",
+                 lambda: {(): cache_resultados.fallos_totales})
+MetricaCalculada("cache_resultados_tasa_aciertos", "Aciertos / lecturas desde el arranque o la última limpieza",
+                 "gauge", lambda: {(): cache_resultados.aciertos / max(1, cache_resultados.aciertos + cache_resultados.fallos)})
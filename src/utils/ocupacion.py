@@ -0,0 +1,134 @@
+from collections import defaultdict
+from datetime import date, time
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import delete, extract, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from src.models.Ocupacion import OcupacionDiaria
+from src.models.Reserva import Reserva, SerieReserva, ExcepcionSerie
+from src.models.Horario import Horario
+from src.utils.series import ocurrencias
+
+# Minutos por día que se asumen para canchas sin horarios cargados (12 horas)
+MINUTOS_DIARIOS_DEFAULT = 12 * 60
+
+
+def minutos_sql(hora_inicio, hora_fin):
+    # Duración en minutos calculada en SQL (EXTRACT es portable: en SQLite se traduce a strftime)
+    return (
+        (extract('hour', hora_fin) * 60 + extract('minute', hora_fin))
+        - (extract('hour', hora_inicio) * 60 + extract('minute', hora_inicio))
+    )
+
+
+def minutos_entre(hora_inicio: time, hora_fin: time) -> int:
+    return (hora_fin.hour * 60 + hora_fin.minute) - (hora_inicio.hour * 60 + hora_inicio.minute)
+
+
+def minutos_diarios(cancha_id):
+    """Subconsulta escalar con los minutos habilitados por día de la cancha según sus horarios."""
+    return (
+        select(func.coalesce(func.sum(minutos_sql(Horario.hora_inicio, Horario.hora_fin)), MINUTOS_DIARIOS_DEFAULT))
+        .where(Horario.cancha_id == cancha_id, Horario.disponible == True)  # noqa: E712
+        .scalar_subquery()
+    )
+
+
+# Las funciones siguientes devuelven la sentencia sin ejecutarla, para que los servicios
+# sync y async la corran dentro de su propia transacción (junto con la reserva u horario).
+
+def sumar_reservas(dialecto: str, cancha_id: int, dia: date, minutos: int, cantidad: int = 1):
+    """Upsert que suma reservas a la fila (cancha_id, dia), creándola si no existe."""
+    return sumar_reservas_varias(dialecto, [(cancha_id, dia, minutos, cantidad)])
+
+
+def sumar_reservas_varias(dialecto: str, filas: List[Tuple[int, date, int, int]]):
+    """Igual que sumar_reservas para varias (cancha_id, dia, minutos, cantidad) en una sola sentencia."""
+    dialecto_insert = postgresql if dialecto == "postgresql" else sqlite
+    stmt = dialecto_insert.insert(OcupacionDiaria).values([
+        {
+            "cancha_id": cancha_id,
+            "fecha": dia,
+            "minutos_reservados": minutos,
+            "minutos_disponibles": minutos_diarios(cancha_id),
+            "cantidad_reservas": cantidad,
+        }
+        for cancha_id, dia, minutos, cantidad in filas
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=["cancha_id", "fecha"],
+        set_={
+            "minutos_reservados": OcupacionDiaria.minutos_reservados + stmt.excluded.minutos_reservados,
+            "cantidad_reservas": OcupacionDiaria.cantidad_reservas + stmt.excluded.cantidad_reservas,
+        }
+    )
+
+
+def restar_reservas(cancha_id: int, dia: date, minutos: int, cantidad: int = 1):
+    return restar_reservas_dias(cancha_id, [dia], minutos, cantidad)
+
+
+def restar_reservas_dias(cancha_id: int, dias: Iterable[date], minutos: int, cantidad: int = 1):
+    """Igual que restar_reservas en cada uno de los días de la cancha, en una sola sentencia."""
+    return (
+        update(OcupacionDiaria)
+        .where(OcupacionDiaria.cancha_id == cancha_id, OcupacionDiaria.fecha.in_(list(dias)))
+        .values(
+            minutos_reservados=OcupacionDiaria.minutos_reservados - minutos,
+            cantidad_reservas=OcupacionDiaria.cantidad_reservas - cantidad,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def actualizar_disponibles(*cancha_ids: int, desde: Optional[date] = None):
+    """
+    Recalcula los minutos disponibles de las canchas a partir de sus horarios actuales.
+    Solo desde 'desde' (por defecto hoy): los días pasados conservan los horarios que tenían.
+    """
+    return (
+        update(OcupacionDiaria)
+        .where(OcupacionDiaria.cancha_id.in_(cancha_ids), OcupacionDiaria.fecha >= (desde or date.today()))
+        .values(minutos_disponibles=minutos_diarios(OcupacionDiaria.cancha_id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconstruir_ocupacion(session: Session, estado_cancelada_id: Optional[int]) -> int:
+    """
+    Vuelve a generar toda la tabla desde las reservas existentes, con un único
+    INSERT ... SELECT agrupado. Devuelve la cantidad de filas generadas.
+    """
+    dia = func.date(Reserva.fecha)
+    origen = select(
+        Reserva.cancha_id,
+        dia,
+        func.sum(minutos_sql(Reserva.hora_inicio, Reserva.hora_fin)),
+        minutos_diarios(Reserva.cancha_id),
+        func.count(Reserva.id),
+    ).group_by(Reserva.cancha_id, dia)
+    if estado_cancelada_id:
+        origen = origen.where(Reserva.estado_reserva_id != estado_cancelada_id)
+
+    session.exec(delete(OcupacionDiaria))
+    session.exec(insert(OcupacionDiaria).from_select(
+        ["cancha_id", "fecha", "minutos_reservados", "minutos_disponibles", "cantidad_reservas"],
+        origen
+    ))
+
+    # Las series no tienen filas por ocurrencia: se expanden y se suman en un solo upsert.
+    # También las canceladas, cuyas ocurrencias jugadas siguen en el historial (al cancelarla
+    # fecha_hasta queda en el día anterior, así que no se suman las liberadas)
+    excepciones = defaultdict(set)
+    for serie_id, fecha in session.exec(select(ExcepcionSerie.serie_id, ExcepcionSerie.fecha)).all():
+        excepciones[serie_id].add(fecha)
+    filas = [
+        (serie.cancha_id, dia, minutos_entre(serie.hora_inicio, serie.hora_fin), 1)
+        for serie in session.exec(select(SerieReserva)).all()
+        for dia in ocurrencias(serie, excepciones=excepciones[serie.id])
+    ]
+    if filas:
+        session.exec(sumar_reservas_varias(session.get_bind().dialect.name, filas))
+    session.commit()
+    return session.exec(select(func.count()).select_from(OcupacionDiaria)).one()
@@ -0,0 +1,36 @@
+from fastapi import Query, Response
+from typing import Optional, Sequence
+
+LIMITE_DEFAULT = 100
+LIMITE_MAXIMO = 1000
+
+# Header con el after_id a usar para pedir la página siguiente (ausente en la última)
+HEADER_CURSOR = "X-Siguiente-Cursor"
+
+
+class Paginacion:
+    """
+    Paginación por cursor (keyset) sobre la PK: WHERE id > after_id ORDER BY id LIMIT limit.
+    A diferencia de OFFSET, el costo no crece con el número de página.
+    """
+
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(None, ge=0, description="Devuelve los registros con id mayor a este"),
+        limit: int = Query(LIMITE_DEFAULT, ge=1, le=LIMITE_MAXIMO, description="Cantidad máxima de registros"),
+    ):
+        self.after_id = after_id
+        self.limit = limit
+
+    def aplicar(self, query, modelo):
+        if self.after_id is not None:
+            query = query.where(modelo.id > self.after_id)
+        return query.order_by(modelo.id).limit(self.limit)
+
+    def clave(self):
+        # Para las claves de cache de los listados paginados
+        return (self.after_id, self.limit)
+
+    def agregar_cursor(self, response: Response, items: Sequence) -> None:
+        if len(items) == self.limit:
+            response.headers[HEADER_CURSOR] = str(items[-1].id)
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import time as reloj
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+# Consultas que superen este tiempo se registran en el log "sql_lento"
+SQL_UMBRAL_LENTO_MS = float(os.getenv("SQL_UMBRAL_LENTO_MS", "100"))
+# Pedidos que ejecuten más consultas que esto se registran (suele indicar un N+1); 0 = nunca
+SQL_CONSULTAS_ALERTA = int(os.getenv("SQL_CONSULTAS_ALERTA", "50"))
+# Largo máximo del SQL en el log
+SQL_LARGO_LOG = 1000
+
+log_sql = logging.getLogger("sql_lento")
+
+
+class PerfilPedido:
+    """Consultas y tiempo de base acumulados durante un pedido HTTP."""
+
+    __slots__ = ("scope", "consultas", "tiempo_db")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.consultas = 0
+        self.tiempo_db = 0.0
+
+    @property
+    def ruta(self) -> Optional[str]:
+        # El router deja la ruta resuelta en el scope: se usa el patrón (/reservas/{reserva_id})
+        # para poder agrupar, y el path literal si el pedido no llegó a ninguna ruta
+        ruta = self.scope.get("route")
+        return getattr(ruta, "path", None) or self.scope.get("path")
+
+
+_perfil: ContextVar[Optional[PerfilPedido]] = ContextVar("perfil_pedido", default=None)
+
+
+def _registrar(evento: str, **datos) -> None:
+    # Una línea JSON por evento, fácil de filtrar y agregar en producción
+    log_sql.warning(json.dumps({"evento": evento, **datos}, ensure_ascii=False, default=str))
+
+
+# ===================== EVENTOS DEL ENGINE =====================
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consultas", []).append(reloj.perf_counter())
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    duracion = reloj.perf_counter() - conn.info["inicio_consultas"].pop()
+    perfil = _perfil.get()
+    if perfil is not None:
+        perfil.consultas += 1
+        perfil.tiempo_db += duracion
+
+    if duracion * 1000 >= SQL_UMBRAL_LENTO_MS:
+        _registrar(
+            "consulta_lenta",
+            duracion_ms=round(duracion * 1000, 2),
+            metodo=perfil.scope.get("method") if perfil else None,
+            ruta=perfil.ruta if perfil else None,
+            consulta_numero=perfil.consultas if perfil else None,
+            executemany=executemany,
+            sql=" ".join(statement.split())[:SQL_LARGO_LOG],
+        )
+
+
+def _error(contexto):
+    # Una consulta que falla no llega a after_cursor_execute: se descarta su inicio
+    if contexto.connection is not None and contexto.connection.info.get("inicio_consultas"):
+        contexto.connection.info["inicio_consultas"].pop()
+
+
+def instrumentar_engine(engine) -> None:
+    """Mide cada consulta del engine (para un AsyncEngine, pasar engine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
+    event.listen(engine, "handle_error", _error)
+
+
+# ===================== MIDDLEWARE =====================
+
+class PerfiladoSQL:
+    """
+    Middleware ASGI que cuenta las consultas y el tiempo de base de cada pedido y los devuelve
+    en el header Server-Timing (visible en la pestaña de red del navegador):
+
+        Server-Timing: db;dur=12.4;desc="7 consultas", app;dur=20.1
+
+    El perfil viaja en una ContextVar, que llega tanto a los endpoints async como a los
+    sincrónicos (el threadpool copia el contexto). Los pedidos con más de SQL_CONSULTAS_ALERTA
+    consultas se registran en el log "sql_lento" junto con la ruta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        perfil = PerfilPedido(scope)
+        token = _perfil.set(perfil)
+        inicio = reloj.perf_counter()
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                total = (reloj.perf_counter() - inicio) * 1000
+                server_timing = (
+                    f'db;dur={perfil.tiempo_db * 1000:.1f};desc="{perfil.consultas} consultas", '
+                    f"app;dur={total:.1f}"
+                )
+                # Lista nueva: la de Starlette es la misma que guarda el objeto Response
+                mensaje["headers"] = [*mensaje.get("headers", []), (b"server-timing", server_timing.encode("latin-1"))]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _perfil.reset(token)
+            if SQL_CONSULTAS_ALERTA and perfil.consultas > SQL_CONSULTAS_ALERTA:
+                _registrar(
+                    "muchas_consultas",
+                    consultas=perfil.consultas,
+                    tiempo_db_ms=round(perfil.tiempo_db * 1000, 2),
+                    metodo=scope.get("method"),
+                    ruta=perfil.ruta,
+                )
@@ -0,0 +1,33 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class RespuestaJSON:
+    """
+    Serializa directamente a bytes con el TypeAdapter del tipo de respuesta. Los servicios
+    ya devuelven modelos validados (model_validate): devolviendo un Response, FastAPI no los
+    vuelve a validar ni los pasa por jsonable_encoder, y pydantic-core escribe el JSON sin
+    armar dicts intermedios. Pensado para listados grandes:
+
+        respuesta_clientes = RespuestaJSON(List[ClienteResponse])
+
+        @router.get("/", response_model=List[ClienteResponse])
+        def listar(response: Response, ...) -> Response:
+            return respuesta_clientes(clientes, response)
+
+    Los headers que las dependencias o el endpoint dejaron en el Response inyectado (ETag,
+    X-Siguiente-Cursor de la paginación...) se copian a la respuesta, como haría FastAPI.
+    """
+
+    def __init__(self, tipo: Any):
+        self.adapter = TypeAdapter(tipo)
+
+    def __call__(self, datos: Any, response: Optional[Response] = None) -> Response:
+        respuesta = Response(self.adapter.dump_json(datos), media_type="application/json")
+        if response is not None:
+            respuesta.raw_headers.extend(
+                (clave, valor) for clave, valor in response.raw_headers if clave != b"content-length"
+            )
+        return respuesta
@@ -0,0 +1,121 @@
+from datetime import date, time, timedelta
+from math import gcd
+from typing import AbstractSet, Iterator, Optional
+from sqlmodel import select, exists
+
+from src.models.Reserva import SerieReserva, ExcepcionSerie
+
+
+def _periodo(serie: SerieReserva) -> int:
+    return 7 * serie.intervalo_semanas
+
+
+def es_ocurrencia(serie: SerieReserva, dia: date, excepciones: AbstractSet[date] = frozenset()) -> bool:
+    """True si la serie se juega ese día (sin expandirla)."""
+    return (
+        serie.fecha_desde <= dia <= serie.fecha_hasta
+        and (dia - serie.fecha_desde).days % _periodo(serie) == 0
+        and dia not in excepciones
+    )
+
+
+def ocurrencias(serie: SerieReserva, desde: Optional[date] = None, hasta: Optional[date] = None,
+                excepciones: AbstractSet[date] = frozenset()) -> Iterator[date]:
+    """Genera perezosamente las fechas de la serie dentro de [desde, hasta]."""
+    periodo = _periodo(serie)
+    inicio = max(desde or serie.fecha_desde, serie.fecha_desde)
+    fin = min(hasta or serie.fecha_hasta, serie.fecha_hasta)
+    # Primera ocurrencia >= inicio, calculada sin recorrer las anteriores
+    saltos = -(-(inicio - serie.fecha_desde).days // periodo)
+    dia = serie.fecha_desde + timedelta(days=saltos * periodo)
+    while dia <= fin:
+        if dia not in excepciones:
+            yield dia
+        dia += timedelta(days=periodo)
+
+
+def primera_coincidencia(a: SerieReserva, b: SerieReserva,
+                         excepciones_a: AbstractSet[date] = frozenset(),
+                         excepciones_b: AbstractSet[date] = frozenset()) -> Optional[date]:
+    """
+    Primer día en que se juegan las dos series, o None. Se resuelve de forma analítica:
+    los días en común forman una progresión con paso mcm(periodo_a, periodo_b), así que
+    solo se recorren las coincidencias y no cada ocurrencia.
+    No compara horarios: eso lo hace quien llama.
+    """
+    if a.dia_semana != b.dia_semana:
+        return None
+    periodo_a, periodo_b = _periodo(a), _periodo(b)
+    paso = periodo_a * periodo_b // gcd(periodo_a, periodo_b)
+    fin = min(a.fecha_hasta, b.fecha_hasta)
+
+    # Primera ocurrencia común: se prueban a lo sumo paso/periodo_a ocurrencias de 'a'
+    primera = None
+    for dia in ocurrencias(a, max(a.fecha_desde, b.fecha_desde), fin):
+        if (dia - b.fecha_desde).days % periodo_b == 0:
+            primera = dia
+            break
+        if (dia - max(a.fecha_desde, b.fecha_desde)).days >= paso:
+            break
+    if primera is None:
+        return None
+
+    dia = primera
+    while dia <= fin:
+        if dia not in excepciones_a and dia not in excepciones_b:
+            return dia
+        dia += timedelta(days=paso)
+    return None
+
+
+def consulta_series_dia(cancha_id: int, dia: date, hora_inicio: Optional[time] = None,
+                        hora_fin: Optional[time] = None):
+    """
+    Series activas de la cancha que podrían jugarse ese día (mismo día de la semana,
+    dentro de su rango y sin excepción para la fecha). El intervalo de semanas se
+    verifica después con es_ocurrencia(). Con hora_inicio/hora_fin solo trae las que
+    se superponen con esa franja.
+    """
+    query = select(SerieReserva).where(
+        SerieReserva.cancha_id == cancha_id,
+        SerieReserva.activa == True,  # noqa: E712
+        SerieReserva.dia_semana == dia.weekday(),
+        SerieReserva.fecha_desde <= dia,
+        SerieReserva.fecha_hasta >= dia,
+        ~exists().where(ExcepcionSerie.serie_id == SerieReserva.id, ExcepcionSerie.fecha == dia),
+    )
+    if hora_inicio is not None and hora_fin is not None:
+        query = query.where(SerieReserva.hora_inicio < hora_fin, SerieReserva.hora_fin > hora_inicio)
+    return query
+
+
+def consulta_series_rango(cancha_ids, desde: date, hasta: date):
+    """Series activas de las canchas que se cruzan con [desde, hasta] (para expandirlas en memoria)."""
+    return select(SerieReserva).where(
+        SerieReserva.cancha_id.in_(cancha_ids),
+        SerieReserva.activa == True,  # noqa: E712
+        SerieReserva.fecha_desde <= hasta,
+        SerieReserva.fecha_hasta >= desde,
+    )
+
+
+def consulta_series_filtros(desde: Optional[date], hasta: Optional[date],
+                            cancha_id: Optional[int] = None, cliente_id: Optional[int] = None):
+    """
+    Series (activas o no) que se cruzan con [desde, hasta], para listar sus ocurrencias.
+    Una serie cancelada conserva solo las ocurrencias ya jugadas (ver SeriesService.cancelar_serie).
+    """
+    query = select(SerieReserva).order_by(SerieReserva.id)
+    if desde is not None:
+        query = query.where(SerieReserva.fecha_hasta >= desde)
+    if hasta is not None:
+        query = query.where(SerieReserva.fecha_desde <= hasta)
+    if cancha_id is not None:
+        query = query.where(SerieReserva.cancha_id == cancha_id)
+    if cliente_id is not None:
+        query = query.where(SerieReserva.cliente_id == cliente_id)
+    return query
+
+
+def consulta_excepciones(serie_ids):
+    return select(ExcepcionSerie.serie_id, ExcepcionSerie.fecha).where(ExcepcionSerie.serie_id.in_(serie_ids))
@@ -0,0 +1,198 @@
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.models.VersionTabla import VersionTabla
+
+# Cache-Control de las respuestas con ETag si el router no indica otro:
+# el cliente puede guardar la respuesta pero debe revalidarla (If-None-Match) en cada uso
+CACHE_CONTROL_DEFAULT = os.getenv("HTTP_CACHE_CONTROL", "private, no-cache")
+
+
+# Tablas que escribe cada alta de reserva: no llevan fila de versión, para no serializar
+# todas las altas sobre una misma fila (en PostgreSQL el semáforo bloquea solo la cancha y
+# el día). Ninguna respuesta con ETag puede depender de ellas.
+TABLAS_SIN_VERSION = {"reserva", "reserva_servicio", "semaforo_cancha", "ocupacion_diaria", VersionTabla.__tablename__}
+
+# Last-Modified de una tabla que todavía no tiene fila de versión
+SIN_MODIFICACIONES = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _ahora() -> datetime:
+    # Last-Modified tiene resolución de segundos; se guarda sin zona (UTC)
+    return datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
+
+
+def _upsert(dialecto: str):
+    return (postgresql if dialecto == "postgresql" else sqlite).insert(VersionTabla)
+
+
+class VersionesTablas:
+    """
+    Versión y fecha de última modificación por tabla, guardadas en la tabla version_tabla.
+    Cada commit que escribe en una tabla incrementa su fila en la misma transacción (ver los
+    eventos al final): todas las instancias de la API calculan el mismo ETag, sobreviven a
+    un reinicio y ninguna ve la versión nueva antes de que el commit sea visible.
+    Leerlas es una consulta por clave primaria. Las usan el ETag de CacheHTTP y la clave de
+    la cache de resultados (src/utils/cache.py).
+    """
+
+    def __init__(self):
+        self._engine = None
+
+    def usar_engine(self, engine) -> None:
+        """Engine del que se leen las versiones (lo registra database.py al crearlo)."""
+        self._engine = engine
+
+    def inicializar(self, tablas: Iterable[str]) -> None:
+        """Crea las filas que falten, con versión 0 y fecha actual (la de los datos previos es desconocida)."""
+        filas = [{"tabla": t, "version": 0, "modificada": _ahora()} for t in tablas if t not in TABLAS_SIN_VERSION]
+        if not filas:
+            return
+        with self._engine.begin() as conn:
+            conn.execute(_upsert(conn.dialect.name).values(filas).on_conflict_do_nothing(index_elements=["tabla"]))
+
+    def incrementar(self, conn, tablas: Iterable[str]) -> None:
+        """Incrementa las versiones con la conexión (y la transacción) de la sesión que confirma."""
+        filas = [{"tabla": t, "version": 1, "modificada": _ahora()} for t in sorted(set(tablas) - TABLAS_SIN_VERSION)]
+        if not filas:
+            return
+        stmt = _upsert(conn.dialect.name).values(filas)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=["tabla"],
+            set_={"version": VersionTabla.version + 1, "modificada": stmt.excluded.modificada}
+        ))
+
+    def _leer(self, tablas: Iterable[str]) -> Dict[str, Tuple[int, datetime]]:
+        with self._engine.connect() as conn:
+            return {
+                tabla: (version, modificada.replace(tzinfo=timezone.utc))
+                for tabla, version, modificada in conn.execute(
+                    select(VersionTabla.tabla, VersionTabla.version, VersionTabla.modificada)
+                    .where(VersionTabla.tabla.in_(tablas))
+                )
+            }
+
+    def numeros(self, *tablas: str) -> Tuple[int, ...]:
+        """Versión actual de cada tabla, en el mismo orden (0 si todavía no tiene fila)."""
+        filas = self._leer(tablas)
+        return tuple(filas.get(t, (0,))[0] for t in tablas)
+
+    def estado(self, *tablas: str) -> Tuple[str, datetime]:
+        """ETag y Last-Modified de una respuesta que depende de las tablas indicadas."""
+        filas = self._leer(tablas)
+        etag = "-".join(str(filas.get(t, (0,))[0]) for t in tablas)
+        ultima_modificacion = max([SIN_MODIFICACIONES] + [modificada for _, modificada in filas.values()])
+        return f'W/"{etag}"', ultima_modificacion
+
+
+versiones = VersionesTablas()
+
+
+def _coincide_etag(if_none_match: str, etag: str) -> bool:
+    # Comparación débil (RFC 9110): se ignora el prefijo W/
+    etiquetas = [e.strip() for e in if_none_match.split(",")]
+    return "*" in etiquetas or etag.removeprefix("W/") in [e.removeprefix("W/") for e in etiquetas]
+
+
+def _no_modificado_desde(if_modified_since: str, ultima_modificacion: datetime) -> bool:
+    try:
+        fecha = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return ultima_modificacion <= fecha
+
+
+class CacheHTTP:
+    """
+    Dependencia de router para GET condicional. Con los modelos de los que depende la
+    respuesta agrega ETag, Last-Modified y Cache-Control; si el cliente ya tiene la versión
+    actual (If-None-Match o, sin él, If-Modified-Since) corta con 304 antes de que el
+    endpoint abra la sesión. Los métodos que no son GET/HEAD pasan sin cambios.
+
+        router = APIRouter(dependencies=[Depends(CacheHTTP(Cancha, TipoCancha, cache_control="max-age=60"))])
+    """
+
+    def __init__(self, *modelos, cache_control: Optional[str] = None):
+        self.tablas = tuple(m.__tablename__ for m in modelos)
+        sin_version = TABLAS_SIN_VERSION.intersection(self.tablas)
+        if sin_version:
+            raise ValueError(f"Las tablas {sorted(sin_version)} no llevan versión: no pueden usarse para el ETag")
+        self.cache_control = cache_control or CACHE_CONTROL_DEFAULT
+
+    def __call__(self, request: Request, response: Response) -> None:
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        etag, ultima_modificacion = versiones.estado(*self.tablas)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(ultima_modificacion, usegmt=True),
+            "Cache-Control": self.cache_control,
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if (if_none_match and _coincide_etag(if_none_match, etag)) or (
+            not if_none_match and if_modified_since and _no_modificado_desde(if_modified_since, ultima_modificacion)
+        ):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
+
+# ===================== EVENTOS =====================
+# Las tablas escritas se acumulan en session.info durante la transacción (flush de objetos
+# o sentencias INSERT/UPDATE/DELETE ejecutadas con la sesión). Antes de confirmar se
+# incrementan sus versiones en la misma transacción; al terminar (commit o rollback) se
+# descartan. Se escucha la clase Session, así que cubre también la sesión interna de AsyncSession.
+
+_CLAVE = "tablas_modificadas"
+
+
+def _registrar(session: Session, tablas) -> None:
+    session.info.setdefault(_CLAVE, set()).update(tablas)
+
+
+def _tablas_flush(session, flush_context):
+    tablas = set()
+    for objeto in (*session.new, *session.dirty, *session.deleted):
+        tabla = getattr(type(objeto), "__table__", None)
+        if tabla is not None:
+            tablas.add(tabla.name)
+    _registrar(session, tablas)
+
+
+def _tablas_sentencia(estado):
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        tabla = getattr(estado.statement, "table", None)
+        if tabla is not None:
+            _registrar(estado.session, {tabla.name})
+
+
+def _antes_de_confirmar(session):
+    # El commit hace su flush después de este evento: se adelanta para conocer todas las tablas
+    session.flush()
+    tablas = session.info.get(_CLAVE)
+    if tablas:
+        # Con la conexión de la sesión (no pasa por do_orm_execute: version_tabla no se registra)
+        versiones.incrementar(session.connection(), tablas)
+
+
+def _descartar(session, *args):
+    session.info.pop(_CLAVE, None)
+
+
+event.listen(Session, "after_flush", _tablas_flush)
+event.listen(Session, "do_orm_execute", _tablas_sentencia)
+event.listen(Session, "before_commit", _antes_de_confirmar)
+event.listen(Session, "after_commit", _descartar)
+event.listen(Session, "after_rollback", _descartar)
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+from datetime import time
+from pathlib import Path
+
+import pytest
+
+# Base propia para los tests: database.py lee DATABASE_URL al importarse
+DIRECTORIO = tempfile.mkdtemp(prefix="tpi-dao-tests-")
+BASE_TESTS = os.path.join(DIRECTORIO, "tests.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BASE_TESTS}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("CACHE_REDIS_URL", None)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+import database  # noqa: E402
+import main  # noqa: E402
+from src.models.Busquedas import Servicio  # noqa: E402
+from src.models.Cancha import Cancha, TipoCancha, TipoDeCancha  # noqa: E402
+from src.models.Cliente import Cliente  # noqa: E402
+from src.models.Horario import Horario  # noqa: E402
+from src.models.Pago import EstadoPago  # noqa: E402
+from src.models.Reserva import EstadoReserva  # noqa: E402
+
+CANTIDAD_CANCHAS = 4
+
+
+def _cargar_datos():
+    database.init_db()
+    with Session(database.engine) as session:
+        session.add_all([EstadoReserva(nombre=e) for e in EstadoReserva.model_fields["nombre"].annotation])
+        session.add_all([EstadoPago(nombre=e) for e in EstadoPago.model_fields["nombre"].annotation])
+        session.add(TipoCancha(nombre=TipoDeCancha.FUTBOL, descripcion="Fútbol 5"))
+        session.commit()
+        session.add_all([
+            Cliente(nombre="Juan", apellido="Pérez", email="juan@example.com", telefono="123456789"),
+            Cliente(nombre="María", apellido="Gómez", email="maria@example.com", telefono="987654321"),
+        ])
+        session.add_all([Cancha(nombre=f"Cancha {i}", tipo_cancha_id=1) for i in range(1, CANTIDAD_CANCHAS + 1)])
+        session.add_all([Servicio(nombre="Luz", costo=100), Servicio(nombre="Pelota", costo=50)])
+        session.commit()
+        session.add_all([
+            Horario(cancha_id=cancha_id, hora_inicio=time(hora), hora_fin=time(hora + 1))
+            for cancha_id in range(1, CANTIDAD_CANCHAS + 1) for hora in range(8, 23)
+        ])
+        session.commit()
+
+
+@pytest.fixture(scope="session")
+def cliente():
+    """TestClient sobre una base temporal con catálogos, 2 clientes, canchas, servicios y horarios."""
+    _cargar_datos()
+    with TestClient(main.app) as cliente:
+        yield cliente
@@ -0,0 +1,39 @@
+import multiprocessing
+
+from sqlmodel import Session
+
+import database
+from src.models.Cliente import Cliente
+
+
+def _alta_en_otro_proceso(email: str):
+    # Otra instancia de la API: comparte solo la base
+    with Session(database.engine) as session:
+        session.add(Cliente(nombre="Otra", apellido="Instancia", email=email, telefono="555"))
+        session.commit()
+
+
+def test_etag_refleja_escrituras_de_otra_instancia(cliente):
+    r = cliente.get("/clientes/")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert cliente.get("/clientes/", headers={"If-None-Match": etag}).status_code == 304
+
+    proceso = multiprocessing.get_context("spawn").Process(target=_alta_en_otro_proceso, args=("otra@example.com",))
+    proceso.start()
+    proceso.join(timeout=60)
+    assert proceso.exitcode == 0
+
+    r = cliente.get("/clientes/", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert any(c["email"] == "otra@example.com" for c in r.json())
+
+
+def test_etag_no_cambia_con_un_rollback(cliente):
+    etag = cliente.get("/clientes/").headers["etag"]
+    with Session(database.engine) as session:
+        session.add(Cliente(nombre="Sin", apellido="Confirmar", email="rollback@example.com", telefono="1"))
+        session.flush()
+        session.rollback()
+    assert cliente.get("/clientes/", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,57 @@
+import multiprocessing
+
+from sqlmodel import Session, select
+
+import database
+from src.models.Cancha import Cancha
+
+
+def _renombrar_en_otro_proceso(cancha_id: int, nombre: str):
+    # Otra instancia de la API: comparte solo la base, no la cache en memoria
+    with Session(database.engine) as session:
+        cancha = session.get(Cancha, cancha_id)
+        cancha.nombre = nombre
+        session.add(cancha)
+        session.commit()
+
+
+def test_cache_no_sirve_resultados_viejos_tras_escritura_de_otra_instancia(cliente):
+    with Session(database.engine) as session:
+        cancha_id = session.exec(select(Cancha.id).order_by(Cancha.id)).first()
+
+    for ruta in ("/canchas/", "/async/canchas/"):
+        # Dos lecturas: la segunda sale de la cache
+        cliente.get(ruta)
+        etag = cliente.get(ruta).headers["etag"]
+
+        nombre = f"Renombrada {ruta}"
+        proceso = multiprocessing.get_context("spawn").Process(
+            target=_renombrar_en_otro_proceso, args=(cancha_id, nombre)
+        )
+        proceso.start()
+        proceso.join(timeout=60)
+        assert proceso.exitcode == 0
+
+        r = cliente.get(ruta, headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["etag"] != etag
+        assert any(c["id"] == cancha_id and c["nombre"] == nombre for c in r.json())
+
+
+def _metricas_cache(cliente) -> dict:
+    return {
+        nombre: float(valor)
+        for nombre, valor in (l.split() for l in cliente.get("/metrics").text.splitlines()
+                              if l.startswith("cache_resultados_") and l.split()[0].endswith("_total"))
+    }
+
+
+def test_limpiar_la_cache_no_reinicia_los_contadores_de_metrics(cliente):
+    cliente.get("/canchas/")
+    cliente.get("/canchas/")
+    antes = _metricas_cache(cliente)
+    assert antes["cache_resultados_aciertos_total"] >= 1
+
+    assert cliente.delete("/cache/").status_code in (200, 204)
+    assert cliente.get("/cache/estadisticas").json()["aciertos"] == 0
+    assert _metricas_cache(cliente) == antes
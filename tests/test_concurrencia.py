@@ -0,0 +1,73 @@
+import multiprocessing
+from datetime import date, datetime, time, timedelta
+
+from sqlmodel import Session, select
+
+import database
+from src.models.Reserva import Reserva
+from src.utils.catalogos import catalogos
+
+PROCESOS = 6
+
+
+def _reservar_en_proceso(barrera, resultados, reserva: dict):
+    # Proceso aparte: engine, pool y candados propios, como otro worker
+    from fastapi.testclient import TestClient
+
+    import main
+
+    cliente = TestClient(main.app)
+    barrera.wait()
+    respuesta = cliente.post("/reservas/", json=reserva)
+    resultados.put(respuesta.status_code)
+
+
+def _reserva(cliente_id: int, dia: date, cancha_id: int = 2) -> dict:
+    return {
+        "cliente_id": cliente_id,
+        "cancha_id": cancha_id,
+        "fecha": f"{dia}T00:00:00",
+        "hora_inicio": "20:00:00",
+        "hora_fin": "21:30:00",
+    }
+
+
+def test_altas_simultaneas_en_varios_procesos_aceptan_una_sola(cliente):
+    dia = date.today() + timedelta(days=90)
+    contexto = multiprocessing.get_context("spawn")
+    barrera = contexto.Barrier(PROCESOS)
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=_reservar_en_proceso, args=(barrera, resultados, _reserva(i % 2 + 1, dia)))
+        for i in range(PROCESOS)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    codigos = sorted(resultados.get(timeout=60) for _ in procesos)
+    for proceso in procesos:
+        proceso.join(timeout=60)
+
+    assert codigos == [200] + [409] * (PROCESOS - 1)
+    with Session(database.engine) as session:
+        reservas = session.exec(select(Reserva).where(
+            Reserva.cancha_id == 2,
+            Reserva.fecha == datetime.combine(dia, time.min),
+        )).all()
+    assert len(reservas) == 1
+
+
+def test_cancelacion_de_otro_worker_libera_el_horario(cliente):
+    dia = date.today() + timedelta(days=91)
+    r = cliente.post("/reservas/", json=_reserva(1, dia))
+    assert r.status_code == 200, r.text
+    assert cliente.post("/reservas/", json=_reserva(2, dia)).status_code == 409
+
+    # Otro worker cancela la reserva sin pasar por este proceso
+    with Session(database.engine) as session:
+        reserva = session.get(Reserva, r.json()["id"])
+        reserva.estado_reserva_id = catalogos.estado_reserva_id(session, "Cancelada")
+        session.commit()
+
+    r = cliente.post("/reservas/", json=_reserva(2, dia))
+    assert r.status_code == 200, r.text
+    assert r.json()["cliente_id"] == 2
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import date, timedelta
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import database
+from src.service.Reserva import ReservasService, ReservasServiceAsync
+from src.utils.consultas import contar_consultas
+
+# joinedload de las relaciones muchos-a-uno + selectinload de los servicios
+CONSULTAS_LISTADO = 2
+
+
+def _reservar(cliente, cantidad: int, desde_dias: int):
+    inicio = date.today() + timedelta(days=desde_dias)
+    for i in range(cantidad):
+        r = cliente.post("/reservas/", json={
+            "cliente_id": i % 2 + 1,
+            "cancha_id": 1,
+            "fecha": f"{inicio + timedelta(days=i)}T00:00:00",
+            "hora_inicio": "18:00:00",
+            "hora_fin": "19:00:00",
+            "servicios_ids": [1, 2] if i % 2 else [1],
+        })
+        assert r.status_code == 200, r.text
+
+
+def test_listado_de_reservas_hace_consultas_acotadas(cliente):
+    _reservar(cliente, 6, desde_dias=30)
+
+    with Session(database.engine) as session:
+        service = ReservasService(session)
+        with contar_consultas(database.engine) as contador:
+            reservas = service.get_reservas()
+
+    assert len(reservas) >= 6
+    assert all(r.cliente and r.cancha and r.estado_reserva for r in reservas)
+    assert any(len(r.servicios) == 2 for r in reservas)
+    assert contador.cantidad <= CONSULTAS_LISTADO, contador.sentencias
+
+
+def test_listado_async_de_reservas_hace_consultas_acotadas(cliente):
+    _reservar(cliente, 4, desde_dias=60)
+
+    async def listar():
+        engine = database.get_async_engine()
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            service = ReservasServiceAsync(session)
+            with contar_consultas(engine) as contador:
+                reservas = await service.get_reservas()
+        return reservas, contador
+
+    reservas, contador = asyncio.run(listar())
+    assert len(reservas) >= 4
+    assert any(len(r.servicios) == 2 for r in reservas)
+    assert contador.cantidad <= CONSULTAS_LISTADO, contador.sentencias
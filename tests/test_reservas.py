@@ -0,0 +1,18 @@
+from datetime import date, timedelta
+
+
+def test_alta_rechaza_horario_invertido(cliente):
+    reserva = {
+        "cliente_id": 1,
+        "cancha_id": 1,
+        "fecha": f"{date.today() + timedelta(days=120)}T00:00:00",
+        "hora_inicio": "21:00:00",
+        "hora_fin": "20:00:00",
+    }
+    for ruta in ("/reservas/", "/async/reservas/"):
+        r = cliente.post(ruta, json=reserva)
+        assert r.status_code == 400
+        assert r.json()["detail"] == "hora_inicio debe ser anterior a hora_fin."
+
+    r = cliente.post("/reservas/", json={**reserva, "hora_fin": "21:00:00"})
+    assert r.status_code == 400
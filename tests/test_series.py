@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from sqlmodel import Session, select
+
+import database
+from src.models.Ocupacion import OcupacionDiaria
+
+
+def _crear_serie(cliente, cancha_id: int, desde: date, semanas: int) -> dict:
+    r = cliente.post("/reservas/series", json={
+        "cliente_id": 1,
+        "cancha_id": cancha_id,
+        "fecha_desde": str(desde),
+        "fecha_hasta": str(desde + timedelta(weeks=semanas - 1)),
+        "hora_inicio": "19:00:00",
+        "hora_fin": "20:00:00",
+    })
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_cancelar_serie_empezada_la_desactiva(cliente):
+    hoy = date.today()
+    serie = _crear_serie(cliente, 3, hoy - timedelta(weeks=2), semanas=8)
+
+    r = cliente.put(f"/reservas/series/{serie['id']}/cancelar")
+    assert r.status_code == 200, r.text
+    assert r.json()["activa"] is False
+    assert r.json()["fecha_hasta"] == str(hoy - timedelta(days=1))
+
+    assert cliente.put(f"/reservas/series/{serie['id']}/cancelar").status_code == 400
+
+    # Las ocurrencias jugadas siguen en el historial; las futuras se liberaron
+    r = cliente.get("/reservas/series/ocurrencias", params={
+        "fecha_desde": str(hoy - timedelta(weeks=3)), "fecha_hasta": str(hoy + timedelta(weeks=8)), "cancha_id": 3,
+    })
+    assert [o["fecha"] for o in r.json()] == [str(hoy - timedelta(weeks=2)), str(hoy - timedelta(weeks=1))]
+    r = cliente.post("/reservas/", json={
+        "cliente_id": 2, "cancha_id": 3, "fecha": f"{hoy + timedelta(weeks=1)}T00:00:00",
+        "hora_inicio": "19:00:00", "hora_fin": "20:00:00",
+    })
+    assert r.status_code == 200, r.text
+
+
+def test_listado_de_reservas_incluye_ocurrencias_de_series(cliente):
+    desde = date.today() + timedelta(days=200)
+    serie = _crear_serie(cliente, 4, desde, semanas=4)
+    parametros = {"fecha_desde": str(desde), "fecha_hasta": str(desde + timedelta(weeks=2)), "cancha_id": 4}
+
+    listado = cliente.get("/reservas/", params=parametros).json()
+    ocurrencias = [item for item in listado if item.get("serie_id") == serie["id"]]
+    assert [o["fecha"] for o in ocurrencias] == [str(desde + timedelta(weeks=i)) for i in range(3)]
+    assert cliente.get("/async/reservas/", params=parametros).json() == listado
+
+    # Se omiten al filtrar por estado, al pedirlo, y en las páginas siguientes
+    assert not cliente.get("/reservas/", params={**parametros, "estado": "Pendiente"}).json()
+    assert not cliente.get("/reservas/", params={**parametros, "incluir_series": False}).json()
+    assert not cliente.get("/reservas/", params={**parametros, "after_id": 0}).json()
+
+
+def _ocupacion(cancha_id: int) -> dict:
+    with Session(database.engine) as session:
+        return {
+            fila.fecha: (fila.minutos_reservados, fila.cantidad_reservas)
+            for fila in session.exec(select(OcupacionDiaria).where(OcupacionDiaria.cancha_id == cancha_id)).all()
+        }
+
+
+def test_reconstruir_ocupacion_conserva_las_ocurrencias_jugadas_de_series_canceladas(cliente):
+    cancha_id = cliente.post("/canchas/", json={"nombre": "Series", "tipo_cancha_id": 1}).json()["id"]
+    hoy = date.today()
+    serie = _crear_serie(cliente, cancha_id, hoy - timedelta(weeks=2), semanas=6)
+    assert cliente.put(f"/reservas/series/{serie['id']}/cancelar").status_code == 200
+
+    # Al cancelar se restaron las ocurrencias futuras en una sola sentencia
+    jugadas = {hoy - timedelta(weeks=2): (60, 1), hoy - timedelta(weeks=1): (60, 1)}
+    assert {dia: v for dia, v in _ocupacion(cancha_id).items() if v != (0, 0)} == jugadas
+
+    # Reconstruir desde cero da el mismo resultado: la serie cancelada conserva su historial
+    database.reconstruir_ocupacion_diaria()
+    assert _ocupacion(cancha_id) == jugadas
@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+from sqlmodel import Session, select
+
+import database
+from src.models.Reserva import SemaforoCancha
+
+
+def _crear_torneo(cliente, inicio: date, dias: int) -> int:
+    r = cliente.post("/torneos/", json={
+        "nombre": f"Torneo {inicio}",
+        "fecha_inicio": f"{inicio}T09:00:00",
+        "fecha_fin": f"{inicio + timedelta(days=dias)}T18:00:00",
+    })
+    assert r.status_code == 200, r.text
+    return r.json()["id"]
+
+
+def _crear_cancha(cliente) -> int:
+    # Cancha propia: las de los datos iniciales tienen series de otros tests
+    r = cliente.post("/canchas/", json={"nombre": "Torneos", "tipo_cancha_id": 1})
+    assert r.status_code == 200, r.text
+    return r.json()["id"]
+
+
+def _reserva(dia: date, cancha_id: int) -> dict:
+    return {
+        "cliente_id": 1, "cancha_id": cancha_id, "fecha": f"{dia}T00:00:00",
+        "hora_inicio": "10:00:00", "hora_fin": "11:00:00",
+    }
+
+
+def test_torneo_async_bloquea_el_rango_sin_un_semaforo_por_dia(cliente):
+    inicio = date.today() + timedelta(days=200)
+    cancha_id = _crear_cancha(cliente)
+    torneo_id = _crear_torneo(cliente, inicio, dias=20)
+
+    r = cliente.post(f"/async/torneos/{torneo_id}/canchas", params={"cancha_id": cancha_id})
+    assert r.status_code == 200, r.text
+    assert cliente.post(f"/async/torneos/{torneo_id}/canchas", params={"cancha_id": cancha_id}).status_code == 409
+
+    r = cliente.post("/reservas/", json=_reserva(inicio + timedelta(days=5), cancha_id))
+    assert r.status_code == 409
+    assert f"torneo {torneo_id}" in r.json()["detail"]
+
+    with Session(database.engine) as session:
+        semaforos = session.exec(select(SemaforoCancha).where(
+            SemaforoCancha.cancha_id == cancha_id,
+            SemaforoCancha.fecha >= inicio,
+            SemaforoCancha.fecha <= inicio + timedelta(days=20),
+        )).all()
+    # El torneo no escribe un semáforo por día, y la reserva rechazada revirtió el suyo
+    assert semaforos == []
+
+
+def test_torneo_async_informa_las_reservas_en_conflicto(cliente):
+    inicio = date.today() + timedelta(days=240)
+    cancha_id = _crear_cancha(cliente)
+    reserva = cliente.post("/reservas/", json=_reserva(inicio + timedelta(days=1), cancha_id)).json()
+    torneo_id = _crear_torneo(cliente, inicio, dias=3)
+
+    r = cliente.post(f"/async/torneos/{torneo_id}/canchas", params={"cancha_id": cancha_id})
+    assert r.status_code == 409
+    assert r.json()["detail"] == {
+        "mensaje": "La cancha tiene reservas durante el torneo.", "reservas": [reserva["id"]], "series": [],
+    }